@@ -0,0 +1,148 @@
+# asset_loader.py — Background Sound/Music Loading (thread pool + per-asset timings)
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from config import *
+from audio_bank import open_bank
+
+# Sound name -> file in assets/sounds
+SOUND_FILES = {
+    "ball_fast": "ball_fast.wav", "ball_ghost": "ball_ghost.wav",
+    "ball_invis": "ball_invis.wav", "ball_size_toggle": "ball_size_toggle.wav",
+    "ball_teleport": "ball_teleport.wav", "confuse_controls": "confuse_controls.wav",
+    "countdown_tick": "countdown.wav",
+    "curve_ball_ready": "curve_ball_ready.wav", "duck_hit_ball": "duck_hit_ball.wav",
+    "duck_quack": "duck_quack.wav", "duck_spawn": "duck_spawn.wav",
+    "game_over_lose": "game_over_lose.wav", "game_over_win": "game_over_win.wav",
+    "goal_scored": "goal_scored.wav", "laser_shot_hit": "laser_shot_hit.wav",
+    "laser_shot_loop": "laser_shot_loop.wav", "menu_click": "menu_click.wav",
+    "multi_ball": "multi_ball.wav", "opp_freeze": "opp_freeze.wav",
+    "paddle_big": "paddle_big.wav", "paddle_hit": "paddle_hit.wav",
+    "paddle_hit_spin": "paddle_hit_spin.wav", "paddle_small": "paddle_small.wav",
+    "paddle_teleport": "paddle_teleport.wav", "point_shield_activate": "point_shield_activate.wav",
+    "point_shield_denied": "point_shield_denied.wav", "powerup_collect": "powerup_collect.wav",
+    "powerup_collect_bad": "powerup_collect_bad.wav", "powerup_collect_good": "powerup_collect_good.wav",
+    "powerup_spawn": "powerup_spawn.wav", "rainbow_ball": "rainbow_ball.wav",
+    "repel_field": "repel_field.wav", "shield_activate": "shield_activate.wav",
+    "shield_hit": "shield_hit.wav", "shield_mock_laugh": "shield_mock_laugh.wav",
+    "slow_opponent": "slow_opponent.wav", "sticky_ball_launch": "sticky_ball_launch.wav",
+    "sticky_paddle": "sticky_paddle.wav", "sudden_death": "sudden_death.wav",
+    "wall_hit": "wall_hit.wav"
+}
+MUSIC_BASE_FILENAME = "psychosis_loop_dark"
+
+
+def find_music_path(sound_folder):
+    for ext in [".ogg", ".wav", ".mp3"]:
+        potential_path = os.path.join(sound_folder, MUSIC_BASE_FILENAME + ext)
+        if os.path.exists(potential_path):
+            if ext == ".mp3": print("Warning: Found .mp3 music file, attempting to load...")
+            return potential_path
+    return None
+
+
+class AssetLoader:
+    """Loads the sound effects and background music on a small thread pool.
+
+    Sounds come from the pre-decoded PCM bank at bank_path when there is one
+    that fits the mixer (no decoding, one mapped file); anything missing from
+    it is decoded from the loose WAV instead.
+
+    Finished sounds are written straight into the shared sounds dict, so
+    play_sound simply finds nothing (and stays silent) for ones still in
+    flight. Call poll() once per frame on the main thread: when everything
+    is in it starts the music, runs on_complete and logs per-asset timings.
+    """
+    def __init__(self, sound_folder, sounds, sound_files=SOUND_FILES, max_workers=ASSET_LOADER_WORKERS, bank_path=None):
+        self.sound_folder = sound_folder
+        self.bank_path = bank_path
+        self.bank = None
+        self.sounds = sounds
+        self.sound_files = sound_files
+        self.max_workers = max_workers
+        self.timings = [] # (asset name, milliseconds, loaded ok), appended by workers
+        self.total = len(sound_files) + 1 # Plus the music
+        self.finished = False
+        self.music_path = None
+        self.on_complete = None
+        self._futures = []
+        self._executor = None
+        self._start_time = self._end_time = 0.0
+
+    @property
+    def loaded_count(self):
+        return len(self.timings)
+
+    def start(self):
+        self._start_time = time.perf_counter()
+        if not pygame.mixer.get_init(): # No audio: nothing to load, sounds stay None
+            for name in self.sound_files: self.sounds[name] = None
+            self.timings = [(name, 0.0, False) for name in self.sound_files] + [("music", 0.0, False)]
+            return
+        self.bank = open_bank(self.bank_path)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asset_loader")
+        self._futures = [self._executor.submit(self._load_music)]
+        self._futures += [self._executor.submit(self._load_sound, name, filename) for name, filename in self.sound_files.items()]
+
+    def _load_sound(self, name, filename):
+        start = time.perf_counter()
+        path = os.path.join(self.sound_folder, filename)
+        sound = self.bank.sound(name) if self.bank else None
+        if sound is None:
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as e:
+                if not os.path.exists(path): print(f"ERROR: Sound file not found for '{name}': '{path}'")
+                else: print(f"Warning: Could not load sound '{name}' from '{path}': {e}")
+        self.sounds[name] = sound
+        self._end_time = time.perf_counter()
+        self.timings.append((name, (self._end_time - start) * 1000.0, sound is not None))
+
+    def _load_music(self):
+        start = time.perf_counter()
+        try:
+            music_path = find_music_path(self.sound_folder)
+            if not music_path:
+                raise pygame.error(f"Background music file not found ({MUSIC_BASE_FILENAME}.ogg/wav/mp3) in '{self.sound_folder}'")
+            pygame.mixer.music.load(music_path)
+            self.music_path = music_path
+        except pygame.error as e:
+            print(f"Warning: Could not load or play background music: {e}")
+        self._end_time = time.perf_counter()
+        self.timings.append(("music", (self._end_time - start) * 1000.0, self.music_path is not None))
+
+    def poll(self):
+        """True once everything is loaded; the first such call finishes up on the main thread."""
+        if self.finished: return True
+        if any(not future.done() for future in self._futures): return False
+        for future in self._futures: future.result() # Re-raise anything unexpected from a worker
+        if self._executor: self._executor.shutdown(wait=False)
+        if self.bank: self.bank.close() # Every Sound holds its own copy of the PCM
+        self.finished = True
+        if self.music_path:
+            try:
+                pygame.mixer.music.set_volume(0.3)
+                pygame.mixer.music.play(-1)
+                print(f"Loaded music: {self.music_path}")
+            except pygame.error as e:
+                print(f"Warning: Could not load or play background music: {e}")
+        if self.on_complete: self.on_complete()
+        self.log_timings()
+        return True
+
+    def wait(self):
+        """Blocks until everything is loaded (headless tools and tests)."""
+        for future in self._futures: future.result()
+        return self.poll()
+
+    def log_timings(self):
+        wall_ms = max(0.0, self._end_time - self._start_time) * 1000.0
+        loaded = sum(1 for _, _, ok in self.timings if ok)
+        source = f"bank {os.path.basename(self.bank.path)}" if self.bank else "WAVs"
+        print(f"Assets: {loaded}/{len(self.timings)} loaded from {source} in {wall_ms:.1f} ms wall on {self.max_workers} threads")
+        for name, ms, ok in sorted(self.timings, key=lambda timing: -timing[1]):
+            print(f"  {name:<24}{ms:8.2f} ms{'' if ok else '  (not loaded)'}")
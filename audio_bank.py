@@ -0,0 +1,124 @@
+# audio_bank.py — Packed Pre-decoded Sound Bank (build step + memory-mapped loading)
+#
+# Build: python audio_bank.py [bank path]  (game.spec runs build_bank() too). Writes every SOUND_FILES entry,
+# decoded to the mixer's PCM format, into one file:
+#   magic "UPSB" | uint16 version | uint16 reserved | uint32 index length | JSON index | PCM data
+# The index holds the mixer format and name -> [offset, length] (offsets from the start of the file).
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+from config import *
+
+BANK_MAGIC = b"UPSB"; BANK_VERSION = 1
+_PREFIX = struct.Struct("<4sHHI")
+_DATA_ALIGN = 16
+
+
+class AudioBank:
+    """Read-only view of a packed bank; sound() builds a Sound straight from the mapped PCM."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, index_length = _PREFIX.unpack_from(self._map, 0)
+            if magic != BANK_MAGIC or version != BANK_VERSION:
+                raise ValueError(f"not a version {BANK_VERSION} sound bank")
+            index = json.loads(bytes(self._map[_PREFIX.size:_PREFIX.size + index_length]).decode("utf-8"))
+        except (ValueError, struct.error, OSError):
+            self.close()
+            raise
+        self.mixer_format = tuple(index["format"]) # (frequency, size, channels) as from pygame.mixer.get_init()
+        self.entries = {name: tuple(span) for name, span in index["entries"].items()}
+
+    def matches_mixer(self):
+        return pygame.mixer.get_init() == self.mixer_format
+
+    def sound(self, name):
+        """A new Sound for name, or None if the bank doesn't have it. pygame copies the PCM, no decoding."""
+        span = self.entries.get(name)
+        if span is None: return None
+        offset, length = span
+        with memoryview(self._map) as view, view[offset:offset + length] as pcm: # Released views let close() unmap
+            return pygame.mixer.Sound(buffer=pcm)
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close(); self._map = None
+        if self._file:
+            self._file.close(); self._file = None
+
+
+def open_bank(path):
+    """The bank at path if it exists and fits the current mixer format, else None (callers fall back to WAVs)."""
+    if not path or not os.path.exists(path): return None
+    try:
+        bank = AudioBank(path)
+    except (ValueError, struct.error, OSError) as e:
+        print(f"Warning: Ignoring sound bank '{path}': {e}")
+        return None
+    if not bank.matches_mixer():
+        print(f"Warning: Sound bank '{path}' is {bank.mixer_format}, mixer is {pygame.mixer.get_init()}; loading WAVs instead")
+        bank.close()
+        return None
+    return bank
+
+
+def pack_bank(sound_folder, bank_path, sound_files):
+    """Decodes each sound with the game's mixer settings and writes the bank; returns (entries written, bytes)."""
+    pcm_chunks = []
+    for name, filename in sound_files.items():
+        path = os.path.join(sound_folder, filename)
+        try:
+            pcm_chunks.append((name, pygame.mixer.Sound(path).get_raw()))
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Warning: Skipping '{name}' ({path}): {e}")
+
+    def layout(index_length):
+        offset = -(-(_PREFIX.size + index_length) // _DATA_ALIGN) * _DATA_ALIGN
+        entries = {}
+        for name, pcm in pcm_chunks:
+            entries[name] = [offset, len(pcm)]
+            offset += -(-len(pcm) // _DATA_ALIGN) * _DATA_ALIGN
+        return entries
+
+    # Offsets depend on the index length and vice versa: settle with a fixed-width guess, then pad the JSON
+    index_length = 0
+    while True:
+        index = {"format": list(pygame.mixer.get_init()), "entries": layout(index_length)}
+        encoded = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        if len(encoded) <= index_length: break
+        index_length = len(encoded) + 64
+    encoded = encoded.ljust(index_length, b" ")
+
+    with open(bank_path, "wb") as f:
+        f.write(_PREFIX.pack(BANK_MAGIC, BANK_VERSION, 0, index_length))
+        f.write(encoded)
+        for name, pcm in pcm_chunks:
+            f.seek(index["entries"][name][0])
+            f.write(pcm)
+        f.truncate(f.tell())
+        size = f.tell()
+    return len(pcm_chunks), size
+
+
+def build_bank(assets_dir="assets", bank_path=None):
+    """The build step: packs assets_dir/sounds into assets_dir/AUDIO_BANK_FILENAME (or bank_path)."""
+    from asset_loader import SOUND_FILES
+    bank_path = bank_path or os.path.join(assets_dir, AUDIO_BANK_FILENAME)
+    pygame.mixer.init(frequency=MIXER_FREQUENCY, size=MIXER_SAMPLE_SIZE, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER, allowedchanges=0)
+    count, size = pack_bank(os.path.join(assets_dir, "sounds"), bank_path, SOUND_FILES)
+    print(f"Packed {count}/{len(SOUND_FILES)} sounds into {bank_path} ({size / 1024:.0f} KiB, format {pygame.mixer.get_init()})")
+    pygame.mixer.quit()
+    return bank_path
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy") # Decoding only; no audio device needed
+    build_bank(bank_path=sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,148 @@
+# ball_physics.py — Vectorized (struct-of-arrays) ball integration for multiball scenes
+
+from config import *
+
+import numpy as np
+
+
+def round_like_rect(values):
+    """Rounds half away from zero, matching how pygame.Rect stores float coordinates."""
+    truncated = np.trunc(values)
+    frac = values - truncated
+    return (truncated + np.where(np.abs(frac) >= 0.5, np.sign(frac), 0.0)).astype(np.int64)
+
+
+class BallArrayStore:
+    """Integrates every free ball in one batched NumPy call.
+
+    Ball sprites stay the source of truth: integrate() gathers their physics
+    state into preallocated arrays, runs the same timer/spin/velocity/rally
+    speed-up/wall-bounce arithmetic as Ball.update for all balls at once and
+    writes the numbers back. Sounds, trails and surfaces are finished per ball
+    by the engine through Ball.finish_batched_update().
+    """
+    INT_FIELDS = ("x", "y", "w", "last_hit", "boost", "invis", "flicker", "size_timer", "rainbow", "ghost_timer")
+    FLOAT_FIELDS = ("vx", "vy", "spin", "speed_mag", "radius", "base_radius", "pre_cx", "pre_cy", "pre_spin")
+    BOOL_FIELDS = ("boost_active", "flick", "laser", "ghost", "ghost_pass", "hit_top", "hit_bottom")
+    GATHER_ORDER = ("x", "y", "w", "vx", "vy", "spin", "speed_mag", "radius", "base_radius", "last_hit",
+                    "boost", "boost_active", "invis", "flicker", "flick", "size_timer", "rainbow", "ghost_timer",
+                    "ghost", "ghost_pass", "laser")
+
+    def __init__(self, capacity=16):
+        self.capacity = 0
+        self._ensure_capacity(capacity)
+
+    def _ensure_capacity(self, count):
+        if count <= self.capacity: return
+        new_capacity = max(count, self.capacity * 2, 1)
+        for name in self.INT_FIELDS: setattr(self, name, np.zeros(new_capacity, dtype=np.int64))
+        for name in self.FLOAT_FIELDS: setattr(self, name, np.zeros(new_capacity, dtype=np.float64))
+        for name in self.BOOL_FIELDS: setattr(self, name, np.zeros(new_capacity, dtype=bool))
+        self.capacity = new_capacity
+
+    def _gather(self, balls, n):
+        # One list comprehension + one array conversion; per-element NumPy writes are far slower
+        table = np.array([(b.rect.x, b.rect.y, b.rect.width, b.velocity[0], b.velocity[1], b.spin_y,
+                           b.current_speed_x_magnitude, b.current_radius, b.base_radius, b.last_hit_by_timer,
+                           b.speed_boost_timer, b.speed_boost_active, b.invisibility_timer, b.flicker_countdown,
+                           b.is_invisible_flicker, b.size_change_timer, b.rainbow_effect_timer, b.ghost_ball_timer,
+                           b.is_ghost_ball, b.ghost_can_pass_paddle, b.is_laser_shot) for b in balls], dtype=np.float64)
+        for column, name in enumerate(self.GATHER_ORDER):
+            getattr(self, name)[:n] = table[:, column]
+
+    def _scatter(self, balls, n):
+        x, y, w = self.x[:n].tolist(), self.y[:n].tolist(), self.w[:n].tolist()
+        vx, vy, spin, speed_mag = self.vx[:n].tolist(), self.vy[:n].tolist(), self.spin[:n].tolist(), self.speed_mag[:n].tolist()
+        radius = self.radius[:n].tolist(); last_hit = self.last_hit[:n].tolist()
+        boost, boost_active = self.boost[:n].tolist(), self.boost_active[:n].tolist()
+        invis, flicker, flick = self.invis[:n].tolist(), self.flicker[:n].tolist(), self.flick[:n].tolist()
+        size_timer, rainbow = self.size_timer[:n].tolist(), self.rainbow[:n].tolist()
+        ghost_timer, ghost, ghost_pass = self.ghost_timer[:n].tolist(), self.ghost[:n].tolist(), self.ghost_pass[:n].tolist()
+        for i, b in enumerate(balls):
+            b.rect.update(x[i], y[i], w[i], w[i])
+            b.velocity = [vx[i], vy[i]]
+            b.spin_y = spin[i]; b.current_speed_x_magnitude = speed_mag[i]
+            b.current_radius = int(radius[i]) if radius[i].is_integer() else radius[i]
+            b.last_hit_by_timer = last_hit[i]
+            b.speed_boost_timer = boost[i]; b.speed_boost_active = boost_active[i]
+            b.invisibility_timer = invis[i]; b.flicker_countdown = flicker[i]; b.is_invisible_flicker = flick[i]
+            b.size_change_timer = size_timer[i]; b.rainbow_effect_timer = rainbow[i]
+            b.ghost_ball_timer = ghost_timer[i]; b.is_ghost_ball = ghost[i]; b.ghost_can_pass_paddle = ghost_pass[i]
+
+    def integrate(self, balls, rally_active_for_speedup):
+        """Advances all given (non-stuck) balls by one tick.
+
+        Returns (hit_top, hit_bottom, pre_move_centers, pre_move_abs_spins) so the caller
+        can play wall effects and finish each ball's trail and visuals.
+        """
+        n = len(balls)
+        self._ensure_capacity(n)
+        self._gather(balls, n)
+        x, y, w = self.x[:n], self.y[:n], self.w[:n]
+        vx, vy, spin, speed_mag = self.vx[:n], self.vy[:n], self.spin[:n], self.speed_mag[:n]
+        laser, boost_active = self.laser[:n], self.boost_active[:n]
+
+        # Trail samples are taken before anything moves
+        self.pre_cx[:n] = x + w // 2; self.pre_cy[:n] = y + w // 2
+        self.pre_spin[:n] = np.abs(spin)
+
+        # --- Timers ---
+        last_hit = self.last_hit[:n]
+        last_hit[last_hit > 0] -= 1
+
+        boost = self.boost[:n]
+        boost[boost > 0] -= 1
+        boost_active[(boost == 0) & boost_active] = False
+
+        invis, flicker, flick = self.invis[:n], self.flicker[:n], self.flick[:n]
+        invisible = invis > 0
+        invis[invisible] -= 1; flicker[invisible] -= 1
+        toggle = invisible & (flicker <= 0)
+        flick[toggle] = ~flick[toggle]; flicker[toggle] = BALL_INVISIBILITY_FLICKER_RATE
+        flick[invisible & (invis == 0)] = False
+
+        size_timer, radius = self.size_timer[:n], self.radius[:n]
+        size_timer[size_timer > 0] -= 1
+        revert = (size_timer == 0) & (radius != self.base_radius[:n])
+        radius[revert] = self.base_radius[:n][revert]
+
+        rainbow = self.rainbow[:n]
+        rainbow[rainbow > 0] -= 1
+
+        ghost_timer, ghost, ghost_pass = self.ghost_timer[:n], self.ghost[:n], self.ghost_pass[:n]
+        ghost_timer[ghost_timer > 0] -= 1
+        unghost = (ghost_timer == 0) & ghost
+        ghost[unghost] = False; ghost_pass[unghost] = True
+
+        # --- Spin Curve (laser shots ignore spin) ---
+        curving = ~laser
+        vy[curving] += spin[curving] * BALL_SPIN_EFFECT_ON_CURVE
+        spin[curving] *= BALL_SPIN_DECAY
+        spin[(np.abs(spin) < 0.1) | laser] = 0.0
+
+        # --- Surface Resize (around the centre, as Ball._update_visuals does) ---
+        new_size = np.maximum(radius.astype(np.int64), 1) * 2
+        x += w // 2 - new_size // 2; y += w // 2 - new_size // 2
+        w[:] = new_size
+
+        # --- Velocity ---
+        mult = np.where(boost_active, BALL_SPEED_BOOST_MULTIPLIER, 1.0) * np.where(laser, LASER_SHOT_SPEED_MULTIPLIER, 1.0)
+        x[:] = round_like_rect(x + vx * mult)
+        y[:] = round_like_rect(y + vy * mult)
+
+        # --- Rally Speed Increase ---
+        if rally_active_for_speedup:
+            speeding = (np.abs(vx) < BALL_MAX_SPEED_X) & ~boost_active & ~laser
+            speed_mag[speeding] = np.minimum(BALL_MAX_SPEED_X, speed_mag[speeding] + BALL_SPEED_INCREMENT_RALLY)
+            vx[speeding] = np.copysign(speed_mag[speeding], vx[speeding])
+
+        # --- Top/Bottom Walls ---
+        hit_top, hit_bottom = self.hit_top[:n], self.hit_bottom[:n]
+        np.less_equal(y, 0, out=hit_top)
+        y[hit_top] = 0; vy[hit_top] *= -1
+        np.greater_equal(y + w, SCREEN_HEIGHT, out=hit_bottom)
+        y[hit_bottom] = SCREEN_HEIGHT - w[hit_bottom]; vy[hit_bottom] *= -1
+
+        self._scatter(balls, n)
+        pre_centers = list(zip(self.pre_cx[:n].astype(np.int64).tolist(), self.pre_cy[:n].astype(np.int64).tolist()))
+        return hit_top.tolist(), hit_bottom.tolist(), pre_centers, self.pre_spin[:n].tolist()
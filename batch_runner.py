@@ -0,0 +1,134 @@
+# batch_runner.py — Headless AI-vs-AI Match Runner for Balance Testing
+#
+# Usage: python batch_runner.py --matches 10000 --left medium --right hard --output stats.json
+
+import os
+# Must be set before pygame is imported (also re-applied in spawned worker processes)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+
+from config import *
+from engine import MatchEngine
+
+DIFFICULTY_NAMES = {"easy": DIFFICULTY_EASY, "medium": DIFFICULTY_MEDIUM, "hard": DIFFICULTY_HARD}
+DEFAULT_MAX_TICKS = SIM_TICK_RATE * 60 * 20 # 20 simulated minutes; matches this long are counted as timeouts
+
+
+def play_match(job):
+    """Plays one seeded AI-vs-AI match headless and returns its raw statistics."""
+    seed, left_difficulty, right_difficulty, max_ticks = job
+    engine = MatchEngine(game_mode=GAME_MODE_AI, difficulty=right_difficulty, left_ai_difficulty=left_difficulty)
+    engine.reset_match(seed) # Same seed and difficulties as a recorded match = the same match
+
+    rally_lengths = []
+    powerups = {}
+    hits_this_rally = 0
+    started = time.perf_counter()
+    while engine.phase != STATE_GAME_OVER and engine.time_tick < max_ticks:
+        for event_name, data in engine.step():
+            if event_name == "paddle_hit":
+                hits_this_rally += 1
+            elif event_name == "goal":
+                rally_lengths.append(hits_this_rally)
+                hits_this_rally = 0
+            elif event_name == "powerup":
+                powerup_type = data[1]
+                powerups[powerup_type] = powerups.get(powerup_type, 0) + 1
+    elapsed = time.perf_counter() - started
+
+    finished = engine.phase == STATE_GAME_OVER
+    return {
+        "seed": seed,
+        "winner": (0 if engine.score_a > engine.score_b else 1) if finished else None,
+        "score": [engine.score_a, engine.score_b],
+        "sudden_death": engine.is_sudden_death_mode,
+        "ticks": engine.time_tick,
+        "seconds": elapsed,
+        "worker": os.getpid(),
+        "rally_lengths": rally_lengths,
+        "powerups": powerups,
+    }
+
+
+def aggregate(results, args):
+    """Folds per-match results into the summary JSON document."""
+    num_matches = len(results)
+    wins = [0, 0]; timeouts = 0; sudden_deaths = 0
+    rally_histogram = {}; powerup_counts = {}
+    workers = {}
+    for result in results:
+        if result["winner"] is None: timeouts += 1
+        else: wins[result["winner"]] += 1
+        if result["sudden_death"]: sudden_deaths += 1
+        for length in result["rally_lengths"]:
+            rally_histogram[length] = rally_histogram.get(length, 0) + 1
+        for name, count in result["powerups"].items():
+            powerup_counts[name] = powerup_counts.get(name, 0) + count
+        worker = workers.setdefault(result["worker"], {"matches": 0, "ticks": 0, "seconds": 0.0})
+        worker["matches"] += 1; worker["ticks"] += result["ticks"]; worker["seconds"] += result["seconds"]
+
+    total_rallies = sum(rally_histogram.values())
+    total_powerups = sum(powerup_counts.values())
+    return {
+        "config": {"matches": num_matches, "base_seed": args.seed, "left": args.left, "right": args.right,
+                   "max_ticks": args.max_ticks, "workers": args.workers},
+        "win_rate": {"left": wins[0] / num_matches if num_matches else 0.0,
+                     "right": wins[1] / num_matches if num_matches else 0.0,
+                     "timeout": timeouts / num_matches if num_matches else 0.0},
+        "sudden_death_rate": sudden_deaths / num_matches if num_matches else 0.0,
+        "mean_match_ticks": sum(r["ticks"] for r in results) / num_matches if num_matches else 0.0,
+        "rally_length_histogram": {str(k): rally_histogram[k] for k in sorted(rally_histogram)},
+        "mean_rally_length": sum(k * v for k, v in rally_histogram.items()) / total_rallies if total_rallies else 0.0,
+        "powerup_frequency": {name: powerup_counts[name] / total_powerups for name in sorted(powerup_counts)},
+        "powerup_counts": {name: powerup_counts[name] for name in sorted(powerup_counts)},
+        "ticks_per_second_per_worker": {str(pid): (w["ticks"] / w["seconds"] if w["seconds"] else 0.0)
+                                        for pid, w in sorted(workers.items())},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play many headless AI-vs-AI matches and report aggregated statistics.")
+    parser.add_argument("--matches", type=int, default=100, help="number of matches to play")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; match i uses seed + i")
+    parser.add_argument("--left", choices=DIFFICULTY_NAMES, default="medium", help="left AI difficulty")
+    parser.add_argument("--right", choices=DIFFICULTY_NAMES, default="medium", help="right AI difficulty")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="give up on a match after this many ticks")
+    parser.add_argument("--output", default="-", help="JSON output path ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = [(args.seed + i, DIFFICULTY_NAMES[args.left], DIFFICULTY_NAMES[args.right], args.max_ticks)
+            for i in range(args.matches)]
+
+    started = time.perf_counter()
+    if args.workers <= 1:
+        results = [play_match(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(args.workers) as pool:
+            results = list(pool.imap_unordered(play_match, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))))
+    results.sort(key=lambda r: r["seed"])
+
+    summary = aggregate(results, args)
+    summary["wall_seconds"] = time.perf_counter() - started
+
+    text = json.dumps(summary, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+        print(f"Wrote {len(results)} match results to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# benchmark.py — Seeded Worst-Case Performance Scenarios with Regression Check
+#
+# Usage: python benchmark.py --update-baseline              (record benchmark_baseline.json on this machine)
+#        python benchmark.py                                (compare against it; exit code 1 on regression)
+#        python benchmark.py --scenarios split_balls,trails --frames 300 --output results.json
+#        python benchmark.py --render-scale 0.5                 (frames drawn at half resolution)
+
+import os
+# Must be set before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from config import *
+from engine import MatchEngine
+from sprites import PowerUp, DistractorSprite, CrazyDuckSprite
+from utils import TrailRenderer, clamp_render_scale, create_impact_particles, render_size
+from game import draw_playfield, draw_ui
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+HIGHER_IS_BETTER = ("ticks_per_sec", "fps")
+LOWER_IS_BETTER = ("frame_ms_p50", "frame_ms_p95", "frame_ms_p99", "alloc_kib_per_frame", "gc_gen0_per_frame")
+ABSOLUTE_SLACK = {"alloc_kib_per_frame": 2.0, "gc_gen0_per_frame": 0.05} # Ignore noise on near-zero metrics
+CHAOS_BURST_INTERVAL = 4 # Frames between the chaos scenario's extra particle bursts
+
+
+# --- Scenario Helpers ---
+def _serve(engine):
+    """Runs the serve countdown so the scenario starts mid-rally."""
+    while engine.phase == STATE_COUNTDOWN: engine.step()
+
+def _keep_match_alive(engine):
+    engine.score_a = engine.score_b = 0 # Goals still happen, the match just never ends
+    if engine.phase != STATE_PLAYING:
+        engine.reset_match(); _serve(engine)
+
+def _keep_ball_count(engine, count):
+    while len(engine.balls) < count:
+        engine._split_ball(random.choice(engine.balls.sprites()))
+    extras = [b for b in engine.balls if not b.is_main_ball][:len(engine.balls) - count]
+    for ball_obj in extras: ball_obj.kill()
+
+def _keep_powerup_count(engine, count):
+    while len(engine.active_powerups) < count:
+        powerup = PowerUp(random.randint(int(SCREEN_WIDTH * 0.15), int(SCREEN_WIDTH * 0.85)),
+                          random.randint(POWERUP_SIZE, SCREEN_HEIGHT - POWERUP_SIZE))
+        engine.active_powerups.add(powerup); engine.all_sprites.add(powerup)
+
+def _keep_distractor_count(engine, shapes, ducks):
+    duck_sprites = [s for s in engine.distractor_sprites_group if isinstance(s, CrazyDuckSprite)]
+    for _ in range(shapes - (len(engine.distractor_sprites_group) - len(duck_sprites))):
+        shape = DistractorSprite(); engine.distractor_sprites_group.add(shape); engine.all_sprites.add(shape)
+    for _ in range(ducks - len(duck_sprites)):
+        duck = CrazyDuckSprite(); engine.distractor_sprites_group.add(duck); engine.all_sprites.add(duck)
+
+
+# --- Scenarios (setup once, maintain before every frame) ---
+class Scenario:
+    simulate = True
+    state = STATE_PLAYING
+    def setup(self, engine): _serve(engine)
+    def maintain(self, engine): _keep_match_alive(engine)
+
+class SplitBalls(Scenario):
+    """12 simultaneous balls, as stacked ball_split_self shots would produce."""
+    def maintain(self, engine):
+        _keep_match_alive(engine); _keep_ball_count(engine, 12)
+
+class MaxPowerups(Scenario):
+    """The power-up cap is always reached."""
+    def maintain(self, engine):
+        _keep_match_alive(engine); _keep_powerup_count(engine, MAX_POWERUPS_ONSCREEN)
+
+class Distractors(Scenario):
+    """Three rotating distractor shapes plus a duck on screen."""
+    def maintain(self, engine):
+        _keep_match_alive(engine); _keep_distractor_count(engine, 3, 1)
+
+class RainbowLaserTrails(Scenario):
+    """Six balls with rainbow trails, every other one a laser shot."""
+    def maintain(self, engine):
+        _keep_match_alive(engine); _keep_ball_count(engine, 6)
+        for i, ball_obj in enumerate(engine.balls):
+            ball_obj.rainbow_effect_timer = max(ball_obj.rainbow_effect_timer, 2)
+            if i % 2 and not ball_obj.is_laser_shot: ball_obj.activate_laser_shot()
+
+class InstructionsScreen(Scenario):
+    """The text-heavy instructions screen over the animated background."""
+    simulate = False
+    state = STATE_INSTRUCTIONS
+    def setup(self, engine): pass
+    def maintain(self, engine): pass
+
+class ChaosStress(Scenario):
+    """Stress mode with every scaled cap kept full: multiball balls, power-ups, distractors and goal-sized bursts."""
+    def setup(self, engine):
+        engine.set_stress_factor(STRESS_FACTOR_DEFAULT); _serve(engine)
+    def maintain(self, engine):
+        _keep_match_alive(engine)
+        _keep_ball_count(engine, engine.multiball_count)
+        _keep_powerup_count(engine, engine.max_powerups)
+        _keep_distractor_count(engine, engine.max_distractors - engine.max_ducks, engine.max_ducks)
+        if engine.time_tick % CHAOS_BURST_INTERVAL == 0: # Bursts already scale with stress_factor
+            create_impact_particles(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT), engine.impact_particles, "goal")
+
+SCENARIOS = {"split_balls": SplitBalls, "max_powerups": MaxPowerups, "distractors": Distractors,
+             "trails": RainbowLaserTrails, "instructions": InstructionsScreen, "chaos": ChaosStress}
+
+
+# --- Measurement ---
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def _render_frame(screen, game_surface, trail_renderer, engine, state, time_tick, button_rects_map):
+    draw_playfield(game_surface, engine, trail_renderer, state, time_tick, 1.0)
+    wobble = (math.sin(time_tick * SCREEN_WOBBLE_SPEED) * SCREEN_WOBBLE_AMPLITUDE,
+              math.cos(time_tick * SCREEN_WOBBLE_SPEED * 0.7) * SCREEN_WOBBLE_AMPLITUDE) if state == STATE_PLAYING else (0, 0)
+    scale = game_surface.get_width() / SCREEN_WIDTH
+    screen.blit(game_surface, (wobble[0] * scale, wobble[1] * scale))
+    draw_ui(screen, engine, state, time_tick, (0, 0), button_rects_map)
+    pygame.display.flip()
+
+def run_scenario(name, frames, warmup, alloc_frames, seed, render_scale=1.0):
+    """Plays one scenario with the same drawing code as main_game() and returns its metrics."""
+    scenario = SCENARIOS[name]()
+    random.seed(seed)
+    screen = pygame.display.get_surface()
+    game_surface = pygame.Surface(render_size(render_scale))
+    trail_renderer = TrailRenderer(render_scale)
+    button_rects_map = {}
+    engine = MatchEngine(game_mode=GAME_MODE_AI, difficulty=DIFFICULTY_HARD, left_ai_difficulty=DIFFICULTY_HARD)
+    engine.reset_match()
+    scenario.setup(engine)
+
+    def frame(time_tick):
+        sim_seconds = 0.0
+        if scenario.simulate:
+            started = time.perf_counter(); engine.step(); sim_seconds = time.perf_counter() - started
+        _render_frame(screen, game_surface, trail_renderer, engine, scenario.state, time_tick, button_rects_map)
+        return sim_seconds
+
+    frame_times = []; sim_seconds = 0.0
+    for i in range(warmup):
+        scenario.maintain(engine); frame(float(i))
+    gen0_before = gc.get_stats()[0]["collections"]
+    for i in range(warmup, warmup + frames):
+        scenario.maintain(engine)
+        started = time.perf_counter()
+        sim_seconds += frame(float(i))
+        frame_times.append(time.perf_counter() - started)
+    gen0_collections = gc.get_stats()[0]["collections"] - gen0_before
+
+    # Separate pass: tracemalloc slows everything down, so it never overlaps the timed frames
+    peaks = []
+    tracemalloc.start()
+    for i in range(warmup + frames, warmup + frames + alloc_frames):
+        scenario.maintain(engine)
+        tracemalloc.reset_peak(); before = tracemalloc.get_traced_memory()[0]
+        frame(float(i))
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    ordered = sorted(frame_times)
+    return {
+        "frames": frames,
+        "ticks_per_sec": frames / sim_seconds if sim_seconds else None,
+        "fps": frames / sum(frame_times),
+        "frame_ms_p50": _percentile(ordered, 0.50) * 1000.0,
+        "frame_ms_p95": _percentile(ordered, 0.95) * 1000.0,
+        "frame_ms_p99": _percentile(ordered, 0.99) * 1000.0,
+        "alloc_kib_per_frame": sum(peaks) / len(peaks) / 1024.0 if peaks else None, # Peak Python heap growth (excludes SDL pixel buffers)
+        "gc_gen0_per_frame": gen0_collections / frames,
+        "entities": {"balls": len(engine.balls), "powerups": len(engine.active_powerups),
+                     "distractors": len(engine.distractor_sprites_group), "particles": len(engine.impact_particles)},
+    }
+
+
+def run_repeated(name, frames, warmup, alloc_frames, seed, repeats, render_scale=1.0):
+    """Median of each metric over several runs; single runs on a busy machine are too noisy to gate on."""
+    runs = [run_scenario(name, frames, warmup, alloc_frames, seed, render_scale) for _ in range(repeats)]
+    merged = dict(runs[0])
+    for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+        values = sorted(run[metric] for run in runs if run[metric] is not None)
+        merged[metric] = values[len(values) // 2] if values else None
+    merged["repeats"] = repeats
+    return merged
+
+
+# --- Baseline Comparison ---
+def find_regressions(results, baseline, tolerance):
+    """Returns human-readable regressions of results against baseline beyond the relative tolerance."""
+    regressions = []
+    for name, metrics in results["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if not reference: continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            value, expected = metrics.get(metric), reference.get(metric)
+            if value is None or expected is None: continue
+            slack = ABSOLUTE_SLACK.get(metric, 0.0)
+            if metric in HIGHER_IS_BETTER and value < expected * (1 - tolerance) - slack:
+                regressions.append(f"{name}.{metric}: {value:.2f} < baseline {expected:.2f}")
+            elif metric in LOWER_IS_BETTER and value > expected * (1 + tolerance) + slack:
+                regressions.append(f"{name}.{metric}: {value:.3f} > baseline {expected:.3f}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded worst-case rendering/simulation scenarios and check for regressions.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=60, help="untimed frames before measuring (fills caches and pools)")
+    parser.add_argument("--alloc-frames", type=int, default=60, help="frames traced with tracemalloc after the timed run")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per scenario; the median of each metric is reported")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed for every scenario")
+    parser.add_argument("--render-scale", type=float, default=1.0, help="frame render scale, as game.py --render-scale")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--output", default="-", help="results JSON path ('-' for stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    pygame.init()
+    render_scale = clamp_render_scale(args.render_scale)
+    pygame.display.set_mode(render_size(render_scale)) # No SCALED: the window upscale is SDL's (GPU) work, not ours
+    results = {
+        "config": {"frames": args.frames, "warmup": args.warmup, "seed": args.seed, "repeats": args.repeats, "render_scale": render_scale,
+                   "python": platform.python_version(), "pygame": pygame.version.ver, "machine": platform.machine()},
+        "scenarios": {},
+    }
+    for name in names:
+        results["scenarios"][name] = run_repeated(name, args.frames, args.warmup, args.alloc_frames, args.seed, max(1, args.repeats), render_scale)
+        metrics = results["scenarios"][name]
+        print(f"{name:<14} p50 {metrics['frame_ms_p50']:6.2f} ms  p99 {metrics['frame_ms_p99']:6.2f} ms  {metrics['fps']:7.1f} fps",
+              file=sys.stderr)
+    pygame.quit()
+
+    text = json.dumps(results, indent=2)
+    if args.output == "-": print(text)
+    else:
+        with open(args.output, "w") as f: f.write(text)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f: f.write(text)
+        print(f"Wrote baseline to {args.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f: baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions: print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions: print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}.", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
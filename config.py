@@ -15,6 +15,19 @@ COLOR_DUCK = (255,230,0); COLOR_SHIELD = (60,120,255)
 # *** ADJUSTED SCREEN SIZE (Approx 15% smaller) ***
 SCREEN_WIDTH = 850
 SCREEN_HEIGHT = 638
+# Everything in this file is in these logical units; the window itself is scaled by SDL (pygame.SCALED)
+RENDER_SCALE = 1.0 # Frames drawn at this fraction of the logical size, then upscaled to the window (low-end kiosks)
+RENDER_SCALE_MIN = 0.5; RENDER_SCALE_MAX = 1.0
+RENDER_UPSCALE_SMOOTH = False # Linear filtering for the window upscale (softer) instead of nearest-neighbour
+FULLSCREEN = False # Desktop-sized window with the logical screen letterboxed into it (kiosks, 4K displays)
+
+# --- Timing ---
+SIM_TICK_RATE = 60 # Fixed simulation rate (ticks per second); all per-frame constants below are per tick
+SIM_TIMESTEP = 1.0 / SIM_TICK_RATE
+MAX_SIM_STEPS_PER_FRAME = 5 # Drop simulation backlog beyond this to avoid a spiral of death on slow frames
+MAX_FRAME_TIME = 0.25 # Seconds; longer frames (window drags, breakpoints) are clamped
+RENDER_FPS_CAP = 240 # 0 = uncapped rendering
+INTERPOLATION_SNAP_DISTANCE = 100 # Jumps larger than this (teleports, resets) are drawn without interpolation
 
 # --- Paddle ---
 # Note: Paddle/Ball sizes and speeds were previously adjusted for a larger screen.
@@ -27,6 +40,7 @@ PLAYER_2_PADDLE_SPEED = 8 # Slightly reduced speed for smaller screen
 AI_PADDLE_SPEED_EASY = 4.5
 AI_PADDLE_SPEED_MEDIUM = 6.0
 AI_PADDLE_SPEED_HARD = 7.5
+AI_STICKY_LAUNCH_CHANCE = 0.04 # Per tick; AI paddles release a stuck ball after ~25 ticks on average
 
 PADDLE_SPIN_FACTOR = 0.20
 PADDLE_EDGE_SPIN_FACTOR = 0.45
@@ -52,6 +66,9 @@ BALL_SPIN_DECAY = 0.980
 BALL_SPIN_EFFECT_ON_CURVE = 0.13
 BALL_MAX_SPIN = 8.0 # Slightly reduced max spin
 BALL_LAST_HIT_TIMER_DURATION = 45
+VECTORIZED_BALL_PHYSICS = False # Integrate all balls in one NumPy call; pays off in big multiball scenes
+SPATIAL_GRID_CELL_SIZE = 64 # Broadphase cell size in pixels (about a power-up or distractor)
+SPATIAL_GRID_MIN_PAIRS = 40000 # Balls x entities below which one collidelistall over every rect beats bucketing
 
 BALL_SPEED_BOOST_MULTIPLIER = 1.7; BALL_INVISIBILITY_ALPHA = 40
 BALL_INVISIBILITY_FLICKER_RATE = 3; STICKY_BALL_DURATION = 240
@@ -65,15 +82,12 @@ POWERUP_GENERAL_DURATION = 300; POWERUP_SHORT_DURATION = 180
 POWERUP_MULTIBALL_COUNT = 2; POWERUP_MAGNET_RANGE = 130; POWERUP_MAGNET_SPEED = 1.6 # Adjusted range/speed
 REPEL_FIELD_DURATION = 240; REPEL_FIELD_RADIUS_FACTOR = 1.3; REPEL_FIELD_STRENGTH = 2.8
 
-ALL_POWERUP_TYPES = [
-    "paddle_big_self", "paddle_small_self", "multi_ball", "ball_fast_all",
-    "opp_freeze", "ball_invis_all", "shield_self", "slow_opponent",
-    "sticky_paddle_self", "curve_ball_self", "laser_shot_self",
-    "confuse_opponent_controls", "point_shield_self",
-    "ball_size_toggle_all", "rainbow_ball_all", "opponent_paddle_shrink",
-    "ball_ghost_self", "paddle_teleport_self", "repel_field_self",
-    "ball_split_self", "ball_teleport_all"
-]
+# Types, handlers and base weights live in powerups.py; profiles override weights by type name
+POWERUP_WEIGHT_PROFILES = {
+    "default": {}, # Uniform
+    "chaos": {"multi_ball": 2.0, "ball_split_self": 2.0, "rainbow_ball_all": 1.5, "ball_teleport_all": 1.5, "point_shield_self": 0.5},
+}
+POWERUP_PROFILES_PATH = "powerup_profiles.json" # Optional JSON overrides ({profile: {type: weight}}), read at import
 # Display names remain the same
 POWERUP_DISPLAY_NAMES = {
     "paddle_big_self": "BIG PADDLE!", "paddle_small_self": "SMALL PADDLE!",
@@ -100,17 +114,28 @@ POWERUP_DISPLAY_NAMES = {
 
 # --- Visual Effects ---
 PSYCHEDELIC_BACKGROUND_SPEED = 0.08; PSYCHEDELIC_HUE_SHIFT_SPEED = 0.5
+PSYCHEDELIC_BAND_HEIGHT = 15 # Pixels per background band; larger = fewer bands for weak machines
 SCREEN_WOBBLE_AMPLITUDE = 3 # Slightly reduced wobble for smaller screen
 SCREEN_WOBBLE_SPEED = 0.15
 BALL_TRAIL_LENGTH_GHOST = 20 # Slightly shorter trail
+BALL_TRAIL_ALPHA_MAX = 200; BALL_TRAIL_ALPHA_LEVELS = 8 # Trail fade; alpha snaps to levels so equal segments batch into one draw call
 PARTICLE_COUNT_IMPACT = 25 # Fewer particles
 PARTICLE_LIFESPAN_IMPACT = 28; PARTICLE_SPEED_IMPACT = 4.5 # Slightly slower/shorter particles
+PARTICLE_CAPACITY = 2048 # Fixed particle pool size; bursts beyond it are dropped
+PARTICLE_COLOR_QUANT = 64 # Particle colours snap to this step (drawn at the bucket centre) so squares can be shared
+PARTICLE_ALPHA_LEVELS = 8 # Fade steps per particle colour
+PARTICLE_SURFACE_CACHE_MAX = 4096 # Pre-rendered particle squares kept before the oldest are evicted
+BALL_ATLAS_COLOR_STEP = 8 # Ball colours snap to multiples of this so spin/rainbow shades share pre-rendered sprites
+BALL_ATLAS_MAX_ENTRIES = 512 # Pre-rendered ball sprites kept before the least recently used are dropped
 
 # --- Distractors ---
 DISTRACTOR_SPAWN_CHANCE_TOTAL = 0.005
 CRAZY_DUCK_SPAWN_CHANCE_RATIO = 0.4
 DISTRACTOR_MAX_ONSCREEN_TOTAL = 3
 MAX_DUCKS_ONSCREEN = 1
+DISTRACTOR_ROTATION_STEP = 5 # Degrees between cached rotation frames of a distractor/duck
+DISTRACTOR_TEMPLATE_POOL_SIZE = 8 # Distinct shapes generated before spawns start reusing them
+DUCK_TEMPLATE_POOL_SIZE = 4
 
 DISTRACTOR_SPEED_RANGE = (1.3, 3.2) # Slightly slower distractors
 
@@ -125,9 +150,69 @@ COUNTDOWN_INITIAL_VALUE = 3; COUNTDOWN_FRAMES_PER_NUMBER = 60
 COUNTDOWN_TEXT_COLOR = (255,255,255); COUNTDOWN_GO_TEXT_COLOR = (0,255,0)
 SUDDEN_DEATH_SCORE_THRESHOLD = 6; SUDDEN_DEATH_FLASH_SPEED = 0.05; SUDDEN_DEATH_FLASH_ALPHA_MAX = 150
 WINNING_SCORE = 7
+TEXT_CACHE_MAX_ENTRIES = 256 # Rendered text+shadow surfaces kept before the least recently used are dropped
+
+# --- Asset Loading ---
+ASSET_LOADER_WORKERS = 4 # Threads decoding sounds in the background while the menu is already up
+
+# --- Audio Voices ---
+MIXER_FREQUENCY = 44100; MIXER_SAMPLE_SIZE = -16; MIXER_CHANNELS = 2; MIXER_BUFFER = 4096 # audio_bank.py packs PCM in this format
+MIXER_NUM_CHANNELS = 32
+AUDIO_BANK_FILENAME = "sounds.bank" # Pre-decoded PCM in assets/, built by audio_bank.py; loose WAVs are the fallback
+VOICE_GROUPS = {"laser": 1, "critical": 3} # Reserved channels, in channel order from 0; the rest form the shared "sfx" pool
+# name -> (group, priority, max concurrent instances, min retrigger interval ms); unlisted sounds get VOICE_RULE_DEFAULT
+VOICE_RULE_DEFAULT = ("sfx", 5, 2, 0)
+SOUND_VOICE_RULES = {
+    "goal_scored": ("critical", 10, 1, 0), "sudden_death": ("critical", 10, 1, 0),
+    "game_over_win": ("critical", 10, 1, 0), "game_over_lose": ("critical", 10, 1, 0),
+    "countdown_tick": ("critical", 9, 1, 0), "point_shield_denied": ("critical", 9, 1, 0),
+    "menu_click": ("sfx", 8, 1, 0),
+    "wall_hit": ("sfx", 1, 3, 40), "paddle_hit": ("sfx", 3, 3, 30), "paddle_hit_spin": ("sfx", 3, 3, 30),
+    "duck_quack": ("sfx", 2, 2, 150), "duck_hit_ball": ("sfx", 2, 2, 60), "duck_spawn": ("sfx", 2, 1, 200),
+    "shield_hit": ("sfx", 4, 2, 50), "laser_shot_hit": ("sfx", 4, 2, 50), "powerup_spawn": ("sfx", 2, 2, 100),
+}
+
+# --- Profiling ---
+PROFILER_ENABLED = False # Start with the frame profiler on (F3 toggles it in game)
+PROFILER_WINDOW_FRAMES = 240 # Rolling window for overlay mean/p99
+PROFILER_CSV_PATH = None # e.g. "frame_profile.csv" to write one row per profiled frame
+PROFILER_OVERLAY_REFRESH_FRAMES = 15; PROFILER_OVERLAY_FONT_SIZE = 14
+STARTUP_TRACE_DEFAULT_PATH = "startup_trace.csv" # Where --trace-startup writes when no path is given
+
+# --- Adaptive Quality ---
+QUALITY_GOVERNOR_ENABLED = True # Trade visual detail for frame time when frames run over budget
+QUALITY_FRAME_BUDGET_MS = 1000.0 / SIM_TICK_RATE # Frame work time to hold (the frame-cap wait doesn't count)
+QUALITY_WINDOW_FRAMES = 30 # Rolling window of frame times each decision averages over
+QUALITY_DOWNGRADE_AT = 1.0; QUALITY_UPGRADE_AT = 0.6 # Fractions of the budget: step down above, back up below
+QUALITY_UPGRADE_FRAMES = 180 # Headroom must last this long before a level is restored; doubles after a failed restore
+QUALITY_UPGRADE_FRAMES_MAX = 1440
+# Full quality first: (particle burst fraction, trail samples drawn, background band height, wobble factor). Only draw-side
+# knobs belong here: distractor rotation frames, for one, set the distractor rects the balls collide with
+QUALITY_LEVELS = (
+    (1.0, BALL_TRAIL_LENGTH_GHOST, PSYCHEDELIC_BAND_HEIGHT, 1.0),
+    (0.6, 14, 30, 1.0),
+    (0.35, 9, 60, 0.5),
+    (0.15, 5, 106, 0.0),
+)
+
+# --- Replays ---
+REPLAY_DEFAULT_DIR = "replays" # Where --record saves matches when no directory is given
+REPLAY_FILE_EXTENSION = ".upr"
+REPLAY_KEYFRAME_INTERVAL = SIM_TICK_RATE * 5 # Ticks between keyframes (state digest + score) for verification and seeking
+REPLAY_SEEK_SECONDS = 10 # Left/right arrows jump this far in rendered playback
+# Settings that can't change how a match plays out; the config hash stored in a replay ignores them
+REPLAY_CONFIG_HASH_SKIP = ("RENDER_", "FULLSCREEN", "QUALITY_", "PROFILER_", "STARTUP_", "MIXER_", "AUDIO_", "VOICE_",
+                           "SOUND_", "ASSET_", "PARTICLE_", "PSYCHEDELIC_", "SCREEN_WOBBLE", "BALL_TRAIL", "BALL_ATLAS",
+                           "TEXT_CACHE", "STRESS_HUD", "REPLAY_", "MAX_FRAME_TIME", "MAX_SIM_STEPS", "INTERPOLATION")
+
+# --- Stress Mode (chaos party / scaling tests) ---
+STRESS_FACTOR_DEFAULT = 10 # Entity caps, spawn chances and particle bursts are multiplied by this in stress mode
+STRESS_FACTOR_MAX = 100 # [ and ] halve/double the factor in game, within 1..max
+STRESS_HUD_REFRESH_FRAMES = 10; STRESS_HUD_FONT_SIZE = 16
 
 # --- Game Modes & States ---
 GAME_MODE_AI = 0; GAME_MODE_2P = 1
+POWERUP_PROFILE_BY_MODE = {GAME_MODE_AI: "default", GAME_MODE_2P: "default", "chaos": "chaos"} # "chaos" = any mode with stress factor > 1
 DIFFICULTY_EASY = 0; DIFFICULTY_MEDIUM = 1; DIFFICULTY_HARD = 2
 STATE_START_MENU = 0; STATE_MODE_SELECT = 1; STATE_AI_DIFFICULTY_SELECT = 1.5
 STATE_COUNTDOWN = 1.25; STATE_PLAYING = 2; STATE_GAME_OVER = 3
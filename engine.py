@@ -0,0 +1,693 @@
+# engine.py — Headless Match Engine (simulation only, no window/mixer/frame cap)
+
+import pygame
+import random
+import math
+
+from config import *
+from sprites import Paddle, Ball, PowerUp, DistractorSprite, CrazyDuckSprite
+from utils import create_impact_particles
+from ball_physics import BallArrayStore
+from particles import ParticleSystem
+from spatial_grid import SpatialGrid
+from swept_collision import swept_circle_rect
+from powerups import get_selection_table, profile_for_mode
+from profiler import NULL_PROFILER
+
+# Inputs for one simulation tick. Directions are -1 (up), 0 or 1 (down);
+# launch flags release a ball held by a sticky paddle.
+NO_INPUT = {"left_dir": 0, "right_dir": 0, "left_launch": False, "right_launch": False}
+
+def make_inputs(left_dir=0, right_dir=0, left_launch=False, right_launch=False):
+    """Builds an inputs dict for MatchEngine.step()."""
+    return {"left_dir": left_dir, "right_dir": right_dir,
+            "left_launch": left_launch, "right_launch": right_launch}
+
+
+class MatchEngine:
+    """Owns paddles, balls, power-ups and distractors and advances one match tick per step().
+
+    The engine never touches the display, the mixer or a clock, so it can run
+    headless as fast as Python allows. Sounds go through play_sound_func (a no-op
+    when None) and every tick's notable happenings are returned from step() as
+    (event_name, data) tuples.
+
+    Every gameplay random draw comes from self.rng, reseeded by reset_match(seed),
+    so a match is fully determined by its seed, settings and per-tick inputs.
+    """
+    def __init__(self, game_mode=GAME_MODE_AI, difficulty=DIFFICULTY_MEDIUM,
+                 play_sound_func=None, laser_channel=None, laser_sound=None, left_ai_difficulty=None,
+                 vectorized_balls=VECTORIZED_BALL_PHYSICS, profiler=None):
+        # PowerUp and CrazyDuckSprite render text on spawn, which needs the font module only
+        if not pygame.font.get_init(): pygame.font.init()
+
+        self.game_mode = game_mode
+        self.difficulty = difficulty
+        self.left_ai_difficulty = left_ai_difficulty # None = left paddle follows inputs (AI-vs-AI otherwise)
+        self.play_sound_func = play_sound_func
+        self.laser_channel = laser_channel
+        self.laser_sound = laser_sound
+
+        self.time_tick = 0
+        self.events = []
+        self.seed = None # Seed of the current match, set by reset_match()
+        self.rng = random.Random() # Match stream; sprites keep a reference, so it is reseeded in place
+        self.profiler = profiler or NULL_PROFILER # Phase timing hooks; no-ops unless enabled
+
+        # Optional batched NumPy integration for multiball scenes
+        self.ball_store = BallArrayStore() if vectorized_balls else None
+
+        # --- Sprite Groups ---
+        self.all_sprites = pygame.sprite.Group()
+        self.balls = pygame.sprite.Group()
+        self.active_powerups = pygame.sprite.Group()
+        self.impact_particles = ParticleSystem()
+        self.distractor_sprites_group = pygame.sprite.Group()
+        self.all_paddle_related_sprites = pygame.sprite.Group()
+        self.spatial_grid = SpatialGrid() # Ball-vs-entity broadphase, rebuilt every tick
+
+        # --- Paddles ---
+        self.player_paddle_left = self._create_paddle(0)
+        self.player_paddle_right = self._create_paddle(1)
+        self.all_paddle_related_sprites.add(self.player_paddle_left, self.player_paddle_right)
+        self.all_sprites.add(self.player_paddle_left, self.player_paddle_right)
+
+        # Initial main ball (replaced on every round reset)
+        self.main_ball = self._create_ball()
+        self.balls.add(self.main_ball)
+        self.all_sprites.add(self.main_ball)
+
+        # --- Match State ---
+        self.phase = STATE_COUNTDOWN
+        self.score_a = 0
+        self.score_b = 0
+        self.winner_text = ""
+        self.rally_ongoing = False
+        self.countdown_timer = 0
+        self.countdown_value = COUNTDOWN_INITIAL_VALUE
+        self.is_sudden_death_mode = False
+        self.sudden_death_sound_played_this_activation = False
+        self.last_player_scored_on = self.rng.choice([0, 1])
+
+        self.set_stress_factor(1)
+
+    # --- Stress Mode ---
+    def set_stress_factor(self, factor):
+        """Scales entity caps, spawn chances, multiball size and particle bursts; 1 = normal rules."""
+        factor = max(1, min(int(factor), STRESS_FACTOR_MAX))
+        self.stress_factor = factor
+        self.max_powerups = MAX_POWERUPS_ONSCREEN * factor
+        self.max_distractors = DISTRACTOR_MAX_ONSCREEN_TOTAL * factor
+        self.max_ducks = MAX_DUCKS_ONSCREEN * factor
+        self.multiball_count = POWERUP_MULTIBALL_COUNT * factor
+        self.powerup_spawn_chance = min(1.0, POWERUP_SPAWN_CHANCE * factor)
+        self.distractor_spawn_chance = min(1.0, DISTRACTOR_SPAWN_CHANCE_TOTAL * factor)
+        self.impact_particles.burst_scale = factor
+        if self.impact_particles.capacity != PARTICLE_CAPACITY * factor:
+            self.impact_particles.set_capacity(PARTICLE_CAPACITY * factor)
+        self._select_powerup_profile()
+
+    def _select_powerup_profile(self):
+        self.powerup_table = get_selection_table(profile_for_mode(self.game_mode, self.stress_factor))
+
+    def set_laser_audio(self, laser_channel, laser_sound):
+        """Hands late-initialised laser audio to the paddles and live balls (new balls pick it up on creation)."""
+        self.laser_channel = laser_channel; self.laser_sound = laser_sound
+        for sprite in [self.player_paddle_left, self.player_paddle_right] + list(self.balls):
+            sprite.laser_channel = laser_channel; sprite.laser_sound = laser_sound
+
+    # --- Construction Helpers ---
+    def _create_paddle(self, player_num):
+        paddle = Paddle(PADDLE_WIDTH, PADDLE_HEIGHT_NORMAL, player_num, lambda: self.time_tick, play_sound_func=self.play_sound_func,
+                        rng=self.rng)
+        paddle.laser_channel = self.laser_channel
+        paddle.laser_sound = self.laser_sound
+        paddle.all_sprites_ref = self.all_sprites
+        return paddle
+
+    def _create_ball(self):
+        return Ball(BALL_RADIUS_NORMAL, play_sound_func=self.play_sound_func,
+                    laser_channel=self.laser_channel, laser_sound=self.laser_sound, rng=self.rng)
+
+    def play_sound(self, sound_name):
+        if self.play_sound_func: self.play_sound_func(sound_name)
+
+    def _stop_laser(self):
+        if self.laser_channel: self.laser_channel.stop()
+
+    # --- Resets ---
+    def reset_round(self, serve_to_player_idx=None, start_immediately=False):
+        """Resets ball, powerups, effects for a new point."""
+        self.rally_ongoing = False
+        for p in [self.player_paddle_left, self.player_paddle_right]:
+            effects_to_keep = ["shrunken_by_opponent"] # Keep shrink effect between points
+            p.reset_all_effects(keep_effects_named=effects_to_keep)
+
+        # Clear transient sprites
+        for ball_obj in self.balls:
+            if ball_obj.is_laser_shot and self.laser_channel and ball_obj.laser_sound_playing:
+                self.laser_channel.stop()
+                ball_obj.laser_sound_playing = False
+            ball_obj.kill() # Remove from all groups
+        self.balls.empty()
+        self.active_powerups.empty()
+        self.distractor_sprites_group.empty()
+        self.impact_particles.empty()
+
+        self.main_ball = self._create_ball()
+
+        # Determine serve direction
+        player_to_serve_towards = serve_to_player_idx if serve_to_player_idx is not None else self.last_player_scored_on
+        if player_to_serve_towards is None: player_to_serve_towards = self.rng.choice([0,1])
+
+        self.main_ball.reset(initial_spawn=True, scored_on_player=player_to_serve_towards, start_static=(not start_immediately))
+        self.balls.add(self.main_ball)
+        self.all_sprites.add(self.main_ball)
+
+    def reset_match(self, seed=None):
+        """Resets the entire match; play begins after the serve countdown.
+
+        seed fixes the match's random streams (None draws one from the global
+        random module); time_tick restarts at 0 so a match never depends on
+        the ones played before it.
+        """
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.impact_particles.rng.seed(self.rng.getrandbits(32)) # Own stream, see ParticleSystem
+        self.time_tick = 0
+        self.score_a, self.score_b = 0, 0
+        self.winner_text = ""
+        self._select_powerup_profile() # game_mode may have changed since the last match
+        self.is_sudden_death_mode = False
+        self.sudden_death_sound_played_this_activation = False
+        for paddle in [self.player_paddle_left, self.player_paddle_right]:
+            paddle.rect.y = (SCREEN_HEIGHT - paddle.base_height) // 2
+            paddle.reset_all_effects() # Clear all effects on full reset
+
+        self._stop_laser()
+
+        self.last_player_scored_on = self.rng.choice([0, 1]) # Randomize first serve
+        # Ball starts static; the countdown serves it
+        self.reset_round(serve_to_player_idx=self.last_player_scored_on, start_immediately=False)
+
+        self.phase = STATE_COUNTDOWN
+        self.countdown_value = COUNTDOWN_INITIAL_VALUE
+        self.countdown_timer = COUNTDOWN_FRAMES_PER_NUMBER
+
+    # --- Simulation ---
+    def step(self, inputs=None):
+        """Advances the match by one tick and returns this tick's events."""
+        if inputs is None: inputs = NO_INPUT
+        self.events = []
+        self.time_tick += 1
+        self._refresh_paddle_related_sprites()
+        self._remember_positions()
+
+        if self.phase == STATE_COUNTDOWN:
+            self._step_countdown()
+        elif self.phase == STATE_PLAYING:
+            self._handle_launches(inputs)
+            self._step_playing(inputs)
+        self.profiler.mark("sim_other")
+        return self.events
+
+    def _refresh_paddle_related_sprites(self):
+        self.all_paddle_related_sprites.empty()
+        self.all_paddle_related_sprites.add(self.player_paddle_left, self.player_paddle_right)
+        for paddle in [self.player_paddle_left, self.player_paddle_right]:
+            if paddle.shield_sprite and paddle.shield_sprite.alive():
+                self.all_paddle_related_sprites.add(paddle.shield_sprite)
+
+    def _remember_positions(self):
+        # Renderers interpolate between prev_center and the post-step rect
+        for sprite in self.balls: sprite.prev_center = sprite.rect.center
+        for sprite in self.all_paddle_related_sprites: sprite.prev_center = sprite.rect.center
+
+    def _step_countdown(self):
+        # Keep ball centered and static during countdown
+        if self.main_ball.alive():
+            self.main_ball.velocity = [0, 0]
+            self.main_ball.rect.center = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+            self.main_ball.spin_y = 0
+
+        self.countdown_timer -= 1
+        if self.countdown_timer <= 0:
+            self.countdown_value -= 1
+            if self.countdown_value <= 0: # Countdown finished
+                self.phase = STATE_PLAYING
+                self.play_sound("countdown_tick") # Final tick sound
+                if self.main_ball.alive(): # Serve the ball
+                    self.main_ball.reset(scored_on_player=self.last_player_scored_on, start_static=False)
+                self.events.append(("serve", self.last_player_scored_on))
+            else:
+                self.play_sound("countdown_tick")
+                self.countdown_timer = COUNTDOWN_FRAMES_PER_NUMBER
+
+    def _is_ai_controlled(self, paddle):
+        if paddle is self.player_paddle_left: return self.left_ai_difficulty is not None
+        return self.game_mode == GAME_MODE_AI
+
+    def _handle_launches(self, inputs):
+        # Sticky ball launch; AI paddles hold the ball for a random moment before releasing it
+        launchers = [(self.player_paddle_left, inputs.get("left_launch")),
+                     (self.player_paddle_right, inputs.get("right_launch"))]
+        for paddle, wants_launch in launchers:
+            if self._is_ai_controlled(paddle):
+                wants_launch = paddle.stuck_ball is not None and self.rng.random() < AI_STICKY_LAUNCH_CHANCE
+            if paddle.stuck_ball and wants_launch:
+                self.play_sound("sticky_ball_launch")
+                stuck_ball_ref = paddle.stuck_ball
+                paddle.remove_effect("sticky")
+                if stuck_ball_ref:
+                    stuck_ball_ref.launch_from_paddle(paddle)
+                paddle.stuck_ball = None
+
+    def _step_playing(self, inputs):
+        left, right = self.player_paddle_left, self.player_paddle_right
+        profiler = self.profiler
+        profiler.mark("sim_other")
+
+        # Update paddle states
+        left.update_movement_state()
+        right.update_movement_state()
+        left.update_timers_and_effects()
+        right.update_timers_and_effects()
+
+        # --- Player Movement ---
+        if left.can_move():
+            if self.left_ai_difficulty is not None:
+                left.ai_move(self.balls, self.left_ai_difficulty)
+            else:
+                move_dir_left = inputs.get("left_dir", 0)
+                if move_dir_left != 0: left.move(move_dir_left, PADDLE_SPEED)
+
+        if right.can_move():
+            if self.game_mode == GAME_MODE_2P:
+                move_dir_right = inputs.get("right_dir", 0)
+                if move_dir_right != 0: right.move(move_dir_right, PLAYER_2_PADDLE_SPEED)
+            elif self.game_mode == GAME_MODE_AI:
+                right.ai_move(self.balls, self.difficulty) # AI uses speeds from config
+
+        self.rally_ongoing = len(self.balls) > 0 and any(b.velocity != [0,0] for b in self.balls if b.alive())
+        profiler.mark("paddle_effects")
+
+        self._update_balls()
+        profiler.mark("ball_loop")
+        if self.phase != STATE_PLAYING: return # Match ended inside the ball loop
+
+        self._spawn_powerups()
+        self._spawn_distractors()
+        profiler.mark("spawning")
+
+        # --- Update Groups ---
+        main_ball_rect_for_magnet = self.main_ball.rect if self.main_ball.alive() else None
+        self.active_powerups.update(main_ball_rect_for_magnet, self.time_tick)
+        self.distractor_sprites_group.update(self.time_tick)
+        self.impact_particles.update()
+        profiler.mark("group_updates")
+
+    def _update_balls(self):
+        left, right = self.player_paddle_left, self.player_paddle_right
+        impact_particles = self.impact_particles
+
+        # Phase 1 integrates every ball (scalar or batched) and bounces it off the walls;
+        # phase 2 then resolves goals and collisions ball by ball. Both paths share this order.
+        free_balls = []
+        for ball_obj in list(self.balls):
+            if not ball_obj.alive(): continue
+
+            # --- Handle Stuck Ball ---
+            if ball_obj.is_stuck and ball_obj.last_hit_paddle_instance:
+                stuck_paddle = ball_obj.last_hit_paddle_instance
+                if stuck_paddle.alive() and stuck_paddle.has_effect("sticky"):
+                    offset_x = (stuck_paddle.base_width // 2 + ball_obj.current_radius + 2) * (1 if stuck_paddle.player_num == 0 else -1)
+                    ball_obj.rect.centerx = stuck_paddle.rect.centerx + offset_x
+                    ball_obj.rect.centery = stuck_paddle.rect.centery
+                    ball_obj.velocity = [0,0]; ball_obj.spin_y = 0
+                    ball_obj.update(self.rally_ongoing, self.time_tick)
+                    continue
+                else:
+                    ball_obj.is_stuck = False
+                    ball_obj.last_hit_paddle_instance = None
+                    direction = 1 if stuck_paddle.player_num == 0 else -1
+                    ball_obj.velocity = [BALL_INITIAL_SPEED_X * 0.5 * direction, self.rng.uniform(-1,1)]
+                    ball_obj.current_speed_x_magnitude = abs(ball_obj.velocity[0])
+            free_balls.append(ball_obj)
+        sweep_starts = {ball_obj: ball_obj.rect.center for ball_obj in free_balls}
+
+        if self.ball_store is not None and free_balls:
+            hit_top, hit_bottom, pre_centers, pre_spins = self.ball_store.integrate(free_balls, self.rally_ongoing)
+            for i, ball_obj in enumerate(free_balls):
+                ball_obj.finish_batched_update(self.time_tick, pre_centers[i], pre_spins[i])
+                if hit_top[i]: self._wall_hit_effects(ball_obj, ball_obj.rect.top)
+                if hit_bottom[i]: self._wall_hit_effects(ball_obj, ball_obj.rect.bottom)
+        else:
+            for ball_obj in free_balls:
+                ball_obj.update(self.rally_ongoing, self.time_tick)
+                # --- Boundary Collisions (Top/Bottom Walls) ---
+                if ball_obj.rect.top <= 0:
+                    ball_obj.rect.top = 0; ball_obj.velocity[1] *= -1
+                    self._wall_hit_effects(ball_obj, ball_obj.rect.top)
+                if ball_obj.rect.bottom >= SCREEN_HEIGHT:
+                    ball_obj.rect.bottom = SCREEN_HEIGHT; ball_obj.velocity[1] *= -1
+                    self._wall_hit_effects(ball_obj, ball_obj.rect.bottom)
+
+        # --- Broadphase: paddles/shields, power-ups and distractors don't move during the ball loop ---
+        grid = self.spatial_grid
+        entity_groups = (self.all_paddle_related_sprites, self.active_powerups, self.distractor_sprites_group)
+        grid.rebuild(entity_groups, len(free_balls))
+        candidate_pairs = grid.candidate_pairs(free_balls) # Every ball's overlaps in one pass
+        repel_paddles = [paddle for paddle in [left, right] if paddle.has_effect("repel_field")]
+        sweep_ends = {ball_obj: ball_obj.rect.center for ball_obj in free_balls}
+
+        for ball_obj in free_balls:
+            if not ball_obj.alive(): continue
+
+            # --- Continuous Collision (before goals: a fast ball can cross a paddle and the goal line in one tick) ---
+            if ball_obj.rect.center == sweep_ends[ball_obj]: # Not moved since integration (e.g. teleported)
+                self._sweep_paddle_contact(ball_obj, sweep_starts[ball_obj])
+
+            # --- Goal Scoring ---
+            scored_this_frame = False
+            player_scored_on = -1
+
+            # Left Goal
+            if ball_obj.rect.left <= 0:
+                if left.has_effect("point_shield"):
+                    left.remove_effect("point_shield")
+                    self.play_sound("point_shield_denied")
+                    ball_obj.rect.left = 1; ball_obj.velocity[0] *= -1
+                    create_impact_particles(ball_obj.rect.left, ball_obj.rect.centery, impact_particles, "wall")
+                else:
+                    self.score_b += 1; scored_this_frame = True; player_scored_on = 0
+                    self.play_sound("goal_scored")
+                    create_impact_particles(0, ball_obj.rect.centery, impact_particles, "goal")
+
+            # Right Goal
+            elif ball_obj.rect.right >= SCREEN_WIDTH:
+                if right.has_effect("point_shield"):
+                    right.remove_effect("point_shield")
+                    self.play_sound("point_shield_denied")
+                    ball_obj.rect.right = SCREEN_WIDTH - 1; ball_obj.velocity[0] *= -1
+                    create_impact_particles(ball_obj.rect.right, ball_obj.rect.centery, impact_particles, "wall")
+                else:
+                    self.score_a += 1; scored_this_frame = True; player_scored_on = 1
+                    self.play_sound("goal_scored")
+                    create_impact_particles(SCREEN_WIDTH, ball_obj.rect.centery, impact_particles, "goal")
+
+            # --- Handle Post-Score Logic ---
+            if scored_this_frame:
+                self.last_player_scored_on = player_scored_on
+                self.events.append(("goal", player_scored_on))
+
+                # Check for Sudden Death Activation
+                if not self.is_sudden_death_mode and \
+                   (self.score_a >= SUDDEN_DEATH_SCORE_THRESHOLD or self.score_b >= SUDDEN_DEATH_SCORE_THRESHOLD) and \
+                   abs(self.score_a - self.score_b) < 2:
+                    if not self.sudden_death_sound_played_this_activation:
+                        self.play_sound("sudden_death")
+                        self.sudden_death_sound_played_this_activation = True
+                    self.is_sudden_death_mode = True
+                    self.events.append(("sudden_death", None))
+
+                # Check for Game Over Condition
+                game_is_over = False
+                if self.is_sudden_death_mode:
+                    if abs(self.score_a - self.score_b) >= 2: game_is_over = True
+                elif self.score_a >= WINNING_SCORE or self.score_b >= WINNING_SCORE:
+                    game_is_over = True
+
+                if game_is_over:
+                    self.phase = STATE_GAME_OVER
+                    self.winner_text = f"Player {'Left' if self.score_a > self.score_b else 'Right'} Wins!"
+                    player_is_left_human = True
+                    if self.game_mode == GAME_MODE_2P: self.play_sound("game_over_win")
+                    elif player_is_left_human and self.score_a > self.score_b: self.play_sound("game_over_win")
+                    else: self.play_sound("game_over_lose")
+                    self._stop_laser()
+                    self.balls.empty(); self.active_powerups.empty(); self.distractor_sprites_group.empty(); impact_particles.empty()
+                    if ball_obj.alive(): ball_obj.kill()
+                    self.events.append(("game_over", 0 if self.score_a > self.score_b else 1))
+                    break # Exit ball loop
+                else:
+                    # Point scored, but game not over: reset and keep playing (no countdown)
+                    if ball_obj.alive():
+                        if ball_obj.is_laser_shot and self.laser_channel and ball_obj.laser_sound_playing:
+                            self.laser_channel.stop()
+                            ball_obj.laser_sound_playing = False
+                        ball_obj.kill()
+                    self.reset_round(serve_to_player_idx=player_scored_on, start_immediately=True)
+                    continue
+
+            # --- Paddle Collisions ---
+            collision_list = self._ball_overlaps(ball_obj, candidate_pairs, 0)
+            collided_paddle = None
+            collided_shield = None
+            for item in collision_list:
+                if isinstance(item, Paddle): collided_paddle = item
+                elif item.alive(): # Shield check
+                    if left.shield_sprite == item: collided_shield = left
+                    elif right.shield_sprite == item: collided_shield = right
+                if collided_paddle: break
+
+            # --- Handle Paddle Hit ---
+            if collided_paddle:
+                paddle = collided_paddle
+                is_ghost_pass = ball_obj.is_ghost_ball and ball_obj.ghost_can_pass_paddle
+                if is_ghost_pass:
+                    ball_obj.ghost_can_pass_paddle = False
+                    continue
+
+                is_moving_towards_paddle = (paddle.player_num == 0 and ball_obj.velocity[0] < 0) or \
+                                           (paddle.player_num == 1 and ball_obj.velocity[0] > 0)
+
+                if is_moving_towards_paddle:
+                    if paddle.player_num == 0: ball_obj.rect.left = paddle.rect.right
+                    else: ball_obj.rect.right = paddle.rect.left
+                    original_velocity_x_direction = math.copysign(1, ball_obj.velocity[0])
+                    ball_obj.velocity[0] *= -1
+                    relative_hit_pos = max(-1.0, min(1.0, (ball_obj.rect.centery - paddle.rect.centery) / (paddle.current_height / 2)))
+                    spin_from_hit = relative_hit_pos * PADDLE_SPIN_FACTOR
+                    spin_from_motion = paddle.speed_y_for_spin * PADDLE_EDGE_SPIN_FACTOR
+                    ball_obj.spin_y += spin_from_hit + spin_from_motion
+                    ball_obj.spin_y = max(-BALL_MAX_SPIN, min(BALL_MAX_SPIN, ball_obj.spin_y))
+
+                    if ball_obj.is_laser_shot:
+                        self.play_sound("laser_shot_hit")
+                    else:
+                        ball_obj.current_speed_x_magnitude = min(BALL_MAX_SPEED_X, ball_obj.current_speed_x_magnitude + BALL_SPEED_INCREMENT_HIT)
+                        ball_obj.velocity[0] = math.copysign(ball_obj.current_speed_x_magnitude, ball_obj.velocity[0])
+                        if abs(ball_obj.spin_y) > PADDLE_SPIN_FACTOR * 0.6 or abs(paddle.speed_y_for_spin) > PADDLE_SPEED * 0.4:
+                            self.play_sound("paddle_hit_spin")
+                        else:
+                            self.play_sound("paddle_hit")
+
+                    ball_obj.last_hit_paddle_instance = paddle
+                    ball_obj.last_hit_by_timer = BALL_LAST_HIT_TIMER_DURATION
+                    create_impact_particles(ball_obj.rect.centerx, ball_obj.rect.centery, impact_particles, "paddle")
+                    self.events.append(("paddle_hit", paddle.player_num))
+
+                    # Handle Paddle Effects on Hit
+                    if paddle.has_effect("sticky") and not ball_obj.is_stuck:
+                        ball_obj.stick_to_paddle(paddle)
+                        continue # Skip other effects if stuck
+
+                    if paddle.has_effect("laser_shot") and not ball_obj.is_laser_shot:
+                        ball_obj.activate_laser_shot(); paddle.remove_effect("laser_shot")
+                    if paddle.has_effect("curve_shot_ready"):
+                        curve_spin = self.rng.uniform(2.5, 4.5) * (-1 if original_velocity_x_direction > 0 else 1)
+                        ball_obj.spin_y += curve_spin
+                        ball_obj.spin_y = max(-BALL_MAX_SPIN, min(BALL_MAX_SPIN, ball_obj.spin_y))
+                        paddle.remove_effect("curve_shot_ready")
+                    if paddle.has_effect("ghost_shot_ready"):
+                        ball_obj.activate_ghost_mode(GHOST_BALL_DURATION); paddle.remove_effect("ghost_shot_ready")
+                    if paddle.has_effect("ball_split_ready"):
+                        paddle.remove_effect("ball_split_ready"); self.play_sound("multi_ball")
+                        self._split_ball(ball_obj)
+                    collided_shield = None # Paddle hit overrides shield
+
+            # --- Handle Shield Hit ---
+            elif collided_shield:
+                paddle = collided_shield
+                moving_towards_shield = (paddle.player_num == 0 and ball_obj.velocity[0] < 0) or \
+                                        (paddle.player_num == 1 and ball_obj.velocity[0] > 0)
+                if moving_towards_shield:
+                    shield_rect = paddle.shield_sprite.rect
+                    if paddle.player_num == 0: ball_obj.rect.left = shield_rect.right
+                    else: ball_obj.rect.right = shield_rect.left
+                    if ball_obj.is_laser_shot: self.play_sound("laser_shot_hit")
+                    self.play_sound("shield_hit")
+                    if self.rng.random() < 0.1: self.play_sound("shield_mock_laugh")
+                    ball_obj.velocity[0] *= -1.05
+                    ball_obj.current_speed_x_magnitude = min(BALL_MAX_SPEED_X, abs(ball_obj.velocity[0]))
+                    ball_obj.velocity[0] = math.copysign(ball_obj.current_speed_x_magnitude, ball_obj.velocity[0])
+                    ball_obj.velocity[1] *= 0.9; ball_obj.spin_y *= 0.5
+                    create_impact_particles(ball_obj.rect.centerx, ball_obj.rect.centery, impact_particles, "wall")
+
+            # --- Power-up Collisions ---
+            powerup_hit_list = self._ball_overlaps(ball_obj, candidate_pairs, 1)
+            for powerup in powerup_hit_list: powerup.kill()
+            if powerup_hit_list: paddle_rects = [(sprite, sprite.rect.copy()) for sprite in self.all_paddle_related_sprites]
+            for powerup in powerup_hit_list:
+                if ball_obj.last_hit_paddle_instance and ball_obj.last_hit_by_timer > 0:
+                    collecting_paddle = ball_obj.last_hit_paddle_instance
+                else:
+                    dist_left = abs(powerup.rect.centerx - left.rect.centerx)
+                    dist_right = abs(powerup.rect.centerx - right.rect.centerx)
+                    collecting_paddle = left if dist_left < dist_right else right
+
+                other_paddle = right if collecting_paddle == left else left
+                actual_type, general_collect_sound_name = powerup.collected(
+                    collecting_paddle, other_paddle, self.balls, self.main_ball,
+                    impact_particles, self.time_tick, self.play_sound_func, self.multiball_count, self.powerup_table, self.rng
+                )
+                self.play_sound(general_collect_sound_name)
+                self.events.append(("powerup", (collecting_paddle.player_num, actual_type)))
+            if powerup_hit_list: # Power-ups can move/resize paddles or grant a repel field mid-tick
+                if any(sprite.rect != rect for sprite, rect in paddle_rects):
+                    grid.rebuild(entity_groups, len(free_balls)); candidate_pairs.clear()
+                repel_paddles = [paddle for paddle in [left, right] if paddle.has_effect("repel_field")]
+
+            # --- Distractor Collisions ---
+            distractor_hit_list = self._ball_overlaps(ball_obj, candidate_pairs, 2)
+            for distractor in distractor_hit_list:
+                if isinstance(distractor, CrazyDuckSprite):
+                    if distractor.hit_ball(ball_obj):
+                        create_impact_particles(ball_obj.rect.centerx, ball_obj.rect.centery, impact_particles, "generic")
+
+            # --- Repel Field Interaction ---
+            for paddle in repel_paddles:
+                self._apply_repel_field(paddle, ball_obj)
+
+    def _sweep_paddle_contact(self, ball_obj, start_center):
+        """Moves a ball that passed through a paddle or shield this tick back to its first contact.
+
+        Only balls that end the tick clear of every paddle and shield are swept,
+        so ordinary overlaps keep their discrete handling; the ball is left
+        overlapping the contact face by one pixel so the paddle/shield hit code
+        below treats it like any other hit.
+        """
+        rect = ball_obj.rect; end_center = rect.center
+        if abs(end_center[0] - start_center[0]) > INTERPOLATION_SNAP_DISTANCE or \
+           abs(end_center[1] - start_center[1]) > INTERPOLATION_SNAP_DISTANCE: return # Reset or teleport, not motion
+        sprites = [sprite for sprite in self.all_paddle_related_sprites if sprite.alive()]
+        targets = [sprite.rect for sprite in sprites]
+        if rect.collidelist(targets) != -1: return
+        swept_area = rect.union(rect.move(start_center[0] - end_center[0], start_center[1] - end_center[1]))
+        ghost_pass = ball_obj.is_ghost_ball and ball_obj.ghost_can_pass_paddle
+        first_contact = None
+        for i in swept_area.collidelistall(targets):
+            if ghost_pass and isinstance(sprites[i], Paddle): continue
+            contact = swept_circle_rect(start_center, end_center, rect.width / 2, targets[i])
+            if contact and (first_contact is None or contact[0] < first_contact[0]):
+                first_contact = (contact[0], contact[1], targets[i])
+        if first_contact is None: return
+
+        t, (normal_x, normal_y), target = first_contact
+        rect.center = (round(start_center[0] + (end_center[0] - start_center[0]) * t),
+                       round(start_center[1] + (end_center[1] - start_center[1]) * t))
+        if abs(normal_x) >= abs(normal_y): # Side face (or a corner hit mostly from the side)
+            if normal_x > 0: rect.left = target.right - 1
+            else: rect.right = target.left + 1
+            rect.bottom = max(rect.bottom, target.top + 1); rect.top = min(rect.top, target.bottom - 1)
+        else:
+            if normal_y > 0: rect.top = target.bottom - 1
+            else: rect.bottom = target.top + 1
+            rect.right = max(rect.right, target.left + 1); rect.left = min(rect.left, target.right - 1)
+
+    def _ball_overlaps(self, ball_obj, candidate_pairs, group_index):
+        """Live sprites of entity group group_index that ball_obj overlaps; re-queried if the ball moved since the batch query."""
+        pair = candidate_pairs.get(ball_obj)
+        if pair is None or pair[0] != ball_obj.rect:
+            pair = candidate_pairs[ball_obj] = (ball_obj.rect.copy(), self.spatial_grid.query(ball_obj.rect))
+        if not pair[1]: return []
+        groups = self.spatial_grid.group_index
+        return [sprite for sprite in pair[1] if groups[sprite] == group_index and sprite.alive()]
+
+    def _wall_hit_effects(self, ball_obj, wall_y):
+        self.play_sound("wall_hit")
+        create_impact_particles(ball_obj.rect.centerx, wall_y, self.impact_particles, "wall")
+
+    def _split_ball(self, ball_obj):
+        for i in range(self.multiball_count):
+            new_ball = self._create_ball()
+            new_ball.rect.center = ball_obj.rect.center
+            angle_offset = self.rng.uniform(-math.pi/7, math.pi/7) * (1 if i == 0 else -1)
+            original_angle = math.atan2(ball_obj.velocity[1], ball_obj.velocity[0])
+            new_angle = original_angle + angle_offset
+            new_ball_speed = ball_obj.current_speed_x_magnitude * 0.85
+            new_ball.velocity = [math.cos(new_angle) * new_ball_speed, math.sin(new_angle) * new_ball_speed]
+            new_ball.current_speed_x_magnitude = new_ball_speed
+            new_ball.spin_y = ball_obj.spin_y * 0.5 + self.rng.uniform(-1.5,1.5)
+            new_ball.is_main_ball = False
+            self.balls.add(new_ball); self.all_sprites.add(new_ball)
+
+    def _apply_repel_field(self, paddle, ball_obj):
+        repel_radius = paddle.current_height * REPEL_FIELD_RADIUS_FACTOR
+        repel_radius_sq = repel_radius * repel_radius
+        dx = ball_obj.rect.centerx - paddle.rect.centerx
+        dy = ball_obj.rect.centery - paddle.rect.centery
+        distance_sq = dx*dx + dy*dy
+        if 0 < distance_sq < repel_radius_sq:
+            distance = math.sqrt(distance_sq)
+            force_magnitude = REPEL_FIELD_STRENGTH * (1 - distance / repel_radius)
+            ball_obj.velocity[0] += (dx / distance) * force_magnitude
+            ball_obj.velocity[1] += (dy / distance) * force_magnitude
+            speed_mag_sq = ball_obj.velocity[0]**2 + ball_obj.velocity[1]**2
+            max_speed_sq = (BALL_MAX_SPEED_X * 1.3)**2
+            if speed_mag_sq > max_speed_sq:
+                scale = math.sqrt(max_speed_sq / speed_mag_sq)
+                ball_obj.velocity[0] *= scale
+                ball_obj.velocity[1] *= scale
+            ball_obj.current_speed_x_magnitude = abs(ball_obj.velocity[0])
+
+    def _spawn_powerups(self):
+        rng = self.rng
+        if rng.random() < self.powerup_spawn_chance and len(self.active_powerups) < self.max_powerups:
+            spawn_x = rng.randint(int(SCREEN_WIDTH * 0.15), int(SCREEN_WIDTH * 0.85))
+            if SCREEN_WIDTH * 0.4 < spawn_x < SCREEN_WIDTH * 0.6:
+                spawn_x += SCREEN_WIDTH * 0.15 * rng.choice([-1,1])
+            spawn_y = rng.randint(POWERUP_SIZE, SCREEN_HEIGHT - POWERUP_SIZE)
+            spawn_rect = pygame.Rect(0,0, POWERUP_SIZE, POWERUP_SIZE); spawn_rect.center = (spawn_x, spawn_y)
+            if not any(p.rect.colliderect(spawn_rect) for p in self.active_powerups):
+                new_powerup = PowerUp(spawn_x, spawn_y)
+                self.active_powerups.add(new_powerup); self.all_sprites.add(new_powerup)
+                self.play_sound("powerup_spawn")
+
+    def _spawn_distractors(self):
+        rng = self.rng
+        if rng.random() < self.distractor_spawn_chance and len(self.distractor_sprites_group) < self.max_distractors:
+            num_ducks = len([s for s in self.distractor_sprites_group if isinstance(s, CrazyDuckSprite)])
+            num_generic = len(self.distractor_sprites_group) - num_ducks
+            spawn_duck = (rng.random() < CRAZY_DUCK_SPAWN_CHANCE_RATIO and num_ducks < self.max_ducks)
+            spawn_generic = (not spawn_duck and num_generic < (self.max_distractors - self.max_ducks))
+            new_distractor = None
+            if spawn_duck: new_distractor = CrazyDuckSprite(play_sound_func=self.play_sound_func, rng=rng)
+            elif spawn_generic: new_distractor = DistractorSprite(rng)
+            if new_distractor:
+                self.distractor_sprites_group.add(new_distractor); self.all_sprites.add(new_distractor)
+                if spawn_duck: self.play_sound("duck_spawn")
+
+    # --- Introspection ---
+    def state(self):
+        """Returns a plain-data snapshot of the match (safe to pickle or dump as JSON)."""
+        def paddle_state(p):
+            return {"x": p.rect.x, "y": p.rect.y, "height": p.current_height,
+                    "effects": list(p.effects),
+                    "indicator": p.powerup_indicator_text}
+        return {
+            "tick": self.time_tick,
+            "phase": self.phase,
+            "score": (self.score_a, self.score_b),
+            "sudden_death": self.is_sudden_death_mode,
+            "stress_factor": self.stress_factor,
+            "winner_text": self.winner_text,
+            "countdown_value": self.countdown_value,
+            "paddles": [paddle_state(self.player_paddle_left), paddle_state(self.player_paddle_right)],
+            "balls": [{"center": b.rect.center, "velocity": tuple(b.velocity), "spin": b.spin_y,
+                       "radius": b.current_radius, "is_main": b.is_main_ball, "is_stuck": b.is_stuck,
+                       "is_laser": b.is_laser_shot, "is_ghost": b.is_ghost_ball}
+                      for b in self.balls],
+            "powerups": [p.rect.center for p in self.active_powerups],
+            "distractors": [(d.rect.center, isinstance(d, CrazyDuckSprite)) for d in self.distractor_sprites_group],
+        }
@@ -1,16 +1,24 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
 
+# Build step: pack every sound into one pre-decoded PCM bank, so the bundle carries
+# that plus the music instead of loose WAVs, duplicate sfx folders and zips
+sys.path.insert(0, SPECPATH)
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+from audio_bank import build_bank
+bank_path = build_bank(os.path.join(SPECPATH, "assets"))
 
 a = Analysis(
     ['game.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets')],
+    datas=[(bank_path, 'assets'), (os.path.join('assets', 'sounds', 'psychosis_loop_dark.ogg'), os.path.join('assets', 'sounds'))],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['pkg_resources'], # Optional for pygame (pkgdata falls back to plain files); ~100 ms of import time
     noarchive=False,
     optimize=0,
 )
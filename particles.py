@@ -0,0 +1,119 @@
+# particles.py — Array-backed Impact Particle System (replaces per-particle Sprites)
+
+import pygame
+import random
+import math
+import numpy as np
+
+from config import *
+from utils import scaled_image
+
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored in NumPy arrays.
+
+    Mirrors the bits of the pygame.sprite.Group API the game uses (update, draw,
+    empty, len) so it can stand in for the old impact_particles group. Slots are
+    handed out from a free-list; when the pool is full new particles are dropped.
+    Drawing reuses small pre-rendered squares keyed by (size, quantized colour,
+    alpha level) instead of allocating a Surface per particle per frame.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.burst_scale = 1 # Multiplies every emit() count (stress mode)
+        self.detail = 1.0 # Fraction of each burst actually spawned (adaptive quality)
+        self.rng = random.Random(random.getrandbits(32)) # Particles' own stream: how many spawn never changes gameplay draws
+        self.dropped = 0 # Particles not spawned because the pool was full
+        self._square_cache = {}
+        self.set_capacity(capacity)
+
+    def set_capacity(self, capacity):
+        """Reallocates the pool for a new capacity; live particles are discarded."""
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.lifespan = np.zeros(capacity, dtype=np.int32)
+        self.initial_lifespan = np.ones(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.key_base = np.zeros(capacity, dtype=np.int64) # Packed (size, quantized colour); alpha level is added per frame
+        self.active = np.zeros(capacity, dtype=bool)
+        self.free_slots = list(range(capacity - 1, -1, -1)) # Stack; pop() hands out the lowest slot first
+        self.active_count = 0
+
+    def __len__(self):
+        return self.active_count
+
+    def emit(self, x, y, color_func, count, size_range=(2,6), speed_range=(1,PARTICLE_SPEED_IMPACT), lifespan_mod=0):
+        """Spawns up to count particles at (x, y); color_func returns an RGB(A) tuple per particle."""
+        quant = PARTICLE_COLOR_QUANT; levels = 256 // quant
+        count *= self.burst_scale
+        if self.detail < 1.0: count = max(1, int(count * self.detail))
+        rng = self.rng
+        for _ in range(count):
+            if not self.free_slots:
+                self.dropped += 1
+                continue
+            slot = self.free_slots.pop()
+            color_val = color_func() if callable(color_func) else color_func
+            try: r, g, b = color_val[0], color_val[1], color_val[2]
+            except (TypeError, IndexError): r, g, b = 255, 255, 255 # Default to white
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(*speed_range)
+            lifespan = PARTICLE_LIFESPAN_IMPACT + rng.randint(-5,5) + lifespan_mod
+
+            self.pos[slot] = (x, y)
+            self.vel[slot] = (math.cos(angle) * speed, math.sin(angle) * speed)
+            self.lifespan[slot] = lifespan
+            self.initial_lifespan[slot] = max(lifespan, 1)
+            size = rng.randint(*size_range)
+            self.size[slot] = size
+            self.key_base[slot] = (((size * levels + min(int(r), 255) // quant) * levels + min(int(g), 255) // quant) * levels
+                                   + min(int(b), 255) // quant) * PARTICLE_ALPHA_LEVELS
+            self.active[slot] = True
+            self.active_count += 1
+
+    def update(self):
+        """Moves and ages every live particle in one vectorized pass."""
+        if not self.active_count: return
+        live = self.active
+        self.pos[live] += self.vel[live]
+        self.lifespan[live] -= 1
+        expired = np.flatnonzero(live & (self.lifespan <= 0))
+        if expired.size:
+            self.active[expired] = False
+            self.free_slots.extend(expired.tolist())
+            self.active_count -= expired.size
+
+    def empty(self):
+        self.active[:] = False
+        self.free_slots = list(range(self.capacity - 1, -1, -1))
+        self.active_count = 0
+
+    def _square(self, key):
+        square = self._square_cache.get(key)
+        if square is None:
+            if len(self._square_cache) >= PARTICLE_SURFACE_CACHE_MAX:
+                self._square_cache.pop(next(iter(self._square_cache))) # Evict the oldest entry
+            quant = PARTICLE_COLOR_QUANT; levels = 256 // quant
+            packed, alpha_level = divmod(key, PARTICLE_ALPHA_LEVELS)
+            packed, b = divmod(packed, levels); size, r_g = divmod(packed, levels * levels); r, g = divmod(r_g, levels)
+            square = pygame.Surface((size, size))
+            square.fill((r * quant + quant // 2, g * quant + quant // 2, b * quant + quant // 2)) # Bucket centre
+            square.set_alpha(min(255, (alpha_level + 1) * 256 // PARTICLE_ALPHA_LEVELS))
+            self._square_cache[key] = square
+        return square
+
+    def draw(self, surface, scale=1.0):
+        if not self.active_count: return
+        slots = np.flatnonzero(self.active)
+        ratio = self.lifespan[slots] / self.initial_lifespan[slots]
+        alpha_levels = np.clip((ratio * PARTICLE_ALPHA_LEVELS).astype(np.int64), 0, PARTICLE_ALPHA_LEVELS - 1)
+        # Resolve one cached square per distinct key, not per particle
+        unique_keys, key_index = np.unique(self.key_base[slots] + alpha_levels, return_inverse=True)
+        squares = [self._square(key) for key in unique_keys.tolist()]
+        half = self.size[slots] // 2
+        xs = (self.pos[slots, 0] - half); ys = (self.pos[slots, 1] - half)
+        if scale != 1.0: # Reduced render scale: logical positions, squares shrunk to match
+            squares = [scaled_image(square, scale) for square in squares]
+            xs = xs * scale; ys = ys * scale
+        xs = xs.astype(np.int32).tolist(); ys = ys.astype(np.int32).tolist()
+        surface.blits([(squares[j], (x, y)) for j, x, y in zip(key_index.tolist(), xs, ys)], doreturn=False)
@@ -0,0 +1,202 @@
+# powerups.py — Power-up Registry (handlers, weighted alias-table selection, per-mode profiles)
+
+import json
+import os
+import random
+
+from config import *
+from utils import resource_path
+
+# Category decides the general pickup sound
+CATEGORY_SELF_GOOD = "self_good"; CATEGORY_OPPONENT_BAD = "opponent_bad"
+CATEGORY_SELF_BAD = "self_bad"; CATEGORY_GLOBAL = "global"
+COLLECT_SOUNDS = {CATEGORY_SELF_GOOD: "powerup_collect_good", CATEGORY_OPPONENT_BAD: "powerup_collect_good",
+                  CATEGORY_SELF_BAD: "powerup_collect_bad", CATEGORY_GLOBAL: "powerup_collect"}
+
+
+class PickupContext:
+    """Everything a handler may touch when a power-up is collected."""
+    def __init__(self, collecting_paddle, other_paddle, balls, particles, tick, play_sound_func, multiball_count, ball_factory, rng=random):
+        self.collecting_paddle = collecting_paddle
+        self.other_paddle = other_paddle
+        self.balls = balls
+        self.particles = particles
+        self.tick = tick
+        self.play_sound_func = play_sound_func
+        self.multiball_count = multiball_count
+        self.ball_factory = ball_factory # Ball class, passed in so this module needs no sprites import
+        self.rng = rng # The match's random stream
+
+
+class PowerUpType:
+    """One power-up: what it does to whom, for how long, and how likely it is.
+
+    On pickup: the activation sound plays, then the opponent effect is added,
+    then action(ctx) runs, then the collector gets its own effect (which also
+    drives the on-screen indicator). self_effect defaults to the type's name.
+    """
+    def __init__(self, name, category, duration, self_effect=None, intensity=None,
+                 opponent_effect=None, opponent_duration=None, opponent_intensity=None,
+                 sound=None, action=None, weight=1.0):
+        self.name = name
+        self.category = category
+        self.collect_sound = COLLECT_SOUNDS[category]
+        self.duration = duration
+        self.self_effect = self_effect or name
+        self.intensity = intensity
+        self.opponent_effect = opponent_effect
+        self.opponent_duration = opponent_duration
+        self.opponent_intensity = opponent_intensity
+        self.sound = sound
+        self.action = action
+        self.weight = weight
+
+    def apply(self, ctx):
+        if self.sound and ctx.play_sound_func: ctx.play_sound_func(self.sound)
+        if self.opponent_effect:
+            ctx.other_paddle.add_effect(self.opponent_effect, self.opponent_duration, intensity=self.opponent_intensity, start_tick=ctx.tick)
+        if self.action: self.action(ctx)
+        ctx.collecting_paddle.add_effect(self.self_effect, self.duration, intensity=self.intensity, start_tick=ctx.tick)
+
+    def __repr__(self):
+        return f"PowerUpType(name='{self.name}', category='{self.category}', weight={self.weight})"
+
+
+# --- Actions (immediate effects) ---
+def _spawn_multiball(ctx):
+    paddle = ctx.collecting_paddle
+    for _ in range(ctx.multiball_count):
+        new_ball = ctx.ball_factory(BALL_RADIUS_NORMAL, play_sound_func=ctx.play_sound_func,
+                                    laser_channel=paddle.laser_channel, laser_sound=paddle.laser_sound, rng=ctx.rng)
+        new_ball.is_main_ball = False
+        new_ball.rect.centerx = paddle.rect.centerx + ctx.rng.randint(-20,20)
+        new_ball.rect.centery = paddle.rect.centery + ctx.rng.randint(-PADDLE_HEIGHT_NORMAL//2, PADDLE_HEIGHT_NORMAL//2)
+        dir_x = 1 if paddle.player_num == 0 else -1
+        new_ball.velocity = [dir_x * (BALL_INITIAL_SPEED_X * ctx.rng.uniform(0.8,1.2)), ctx.rng.uniform(-BALL_INITIAL_SPEED_X,BALL_INITIAL_SPEED_X)]
+        new_ball.current_speed_x_magnitude = abs(new_ball.velocity[0])
+        ctx.balls.add(new_ball)
+        if paddle.all_sprites_ref is not None: paddle.all_sprites_ref.add(new_ball)
+
+def _speed_boost_all(ctx):
+    for ball_obj in ctx.balls: ball_obj.activate_speed_boost(POWERUP_SHORT_DURATION)
+
+def _invisibility_all(ctx):
+    for ball_obj in ctx.balls: ball_obj.activate_invisibility(POWERUP_GENERAL_DURATION)
+
+def _toggle_size_all(ctx):
+    new_size = ctx.rng.choice([BALL_RADIUS_BIG, BALL_RADIUS_SMALL])
+    for ball_obj in ctx.balls: ball_obj.activate_size_change(POWERUP_GENERAL_DURATION, new_size)
+
+def _rainbow_all(ctx):
+    for ball_obj in ctx.balls: ball_obj.activate_rainbow_effect(POWERUP_GENERAL_DURATION)
+
+def _teleport_paddle(ctx):
+    ctx.collecting_paddle.teleport_self(ctx.balls) # Plays its own sound
+
+def _teleport_all_balls(ctx):
+    for ball_obj in ctx.balls: ball_obj.teleport_random(ctx.particles)
+
+
+# --- Registry ---
+POWERUP_REGISTRY = {}
+
+def register_powerup(powerup_type):
+    """Adds (or replaces) a power-up type; it joins every selection table built afterwards."""
+    POWERUP_REGISTRY[powerup_type.name] = powerup_type
+    _table_cache.clear()
+    return powerup_type
+
+_table_cache = {} # profile name -> AliasTable
+
+for _powerup_type in (
+    PowerUpType("paddle_big_self", CATEGORY_SELF_GOOD, POWERUP_GENERAL_DURATION, intensity=POWERUP_PADDLE_HEIGHT_BIG),
+    PowerUpType("paddle_small_self", CATEGORY_SELF_BAD, POWERUP_GENERAL_DURATION, intensity=POWERUP_PADDLE_HEIGHT_SMALL),
+    PowerUpType("multi_ball", CATEGORY_GLOBAL, POWERUP_SHORT_DURATION, sound="multi_ball", action=_spawn_multiball),
+    PowerUpType("ball_fast_all", CATEGORY_GLOBAL, POWERUP_SHORT_DURATION, sound="ball_fast", action=_speed_boost_all),
+    PowerUpType("opp_freeze", CATEGORY_OPPONENT_BAD, POWERUP_SHORT_DURATION, opponent_effect="freeze", opponent_duration=PADDLE_FREEZE_DURATION),
+    PowerUpType("ball_invis_all", CATEGORY_GLOBAL, POWERUP_GENERAL_DURATION, sound="ball_invis", action=_invisibility_all),
+    PowerUpType("shield_self", CATEGORY_SELF_GOOD, POWERUP_GENERAL_DURATION, self_effect="shield"),
+    PowerUpType("slow_opponent", CATEGORY_OPPONENT_BAD, POWERUP_GENERAL_DURATION, opponent_effect="slow", opponent_duration=POWERUP_GENERAL_DURATION),
+    PowerUpType("sticky_paddle_self", CATEGORY_SELF_GOOD, STICKY_BALL_DURATION, self_effect="sticky"),
+    PowerUpType("curve_ball_self", CATEGORY_SELF_GOOD, POWERUP_GENERAL_DURATION, self_effect="curve_shot_ready"),
+    PowerUpType("laser_shot_self", CATEGORY_SELF_GOOD, POWERUP_GENERAL_DURATION, self_effect="laser_shot"), # Paddle ready for a laser shot
+    PowerUpType("confuse_opponent_controls", CATEGORY_OPPONENT_BAD, PADDLE_CONFUSE_CONTROLS_DURATION,
+                opponent_effect="confused_controls", opponent_duration=PADDLE_CONFUSE_CONTROLS_DURATION),
+    PowerUpType("point_shield_self", CATEGORY_SELF_GOOD, -1, self_effect="point_shield"), # -1 for indefinite until used
+    PowerUpType("ball_size_toggle_all", CATEGORY_GLOBAL, POWERUP_GENERAL_DURATION, sound="ball_size_toggle", action=_toggle_size_all),
+    PowerUpType("rainbow_ball_all", CATEGORY_GLOBAL, POWERUP_GENERAL_DURATION, sound="rainbow_ball", action=_rainbow_all),
+    PowerUpType("opponent_paddle_shrink", CATEGORY_OPPONENT_BAD, POWERUP_SHORT_DURATION, opponent_effect="shrunken_by_opponent",
+                opponent_duration=OPPONENT_PADDLE_SHRINK_DURATION, opponent_intensity=OPPONENT_PADDLE_SHRINK_HEIGHT),
+    PowerUpType("ball_ghost_self", CATEGORY_SELF_GOOD, POWERUP_GENERAL_DURATION, self_effect="ghost_shot_ready"),
+    PowerUpType("paddle_teleport_self", CATEGORY_SELF_GOOD, 20, action=_teleport_paddle), # Short indicator
+    PowerUpType("repel_field_self", CATEGORY_SELF_GOOD, REPEL_FIELD_DURATION, self_effect="repel_field"),
+    PowerUpType("ball_split_self", CATEGORY_SELF_GOOD, POWERUP_GENERAL_DURATION, self_effect="ball_split_ready"),
+    PowerUpType("ball_teleport_all", CATEGORY_GLOBAL, POWERUP_SHORT_DURATION, sound="ball_teleport", action=_teleport_all_balls),
+):
+    register_powerup(_powerup_type)
+
+
+# --- Weighted Selection ---
+class AliasTable:
+    """Walker/Vose alias table: O(1) weighted picks however many types there are.
+
+    Equal weights skip the table and use rng.choice, which keeps seeded
+    matches identical to the uniform picker this replaced.
+    """
+    def __init__(self, names, weights):
+        total = float(sum(weights))
+        if not names or total <= 0: raise ValueError("AliasTable needs at least one positive weight")
+        self.names = list(names)
+        self.uniform = len(set(weights)) == 1
+        n = len(self.names)
+        self.prob = [1.0] * n; self.alias = list(range(n))
+        if self.uniform: return
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop(); l = large.pop()
+            self.prob[s] = scaled[s]; self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to rounding error and keep prob 1.0
+
+    def pick(self, rng=random):
+        if self.uniform: return rng.choice(self.names)
+        u = rng.random() * len(self.names)
+        i = int(u)
+        return self.names[i] if u - i < self.prob[i] else self.names[self.alias[i]]
+
+
+def load_weight_profiles(path=POWERUP_PROFILES_PATH):
+    """Built-in profiles from config, overridden per type by an optional JSON file ({profile: {type: weight}})."""
+    profiles = {name: dict(weights) for name, weights in POWERUP_WEIGHT_PROFILES.items()}
+    if not path: return profiles
+    full_path = resource_path(path)
+    if not os.path.exists(full_path): return profiles
+    try:
+        with open(full_path) as f: loaded = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load power-up profiles '{full_path}': {e}")
+        return profiles
+    for profile_name, weights in loaded.items():
+        profile = profiles.setdefault(profile_name, {})
+        for type_name, weight in weights.items():
+            if type_name not in POWERUP_REGISTRY: print(f"Warning: Unknown power-up '{type_name}' in profile '{profile_name}'")
+            else: profile[type_name] = float(weight)
+    return profiles
+
+weight_profiles = load_weight_profiles()
+
+def get_selection_table(profile_name="default"):
+    """Cached AliasTable for a profile; types the profile doesn't mention keep their registered weight."""
+    table = _table_cache.get(profile_name)
+    if table is None:
+        overrides = weight_profiles.get(profile_name, {})
+        names = [name for name, powerup_type in POWERUP_REGISTRY.items() if overrides.get(name, powerup_type.weight) > 0]
+        weights = [overrides.get(name, POWERUP_REGISTRY[name].weight) for name in names]
+        table = _table_cache[profile_name] = AliasTable(names, weights)
+    return table
+
+def profile_for_mode(game_mode, stress_factor=1):
+    return POWERUP_PROFILE_BY_MODE.get("chaos" if stress_factor > 1 else game_mode, "default")
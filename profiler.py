@@ -0,0 +1,184 @@
+# profiler.py — Per-Phase Frame Profiler (in-game overlay + per-frame CSV)
+
+import csv
+import time
+from collections import deque
+
+import pygame
+
+from config import *
+from utils import get_font
+
+# Known phases in loop order; CSV columns follow this order, unknown phases still show in the overlay
+PHASES = ("events", "paddle_effects", "ball_loop", "spawning", "group_updates", "sim_other",
+          "background", "sprites", "trails", "ui_text", "overlay", "flip")
+COUNT_FIELDS = ("sim_steps", "balls", "particles", "powerups", "distractors")
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+class FrameProfiler:
+    """Accumulates wall time per loop phase for each frame.
+
+    Call mark(phase) at the end of each phase: the time since the previous mark
+    is added to that phase (repeated phases, like simulation steps, add up).
+    While disabled, mark/begin_frame/end_frame are bound to a no-op, so the
+    hooks can stay in release builds.
+    """
+    def __init__(self, enabled=PROFILER_ENABLED, window=PROFILER_WINDOW_FRAMES, csv_path=PROFILER_CSV_PATH):
+        self.window = window
+        self.csv_path = csv_path
+        self.history = {} # phase -> deque of per-frame milliseconds
+        self.work_history = deque(maxlen=window)
+        self.frame_interval_history = deque(maxlen=window)
+        self.counts = {}
+        self.frame_index = 0
+        self.extra_lines = [] # Extra overlay text from other systems, set by the caller
+        self._current = {}
+        self._last = self._frame_start = self._prev_frame_start = 0.0
+        self._csv_file = None; self._csv_writer = None
+        self._overlay_surface = None; self._overlay_age = 0
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.mark = self._mark; self.begin_frame = self._begin_frame; self.end_frame = self._end_frame
+            self._last = self._frame_start = time.perf_counter() # Toggled mid-frame: time from here
+            self._current = {}
+        else:
+            self.mark = self.begin_frame = self.end_frame = _noop
+            self._prev_frame_start = 0.0
+        self._overlay_surface = None
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    # --- Hooks ---
+    def _begin_frame(self):
+        now = time.perf_counter()
+        self._prev_frame_start, self._frame_start = self._frame_start, now
+        self._last = now
+        self._current = {}
+
+    def _mark(self, phase):
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def _end_frame(self, counts=None):
+        self.frame_index += 1
+        self.counts = counts or {}
+        for phase, seconds in self._current.items():
+            history = self.history.get(phase)
+            if history is None: history = self.history[phase] = deque(maxlen=self.window)
+            history.append(seconds * 1000.0)
+        for phase, history in self.history.items():
+            if phase not in self._current: history.append(0.0) # Phase skipped this frame (e.g. no sim step)
+        work_ms = (self._last - self._frame_start) * 1000.0
+        interval_ms = (self._frame_start - self._prev_frame_start) * 1000.0 if self._prev_frame_start else 0.0
+        self.work_history.append(work_ms)
+        if interval_ms: self.frame_interval_history.append(interval_ms)
+        if self.csv_path: self._write_csv_row(work_ms, interval_ms)
+
+    # --- Statistics ---
+    @staticmethod
+    def _mean_p99(values):
+        if not values: return 0.0, 0.0
+        ordered = sorted(values)
+        return sum(ordered) / len(ordered), ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def summary(self):
+        """{phase: (mean_ms, p99_ms)} over the rolling window, in loop order."""
+        ordered = [p for p in PHASES if p in self.history] + [p for p in self.history if p not in PHASES]
+        return {phase: self._mean_p99(self.history[phase]) for phase in ordered}
+
+    # --- CSV Export ---
+    def _write_csv_row(self, work_ms, interval_ms):
+        if self._csv_writer is None:
+            try:
+                self._csv_file = open(self.csv_path, "w", newline="")
+            except OSError as e:
+                print(f"Warning: Could not open profiler CSV '{self.csv_path}': {e}")
+                self.csv_path = None
+                return
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(("frame", "frame_interval_ms", "work_ms") + PHASES + COUNT_FIELDS)
+        row = [self.frame_index, f"{interval_ms:.3f}", f"{work_ms:.3f}"]
+        row += [f"{self._current.get(phase, 0.0) * 1000.0:.3f}" for phase in PHASES]
+        row += [self.counts.get(field, "") for field in COUNT_FIELDS]
+        self._csv_writer.writerow(row)
+
+    def close(self):
+        if self._csv_file:
+            self._csv_file.close()
+            self._csv_file = None; self._csv_writer = None
+
+    # --- Overlay ---
+    def _render_overlay(self):
+        font = get_font("Consolas", PROFILER_OVERLAY_FONT_SIZE)
+        mean_work, p99_work = self._mean_p99(self.work_history)
+        mean_interval, _ = self._mean_p99(self.frame_interval_history)
+        fps = 1000.0 / mean_interval if mean_interval else 0.0
+        lines = [f"{'phase':<15}{'mean':>7}{'p99':>7}  ms",
+                 f"{'work':<15}{mean_work:7.2f}{p99_work:7.2f}  ({fps:.0f} fps)"]
+        lines += [f"{phase:<15}{mean:7.2f}{p99:7.2f}" for phase, (mean, p99) in self.summary().items()]
+        lines.append("  ".join(f"{name}={value}" for name, value in self.counts.items()))
+        lines += self.extra_lines
+        rendered = [font.render(line, True, WHITE) for line in lines]
+        line_height = font.get_linesize()
+        width = max(surface.get_width() for surface in rendered) + 12
+        panel = pygame.Surface((width, line_height * len(rendered) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, surface in enumerate(rendered): panel.blit(surface, (6, 5 + i * line_height))
+        return panel
+
+    def draw_overlay(self, surface, pos=(8, 8)):
+        if not self.enabled: return
+        self._overlay_age -= 1
+        if self._overlay_surface is None or self._overlay_age <= 0: # Re-render a few times a second, not every frame
+            self._overlay_surface = self._render_overlay()
+            self._overlay_age = PROFILER_OVERLAY_REFRESH_FRAMES
+        surface.blit(self._overlay_surface, pos)
+
+
+NULL_PROFILER = FrameProfiler(enabled=False, csv_path=None) # Shared default for headless engines
+
+
+class StartupTrace:
+    """Wall-clock timings of launch stages (game.py --trace-startup).
+
+    mark(stage) closes a stage at the current time; origin is a perf_counter
+    reading taken as early as possible (before the heavy imports). Stages
+    are printed and written as CSV by finish(), once; a disabled trace
+    ignores everything.
+    """
+    def __init__(self, path=None, origin=None):
+        self.enabled = path is not None
+        self.path = path
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.stages = [] # (stage, ms, ms since origin)
+        self._last = self.origin
+        self.finished = False
+
+    def mark(self, stage, at=None):
+        """Ends stage now, or at an earlier perf_counter reading (e.g. one taken at import time)."""
+        if not self.enabled or self.finished: return
+        now = time.perf_counter() if at is None else at
+        self.stages.append((stage, (now - self._last) * 1000.0, (now - self.origin) * 1000.0))
+        self._last = now
+
+    def finish(self):
+        if not self.enabled or self.finished: return
+        self.finished = True
+        print("Startup trace (ms):")
+        for stage, ms, total_ms in self.stages: print(f"  {stage:<24}{ms:8.1f}{total_ms:9.1f}")
+        try:
+            with open(self.path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("stage", "ms", "since_start_ms"))
+                writer.writerows((stage, f"{ms:.3f}", f"{total_ms:.3f}") for stage, ms, total_ms in self.stages)
+        except OSError as e:
+            print(f"Warning: Could not write startup trace '{self.path}': {e}")
@@ -0,0 +1,73 @@
+# quality.py — Adaptive Quality Governor (trades visual detail for frame time, restores it with headroom)
+
+from collections import deque
+
+from config import *
+from utils import set_background_band_height
+
+
+class QualityGovernor:
+    """Steps through QUALITY_LEVELS to hold the frame budget.
+
+    Feed update() each frame's work time. When the rolling mean is over budget
+    it drops one level and judges the new level on a fresh window; when the
+    mean stays under QUALITY_UPGRADE_AT of the budget for the upgrade period
+    it restores one level. A restore undone within QUALITY_UPGRADE_FRAMES
+    doubles the period (back to normal once one holds), so a level that
+    doesn't fit isn't retried every few seconds.
+    Levels only change how things look (particle bursts have their own RNG,
+    trails are trimmed when drawn), never how a match plays out.
+    """
+    def __init__(self, particles, trail_renderer, levels=QUALITY_LEVELS, budget_ms=QUALITY_FRAME_BUDGET_MS,
+                 window=QUALITY_WINDOW_FRAMES, enabled=QUALITY_GOVERNOR_ENABLED):
+        self.particles = particles
+        self.trail_renderer = trail_renderer
+        self.levels = levels
+        self.budget_ms = budget_ms
+        self.enabled = enabled
+        self.frame_times = deque(maxlen=window)
+        self.upgrade_frames = QUALITY_UPGRADE_FRAMES
+        self.level = 0; self.wobble = 1.0
+        self.downgrades = self.upgrades = 0
+        self._headroom_frames = 0
+        self._frames_since_upgrade = None # None until the first restore
+        self.apply(0)
+
+    def apply(self, level):
+        """Sets every knob to the given level's values."""
+        self.level = level
+        particle_fraction, trail_length, band_height, self.wobble = self.levels[level]
+        self.particles.detail = particle_fraction
+        self.trail_renderer.trail_length = trail_length
+        set_background_band_height(band_height)
+        self.frame_times.clear() # The new level is judged on its own frames
+        self._headroom_frames = 0
+
+    def update(self, frame_ms):
+        if not self.enabled: return
+        if self._frames_since_upgrade is not None:
+            self._frames_since_upgrade += 1
+            if self._frames_since_upgrade == QUALITY_UPGRADE_FRAMES: self.upgrade_frames = QUALITY_UPGRADE_FRAMES # The restore held
+        times = self.frame_times
+        times.append(frame_ms)
+        if len(times) < times.maxlen: return
+        mean_ms = sum(times) / len(times)
+        if mean_ms > self.budget_ms * QUALITY_DOWNGRADE_AT:
+            if self.level == len(self.levels) - 1: return
+            if self._frames_since_upgrade is not None and self._frames_since_upgrade < QUALITY_UPGRADE_FRAMES:
+                self.upgrade_frames = min(self.upgrade_frames * 2, QUALITY_UPGRADE_FRAMES_MAX) # The restored level didn't fit
+            self.apply(self.level + 1); self.downgrades += 1
+            self._frames_since_upgrade = None
+        elif mean_ms < self.budget_ms * QUALITY_UPGRADE_AT and self.level > 0:
+            self._headroom_frames += 1
+            if self._headroom_frames >= self.upgrade_frames:
+                self.apply(self.level - 1); self.upgrades += 1
+                self._frames_since_upgrade = 0
+        else:
+            self._headroom_frames = 0
+
+    def status_line(self):
+        mean_ms = sum(self.frame_times) / len(self.frame_times) if self.frame_times else 0.0
+        state = "" if self.enabled else " (off)"
+        return (f"quality {self.level}/{len(self.levels) - 1}{state}  frame {mean_ms:.1f}/{self.budget_ms:.1f} ms  "
+                f"down {self.downgrades} up {self.upgrades}")
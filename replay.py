@@ -0,0 +1,265 @@
+# replay.py — Deterministic Match Replays (recorder, compact binary format, headless/rendered playback)
+#
+# Record: python game.py --record [DIR]   Watch: python game.py --replay FILE   Headless: python replay.py FILE
+# A match is fully determined by its seed, settings and per-tick inputs (see MatchEngine), so that is all a file holds:
+#   magic "UPRP" | uint16 version | uint16 reserved | uint32 seed | 8-byte config hash | uint8 game mode | uint8 difficulty
+#   | uint8 left AI difficulty (255 = human) | uint8 reserved | uint16 stress factor | uint32 ticks | uint32 keyframe interval
+#   | uint32 input log length | uint32 stress changes | uint32 keyframes
+#   | input log: runs of (LEB128 run length, input byte) | stress changes: (uint32 tick, uint16 factor)
+#   | keyframes: (uint32 tick, uint8 score a, uint8 score b, 8-byte state digest)
+# Input byte: bits 0-1 left_dir + 1, bits 2-3 right_dir + 1, bit 4 left_launch, bit 5 right_launch.
+
+import os
+# Must be set before pygame is imported (headless playback only; the game sets up its own display)
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import hashlib
+import struct
+import sys
+import time
+
+import config
+from config import *
+from engine import MatchEngine, make_inputs
+from powerups import POWERUP_REGISTRY, weight_profiles
+
+REPLAY_MAGIC = b"UPRP"; REPLAY_VERSION = 1
+_HEADER = struct.Struct("<4sHHI8sBBBBHIIIII")
+_STRESS_CHANGE = struct.Struct("<IH")
+_KEYFRAME = struct.Struct("<IBB8s")
+_HUMAN = 255 # left AI difficulty byte for a human-controlled left paddle
+
+# Every possible input byte, decoded once; step() only reads the dicts
+_INPUTS = [make_inputs((byte & 3) - 1, ((byte >> 2) & 3) - 1, bool(byte & 16), bool(byte & 32)) for byte in range(64)]
+
+
+def encode_inputs(inputs):
+    return ((inputs["left_dir"] + 1) | (inputs["right_dir"] + 1) << 2
+            | (16 if inputs["left_launch"] else 0) | (32 if inputs["right_launch"] else 0))
+
+
+def config_hash():
+    """Digest of everything that decides how a match plays out: gameplay constants and power-up weights."""
+    settings = sorted((name, value) for name, value in vars(config).items()
+                      if name.isupper() and not name.startswith(REPLAY_CONFIG_HASH_SKIP))
+    powerups = sorted((name, powerup_type.weight) for name, powerup_type in POWERUP_REGISTRY.items())
+    profiles = sorted((name, sorted(weights.items())) for name, weights in weight_profiles.items())
+    return hashlib.blake2b(repr((settings, powerups, profiles)).encode("utf-8"), digest_size=8).digest()
+
+
+def state_digest(engine):
+    return hashlib.blake2b(repr(engine.state()).encode("utf-8"), digest_size=8).digest()
+
+
+# --- Format ---
+class Replay:
+    """One recorded match. inputs holds one encoded input byte per tick; runs only exist on disk."""
+    def __init__(self, seed, game_mode, difficulty, left_ai_difficulty, stress_factor, config_digest=None,
+                 keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.seed = seed
+        self.game_mode = game_mode
+        self.difficulty = difficulty
+        self.left_ai_difficulty = left_ai_difficulty
+        self.stress_factor = stress_factor
+        self.config_digest = config_digest or config_hash()
+        self.keyframe_interval = keyframe_interval
+        self.inputs = bytearray() # Input byte for the step that produces tick i + 1
+        self.stress_changes = [] # (tick, factor): set before the step that produces tick + 1
+        self.keyframes = [] # (tick, score a, score b, state digest) after that tick's step
+
+    @property
+    def ticks(self):
+        return len(self.inputs)
+
+    def matches_config(self):
+        return self.config_digest == config_hash()
+
+    def save(self, path):
+        log = bytearray()
+        inputs = self.inputs; i = 0
+        while i < len(inputs):
+            byte = inputs[i]; run = 1
+            while i + run < len(inputs) and inputs[i + run] == byte: run += 1
+            i += run
+            while run >= 0x80: log.append(run & 0x7F | 0x80); run >>= 7
+            log.append(run); log.append(byte)
+        left_ai = _HUMAN if self.left_ai_difficulty is None else self.left_ai_difficulty
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, 0, self.seed, self.config_digest, self.game_mode, self.difficulty,
+                                 left_ai, 0, self.stress_factor, self.ticks, self.keyframe_interval,
+                                 len(log), len(self.stress_changes), len(self.keyframes)))
+            f.write(log)
+            for change in self.stress_changes: f.write(_STRESS_CHANGE.pack(*change))
+            for keyframe in self.keyframes: f.write(_KEYFRAME.pack(*keyframe))
+            return f.tell()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f: data = f.read()
+        try:
+            (magic, version, _, seed, digest, game_mode, difficulty, left_ai, _, stress_factor, ticks, keyframe_interval,
+             log_length, num_changes, num_keyframes) = _HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise ValueError("truncated replay header")
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"not a version {REPLAY_VERSION} replay")
+        replay = cls(seed, game_mode, difficulty, None if left_ai == _HUMAN else left_ai, stress_factor, digest, keyframe_interval)
+        offset = _HEADER.size; end = offset + log_length
+        inputs = replay.inputs
+        try:
+            while offset < end:
+                run = shift = 0
+                while True:
+                    part = data[offset]; offset += 1
+                    run |= (part & 0x7F) << shift; shift += 7
+                    if part < 0x80: break
+                inputs.extend(bytes((data[offset],)) * run); offset += 1
+            replay.stress_changes = [_STRESS_CHANGE.unpack_from(data, offset + i * _STRESS_CHANGE.size) for i in range(num_changes)]
+            offset += num_changes * _STRESS_CHANGE.size
+            replay.keyframes = [_KEYFRAME.unpack_from(data, offset + i * _KEYFRAME.size) for i in range(num_keyframes)]
+        except (IndexError, struct.error):
+            raise ValueError("truncated replay data")
+        if len(inputs) != ticks or any(byte >= len(_INPUTS) for byte in inputs):
+            raise ValueError("corrupt input log")
+        return replay
+
+
+# --- Recording ---
+class ReplayRecorder:
+    """Builds a Replay from a live match.
+
+    start() right after engine.reset_match(), record(inputs) right after each
+    engine.step(inputs), note_stress_factor() after a mid-match
+    set_stress_factor(); finish() returns the Replay (None if nothing was
+    played) and stops recording until the next start().
+    """
+    def __init__(self, engine, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+        self.engine = engine
+        self.keyframe_interval = keyframe_interval
+        self.replay = None
+
+    @property
+    def active(self):
+        return self.replay is not None
+
+    def start(self):
+        engine = self.engine
+        self.replay = Replay(engine.seed, engine.game_mode, engine.difficulty, engine.left_ai_difficulty, engine.stress_factor,
+                             keyframe_interval=self.keyframe_interval)
+
+    def record(self, inputs):
+        replay = self.replay
+        if replay is None: return
+        replay.inputs.append(encode_inputs(inputs))
+        engine = self.engine
+        if engine.time_tick % self.keyframe_interval == 0:
+            replay.keyframes.append((engine.time_tick, engine.score_a, engine.score_b, state_digest(engine)))
+
+    def note_stress_factor(self):
+        if self.replay is not None: self.replay.stress_changes.append((self.engine.time_tick, self.engine.stress_factor))
+
+    def finish(self):
+        replay = self.replay; self.replay = None
+        return replay if replay is not None and replay.ticks else None
+
+
+# --- Playback ---
+class ReplayPlayer:
+    """Plays a Replay back through an engine, one step() per recorded tick.
+
+    Keyframes are checked as they are passed: the first whose state digest
+    differs is kept in diverged_at (the recording came from other code or
+    settings). seek() fast-forwards headless; seeking backwards replays from
+    the start, which at headless speed takes a moment even for long matches.
+    """
+    def __init__(self, replay, engine):
+        self.replay = replay
+        self.engine = engine
+        if not replay.matches_config():
+            print("Warning: Replay was recorded with different game settings; playback may diverge")
+        self.restart()
+
+    def restart(self):
+        replay = self.replay; engine = self.engine
+        engine.game_mode = replay.game_mode; engine.difficulty = replay.difficulty
+        engine.left_ai_difficulty = replay.left_ai_difficulty
+        engine.set_stress_factor(replay.stress_factor)
+        engine.reset_match(replay.seed)
+        self.diverged_at = None
+        self.verified = 0
+        self._keyframes = {keyframe[0]: keyframe for keyframe in replay.keyframes}
+        self._stress_changes = {tick: factor for tick, factor in replay.stress_changes}
+
+    @property
+    def finished(self):
+        return self.engine.time_tick >= self.replay.ticks
+
+    def step(self):
+        """Plays the next recorded tick and returns its events ([] once finished)."""
+        engine = self.engine
+        tick = engine.time_tick
+        if tick >= self.replay.ticks: return []
+        factor = self._stress_changes.get(tick)
+        if factor is not None: engine.set_stress_factor(factor)
+        events = engine.step(_INPUTS[self.replay.inputs[tick]])
+        keyframe = self._keyframes.get(engine.time_tick)
+        if keyframe is not None:
+            if state_digest(engine) == keyframe[3]: self.verified += 1
+            elif self.diverged_at is None:
+                self.diverged_at = engine.time_tick
+                print(f"Warning: Replay diverged from the recording by tick {engine.time_tick}")
+        return events
+
+    def seek(self, tick):
+        tick = max(0, min(tick, self.replay.ticks))
+        if tick < self.engine.time_tick: self.restart()
+        while self.engine.time_tick < tick: self.step()
+
+
+def _format_ticks(ticks):
+    seconds = ticks / SIM_TICK_RATE
+    return f"{int(seconds // 60)}:{seconds % 60:04.1f}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a recorded match headless as fast as possible and verify it.")
+    parser.add_argument("replay", help="replay file (game.py --record writes them)")
+    parser.add_argument("--info", action="store_true", help="print the header and keyframe timeline without playing")
+    parser.add_argument("--until", type=float, default=None, metavar="SECONDS", help="stop there and print the match state")
+    args = parser.parse_args(argv)
+
+    try:
+        replay = Replay.load(args.replay)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not load replay '{args.replay}': {e}")
+        return 1
+    left = "human" if replay.left_ai_difficulty is None else f"AI {replay.left_ai_difficulty}"
+    print(f"{args.replay}: seed {replay.seed}  mode {replay.game_mode}  difficulty {replay.difficulty}  left {left}  "
+          f"stress x{replay.stress_factor}  {replay.ticks} ticks ({_format_ticks(replay.ticks)})  "
+          f"config {'matches' if replay.matches_config() else 'DIFFERS'}")
+    if args.info:
+        for tick, factor in replay.stress_changes: print(f"  {_format_ticks(tick):>8}  stress x{factor}")
+        for tick, score_a, score_b, _ in replay.keyframes: print(f"  {_format_ticks(tick):>8}  {score_a}-{score_b}")
+        return 0
+
+    engine = MatchEngine()
+    player = ReplayPlayer(replay, engine)
+    target = replay.ticks if args.until is None else int(args.until * SIM_TICK_RATE)
+    started = time.perf_counter()
+    player.seek(target)
+    elapsed = time.perf_counter() - started
+    speed = engine.time_tick / SIM_TICK_RATE / elapsed if elapsed else float("inf")
+    print(f"Played {engine.time_tick} ticks in {elapsed:.2f} s ({speed:.0f}x real time): score {engine.score_a}-{engine.score_b}"
+          f"{'  ' + engine.winner_text if engine.winner_text else ''}")
+    print(f"Keyframes: {player.verified} verified" + (f", diverged at tick {player.diverged_at}" if player.diverged_at else ""))
+    if args.until is not None:
+        for key, value in engine.state().items(): print(f"  {key}: {value}")
+    return 1 if player.diverged_at else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# spatial_grid.py — Uniform-grid broadphase for ball-vs-entity collisions
+
+from config import *
+
+
+class SpatialGrid:
+    """Buckets sprites by the grid cells their rects overlap.
+
+    The engine rebuilds it once per tick from the paddle, power-up and
+    distractor groups and then asks for each ball's overlaps instead of
+    running spritecollide against every group. Each cell keeps its sprites
+    and their rects in insertion order, so a query is one Rect.collidelistall
+    call per cell and the result comes back in group iteration order: the
+    narrow phase sees exactly the sprites, in exactly the order, spritecollide
+    would have produced.
+
+    Scenes with fewer than min_pairs potential ball/entity pairs skip the
+    bucketing; a single collidelistall over every rect is faster there.
+    """
+    def __init__(self, cell_size=SPATIAL_GRID_CELL_SIZE, min_pairs=SPATIAL_GRID_MIN_PAIRS):
+        self.cell_size = cell_size
+        self.min_pairs = min_pairs
+        self.bucketed = False
+        self.sprites = []; self.rects = [] # Everything, in insertion order
+        self.cells = {} # (cell_x, cell_y) -> (sprites, rects)
+        self.order = {} # sprite -> insertion index
+        self.group_index = {} # sprite -> position of its group in the last rebuild()
+
+    def _cell_keys(self, rect):
+        size = self.cell_size
+        x0 = rect.left // size; x1 = (rect.right - 1) // size
+        y0 = rect.top // size; y1 = (rect.bottom - 1) // size
+        if x0 == x1 and y0 == y1: return ((x0, y0),)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def rebuild(self, groups, num_queries):
+        """Re-inserts every sprite of groups, in order; buckets only if num_queries queries make it pay off."""
+        sprites = self.sprites = []; rects = self.rects = []
+        order = self.order = {}; group_index = self.group_index = {}
+        for i, group in enumerate(groups):
+            for sprite in group:
+                order[sprite] = len(sprites); group_index[sprite] = i
+                sprites.append(sprite); rects.append(sprite.rect)
+        cells = self.cells = {}
+        self.bucketed = num_queries * len(sprites) >= self.min_pairs
+        if not self.bucketed: return
+        for sprite, rect in zip(sprites, rects):
+            for key in self._cell_keys(rect):
+                cell = cells.get(key)
+                if cell is None: cells[key] = ([sprite], [rect])
+                else: cell[0].append(sprite); cell[1].append(rect)
+
+    def query(self, rect):
+        """Sprites whose rects overlap rect (as of the last rebuild), in insertion order."""
+        if not self.bucketed:
+            sprites = self.sprites
+            return [sprites[i] for i in rect.collidelistall(self.rects)]
+        cells = self.cells
+        keys = self._cell_keys(rect)
+        if len(keys) == 1:
+            cell = cells.get(keys[0])
+            if cell is None: return []
+            cell_sprites = cell[0]
+            return [cell_sprites[i] for i in rect.collidelistall(cell[1])]
+        found = set()
+        for key in keys:
+            cell = cells.get(key)
+            if cell:
+                cell_sprites = cell[0]
+                found.update(cell_sprites[i] for i in rect.collidelistall(cell[1]))
+        if len(found) < 2: return list(found)
+        return sorted(found, key=self.order.__getitem__)
+
+    def candidate_pairs(self, sprites):
+        """{sprite: (rect snapshot, overlapping sprites)} for a batch of sprites at their current rects."""
+        return {sprite: (sprite.rect.copy(), self.query(sprite.rect)) for sprite in sprites}
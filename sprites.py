@@ -3,8 +3,11 @@
 import pygame
 import random
 import math
+import heapq
+from collections import OrderedDict, deque
 from config import *
-from utils import create_impact_particles, get_random_crazy_color
+from utils import create_impact_particles, get_random_crazy_color, text_cache
+from powerups import POWERUP_REGISTRY, PickupContext, get_selection_table
 
 # Note: play_sound function is defined in game.py and passed to sprites that need it.
 # sounds dictionary and laser_channel are also managed in game.py.
@@ -22,112 +25,132 @@ class Effect:
     def __repr__(self):
         return f"Effect(name='{self.name}', duration={self.duration_frames}, intensity={self.intensity}, start_tick={self.start_tick})"
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, x, y, color_func, size_range=(2,6), speed_range=(1,PARTICLE_SPEED_IMPACT), lifespan_mod=0):
-        super().__init__()
-        size = random.randint(*size_range)
-        self.image = pygame.Surface([size, size], pygame.SRCALPHA)
-        self.color_val = color_func() if callable(color_func) else color_func
-        try:
-            initial_color_fill = self.color_val if len(self.color_val) == 4 else self.color_val + (255,)
-            self.image.fill(initial_color_fill)
-        except (TypeError, ValueError): # Fallback if color_val is not as expected
-             self.image.fill((255,255,255,255)) # Default to white
-
-        self.rect = self.image.get_rect(center=(x, y))
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(*speed_range)
-        self.velocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-        self.lifespan = PARTICLE_LIFESPAN_IMPACT + random.randint(-5,5) + lifespan_mod
-        self.initial_lifespan = max(self.lifespan, 1)
-
-    def update(self):
-        self.rect.x += self.velocity[0]
-        self.rect.y += self.velocity[1]
-        self.lifespan -= 1
-        alpha = max(0, int(255 * (self.lifespan / self.initial_lifespan)))
-        draw_size = self.image.get_width()
-        self.image = pygame.Surface([draw_size, draw_size], pygame.SRCALPHA) # Recreate surface for alpha
-
-        base_color = self.color_val[:3] if isinstance(self.color_val, (list, tuple)) and len(self.color_val) >= 3 else (255, 255, 255) # Default to white
-        current_color_tuple = base_color + (alpha,)
-        try:
-            self.image.fill(current_color_tuple)
-        except (TypeError, ValueError):
-             self.image.fill((255,255,255,alpha)) # Fallback fill
-
-        if self.lifespan <= 0:
-            self.kill()
+class RotationFrames:
+    """Rotated copies of one template image, one per DISTRACTOR_ROTATION_STEP degrees, built lazily on first use."""
+    def __init__(self, template, step=DISTRACTOR_ROTATION_STEP):
+        self.template = template
+        self.step = step
+        self.frames = [None] * max(1, int(round(360 / step)))
+
+    def frame(self, angle):
+        index = int(round(angle / self.step)) % len(self.frames)
+        surface = self.frames[index]
+        if surface is None:
+            surface = self.frames[index] = pygame.transform.rotate(self.template, index * self.step)
+        return surface
+
+# Template pools: spawns pick a random slot and reuse its shape (and rotation frames) once built. Slot i is always
+# built from seed i, so what spawns never depends on which templates earlier matches in this process happened to build
+_distractor_template_pool = {} # slot -> RotationFrames
+_duck_template_pool = {}
+
+def _make_distractor_template(rng):
+    size = rng.randint(25, 70) # Slightly larger max size possible
+    image = pygame.Surface([size, size], pygame.SRCALPHA)
+    hue = rng.randint(0,360)
+    color = pygame.Color(0,0,0,0)
+    hsva_alpha = int((rng.randint(160, 220) / 255.0) * 100) # HSVA alpha is 0-100, slightly less transparent
+    color.hsva = (hue % 360, 100, 100, hsva_alpha) # Corrected HSVA
+
+    # *** MORE SHAPE VARIETY ***
+    shape_type = rng.choice(["rect", "circle", "poly", "ellipse"]) # Added ellipse
+
+    if shape_type == "rect":
+        pygame.draw.rect(image, color, (0,0,size,size), border_radius=size//rng.randint(3,6)) # Random border radius
+    elif shape_type == "circle":
+        pygame.draw.circle(image, color, (size//2, size//2), size//rng.randint(2,3)) # Slightly variable radius
+    elif shape_type == "ellipse":
+        # Random width/height for ellipse, ensuring it fits within the surface
+        ellipse_width = rng.randint(size // 2, size)
+        ellipse_height = rng.randint(size // 2, size)
+        ellipse_rect = pygame.Rect( (size - ellipse_width) // 2, (size - ellipse_height) // 2, ellipse_width, ellipse_height)
+        pygame.draw.ellipse(image, color, ellipse_rect)
+    else: # Polygon
+        num_points = rng.randint(4, 8) # Increased max points
+        points = []
+        center_x, center_y = size // 2, size // 2
+        min_radius = size * 0.2
+        max_radius = size * 0.5
+        angle_step = (2 * math.pi) / num_points
+        # Generate points around a center with varying radius for spikiness
+        for i in range(num_points):
+            radius = rng.uniform(min_radius, max_radius)
+            angle = i * angle_step + rng.uniform(-angle_step * 0.3, angle_step * 0.3) # Add jitter
+            px = center_x + radius * math.cos(angle)
+            py = center_y + radius * math.sin(angle)
+            points.append((int(px), int(py)))
+        # Ensure points are within bounds (simple clamp)
+        points = [(max(0, min(size-1, p[0])), max(0, min(size-1, p[1]))) for p in points]
+        if len(points) >= 3: # Need at least 3 points for polygon
+            pygame.draw.polygon(image, color, points)
+        else: # Fallback to circle if polygon generation failed
+             pygame.draw.circle(image, color, (size//2, size//2), size//3)
+    return RotationFrames(image)
+
+def _make_duck_template(rng):
+    size = rng.randint(45, 70) # Duck size range
+    image = pygame.Surface([size, size], pygame.SRCALPHA)
+    image.fill((0,0,0,0)) # Ensure clear background
+
+    body_color = COLOR_DUCK; beak_color = ORANGE; eye_color = BLACK
+    # Body Ellipse
+    body_rect = pygame.Rect(size*0.1, size*0.35, size*0.8, size*0.55)
+    pygame.draw.ellipse(image, body_color, body_rect)
+    # Head Circle
+    head_center = (int(size*0.75), int(size*0.3))
+    pygame.draw.circle(image, body_color, head_center, int(size*0.22))
+    # Beak Polygon
+    beak_tip_x = head_center[0] + int(size*0.25)
+    beak_points = [(head_center[0] + int(size*0.15), head_center[1] - int(size*0.08)),
+                   (beak_tip_x, head_center[1]),
+                   (head_center[0] + int(size*0.15), head_center[1] + int(size*0.08))]
+    pygame.draw.polygon(image, beak_color, beak_points)
+    # Eye Circle
+    pygame.draw.circle(image, eye_color, (head_center[0] + int(size*0.05), head_center[1] - int(size*0.05)), int(size*0.05))
+    return RotationFrames(image)
+
+def _pooled_template(pool, pool_size, make_template, rng):
+    slot = rng.randrange(pool_size)
+    template = pool.get(slot)
+    if template is None: template = pool[slot] = make_template(random.Random(slot))
+    return template
 
 class DistractorSprite(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, rng=random): # rng: the match's random stream (engine.rng)
         super().__init__()
-        size = random.randint(25, 70) # Slightly larger max size possible
-        self.image = pygame.Surface([size, size], pygame.SRCALPHA)
-        hue = random.randint(0,360)
-        color = pygame.Color(0,0,0,0)
-        hsva_alpha = int((random.randint(160, 220) / 255.0) * 100) # HSVA alpha is 0-100, slightly less transparent
-        color.hsva = (hue % 360, 100, 100, hsva_alpha) # Corrected HSVA
-
-        # *** MORE SHAPE VARIETY ***
-        shape_type = random.choice(["rect", "circle", "poly", "ellipse"]) # Added ellipse
-
-        if shape_type == "rect":
-            pygame.draw.rect(self.image, color, (0,0,size,size), border_radius=size//random.randint(3,6)) # Random border radius
-        elif shape_type == "circle":
-            pygame.draw.circle(self.image, color, (size//2, size//2), size//random.randint(2,3)) # Slightly variable radius
-        elif shape_type == "ellipse":
-            # Random width/height for ellipse, ensuring it fits within the surface
-            ellipse_width = random.randint(size // 2, size)
-            ellipse_height = random.randint(size // 2, size)
-            ellipse_rect = pygame.Rect( (size - ellipse_width) // 2, (size - ellipse_height) // 2, ellipse_width, ellipse_height)
-            pygame.draw.ellipse(self.image, color, ellipse_rect)
-        else: # Polygon
-            num_points = random.randint(4, 8) # Increased max points
-            points = []
-            center_x, center_y = size // 2, size // 2
-            min_radius = size * 0.2
-            max_radius = size * 0.5
-            angle_step = (2 * math.pi) / num_points
-            # Generate points around a center with varying radius for spikiness
-            for i in range(num_points):
-                radius = random.uniform(min_radius, max_radius)
-                angle = i * angle_step + random.uniform(-angle_step * 0.3, angle_step * 0.3) # Add jitter
-                px = center_x + radius * math.cos(angle)
-                py = center_y + radius * math.sin(angle)
-                points.append((int(px), int(py)))
-            # Ensure points are within bounds (simple clamp)
-            points = [(max(0, min(size-1, p[0])), max(0, min(size-1, p[1]))) for p in points]
-            if len(points) >= 3: # Need at least 3 points for polygon
-                pygame.draw.polygon(self.image, color, points)
-            else: # Fallback to circle if polygon generation failed
-                 pygame.draw.circle(self.image, color, (size//2, size//2), size//3)
-
-
+        self.rng = rng
+        self.frames = self._pick_frames()
+        self.original_image = self.frames.template
+        self.image = self.original_image
         self.rect = self.image.get_rect()
         # Spawning logic remains the same
-        edge = random.choice(["top", "bottom", "left", "right"])
-        if edge == "top": self.rect.bottom = 0; self.rect.centerx = random.randint(0,SCREEN_WIDTH)
-        elif edge == "bottom": self.rect.top = SCREEN_HEIGHT; self.rect.centerx = random.randint(0,SCREEN_WIDTH)
-        elif edge == "left": self.rect.right = 0; self.rect.centery = random.randint(0,SCREEN_HEIGHT)
-        else: self.rect.left = SCREEN_WIDTH; self.rect.centery = random.randint(0,SCREEN_HEIGHT)
+        edge = rng.choice(["top", "bottom", "left", "right"])
+        if edge == "top": self.rect.bottom = 0; self.rect.centerx = rng.randint(0,SCREEN_WIDTH)
+        elif edge == "bottom": self.rect.top = SCREEN_HEIGHT; self.rect.centerx = rng.randint(0,SCREEN_WIDTH)
+        elif edge == "left": self.rect.right = 0; self.rect.centery = rng.randint(0,SCREEN_HEIGHT)
+        else: self.rect.left = SCREEN_WIDTH; self.rect.centery = rng.randint(0,SCREEN_HEIGHT)
 
         angle_to_centerish = math.atan2(SCREEN_HEIGHT/2 - self.rect.centery, SCREEN_WIDTH/2 - self.rect.centerx)
-        actual_angle = angle_to_centerish + random.uniform(-math.pi/3, math.pi/3)
-        speed = random.uniform(*DISTRACTOR_SPEED_RANGE)
+        actual_angle = angle_to_centerish + rng.uniform(-math.pi/3, math.pi/3)
+        speed = rng.uniform(*DISTRACTOR_SPEED_RANGE)
         self.velocity = [math.cos(actual_angle) * speed, math.sin(actual_angle) * speed]
-        self.rotation_speed = random.uniform(-6, 6) # Slightly faster rotation possible
+        self.rotation_speed = rng.uniform(-6, 6) # Slightly faster rotation possible
         self.angle = 0
-        self.original_image = self.image.copy()
+
+    def _pick_frames(self):
+        return _pooled_template(_distractor_template_pool, DISTRACTOR_TEMPLATE_POOL_SIZE, _make_distractor_template, self.rng)
+
+    def _rotate(self):
+        # Recalculate center before rotating to avoid drift
+        old_center = self.rect.center
+        self.image = self.frames.frame(self.angle) # Cached frame nearest to the exact angle
+        self.rect = self.image.get_rect(center=old_center) # Apply rotation around the calculated center
 
     def update(self, time_tick=0): # time_tick added for consistency, not used here
         self.rect.x += self.velocity[0]
         self.rect.y += self.velocity[1]
         self.angle = (self.angle + self.rotation_speed) % 360
-        # Recalculate center before rotating to avoid drift
-        old_center = self.rect.center
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
-        self.rect = self.image.get_rect(center=old_center) # Apply rotation around the calculated center
+        self._rotate()
 
         # Kill if far off screen
         off_screen_buffer = 150 # Increased buffer due to potentially larger screen/sprites
@@ -137,61 +160,38 @@ class DistractorSprite(pygame.sprite.Sprite):
 
 # --- CrazyDuckSprite remains the same ---
 class CrazyDuckSprite(DistractorSprite):
-    def __init__(self, play_sound_func=None): # Added play_sound_func
-        super().__init__() # Calls the updated DistractorSprite init first
+    def __init__(self, play_sound_func=None, rng=random): # Added play_sound_func
+        super().__init__(rng) # Picks a pooled duck template through _pick_frames
         self.play_sound_func = play_sound_func
-        # --- Duck Specific Drawing (Overwrites generic shape) ---
-        self.size = random.randint(45, 70) # Duck size range
-        self.original_image = pygame.Surface([self.size, self.size], pygame.SRCALPHA)
-        self.original_image.fill((0,0,0,0)) # Ensure clear background
-
-        body_color = COLOR_DUCK; beak_color = ORANGE; eye_color = BLACK
-        # Body Ellipse
-        body_rect = pygame.Rect(self.size*0.1, self.size*0.35, self.size*0.8, self.size*0.55)
-        pygame.draw.ellipse(self.original_image, body_color, body_rect)
-        # Head Circle
-        head_center = (int(self.size*0.75), int(self.size*0.3))
-        pygame.draw.circle(self.original_image, body_color, head_center, int(self.size*0.22))
-        # Beak Polygon
-        beak_tip_x = head_center[0] + int(self.size*0.25)
-        beak_points = [(head_center[0] + int(self.size*0.15), head_center[1] - int(self.size*0.08)),
-                       (beak_tip_x, head_center[1]),
-                       (head_center[0] + int(self.size*0.15), head_center[1] + int(self.size*0.08))]
-        pygame.draw.polygon(self.original_image, beak_color, beak_points)
-        # Eye Circle
-        pygame.draw.circle(self.original_image, eye_color, (head_center[0] + int(self.size*0.05), head_center[1] - int(self.size*0.05)), int(self.size*0.05))
-
-        self.image = self.original_image.copy()
-        self.rect = self.image.get_rect() # Reset rect based on duck image
+        self.size = self.original_image.get_width()
 
         # --- Duck Specific Movement ---
-        self.velocity = [0, random.uniform(CRAZY_DUCK_VERTICAL_SPEED_RANGE[0], CRAZY_DUCK_VERTICAL_SPEED_RANGE[1])]
-        if random.choice([True, False]): self.velocity[1] *= -1
+        self.velocity = [0, rng.uniform(CRAZY_DUCK_VERTICAL_SPEED_RANGE[0], CRAZY_DUCK_VERTICAL_SPEED_RANGE[1])]
+        if rng.choice([True, False]): self.velocity[1] *= -1
 
-        self.rect.centerx = random.randint(self.size // 2, SCREEN_WIDTH - self.size // 2)
+        self.rect.centerx = rng.randint(self.size // 2, SCREEN_WIDTH - self.size // 2)
         if self.velocity[1] > 0: self.rect.bottom = 0
         else: self.rect.top = SCREEN_HEIGHT
 
-        self.rotation_speed = random.uniform(-3, 3) # Ducks rotate less wildly than generic shapes
-        self.angle = random.uniform(0, 360)
+        self.rotation_speed = rng.uniform(-3, 3) # Ducks rotate less wildly than generic shapes
+        self.angle = rng.uniform(0, 360)
 
         # --- Duck Quack Logic ---
-        self.quack_timer = random.randint(60,150)
+        self.quack_timer = rng.randint(60,150)
         self.is_quacking = False
         self.quack_display_timer = 0
         self.played_quack_sound_this_sequence = False
-        try: self.quack_font = pygame.font.SysFont("Arial", 18, True) # Slightly larger quack font
-        except pygame.error: self.quack_font = pygame.font.Font(None, 22)
         self.hit_cooldown = 0
 
+    def _pick_frames(self):
+        return _pooled_template(_duck_template_pool, DUCK_TEMPLATE_POOL_SIZE, _make_duck_template, self.rng)
+
     def update(self, current_time_tick): # Renamed from time_tick for clarity
         # Use duck's vertical movement
         self.rect.y += self.velocity[1]
         # Apply duck's rotation
         self.angle = (self.angle + self.rotation_speed) % 360
-        old_center = self.rect.center
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
-        self.rect = self.image.get_rect(center=old_center)
+        self._rotate()
 
         # Kill duck if off screen
         if self.velocity[1] > 0 and self.rect.top > SCREEN_HEIGHT + self.size: self.kill()
@@ -201,8 +201,8 @@ class CrazyDuckSprite(DistractorSprite):
         self.quack_timer -= 1
         if self.quack_timer <= 0:
             self.is_quacking = True
-            self.quack_display_timer = random.randint(25, 45)
-            self.quack_timer = random.randint(80, 220)
+            self.quack_display_timer = self.rng.randint(25, 45)
+            self.quack_timer = self.rng.randint(80, 220)
             if not self.played_quack_sound_this_sequence and self.play_sound_func:
                 self.play_sound_func("duck_quack")
                 self.played_quack_sound_this_sequence = True
@@ -220,9 +220,9 @@ class CrazyDuckSprite(DistractorSprite):
             if self.play_sound_func:
                  self.play_sound_func("duck_hit_ball")
             # Modify ball velocity and spin based on duck constants
-            ball.velocity[0] *= random.uniform(0.7, -1.2) # Random horizontal effect
-            ball.velocity[1] += random.uniform(-CRAZY_DUCK_HIT_STRENGTH_Y * 0.7, CRAZY_DUCK_HIT_STRENGTH_Y * 0.7)
-            ball.spin_y += random.uniform(-CRAZY_DUCK_HIT_SPIN * 0.8, CRAZY_DUCK_HIT_SPIN * 0.8)
+            ball.velocity[0] *= self.rng.uniform(0.7, -1.2) # Random horizontal effect
+            ball.velocity[1] += self.rng.uniform(-CRAZY_DUCK_HIT_STRENGTH_Y * 0.7, CRAZY_DUCK_HIT_STRENGTH_Y * 0.7)
+            ball.spin_y += self.rng.uniform(-CRAZY_DUCK_HIT_SPIN * 0.8, CRAZY_DUCK_HIT_SPIN * 0.8)
             ball.spin_y = max(-BALL_MAX_SPIN, min(BALL_MAX_SPIN, ball.spin_y))
             ball.last_hit_paddle_instance = None # Duck hit resets last paddle hit
             self.hit_cooldown = 20 # Cooldown before duck can hit again
@@ -233,11 +233,11 @@ class CrazyDuckSprite(DistractorSprite):
     def hit_paddle(self, paddle): # Ducks still don't interact with paddles
         return False
 
-    def draw_quack(self, surface):
+    def draw_quack(self, surface, scale=1.0):
         if self.is_quacking:
-            quack_text = self.quack_font.render("QUACK!", True, BLACK)
-            x = self.rect.centerx - quack_text.get_width() / 2
-            y = self.rect.top - quack_text.get_height() - 3 # Position above the duck
+            quack_text = text_cache.surface("QUACK!", max(1, round(18 * scale)), BLACK, "Arial") # Slightly larger quack font
+            x = self.rect.centerx * scale - quack_text.get_width() / 2
+            y = self.rect.top * scale - quack_text.get_height() - 3 * scale # Position above the duck
             surface.blit(quack_text, (x, y))
 
 # --- PowerUp class remains the same ---
@@ -247,9 +247,7 @@ class PowerUp(pygame.sprite.Sprite):
         self.image = pygame.Surface([POWERUP_SIZE, POWERUP_SIZE], pygame.SRCALPHA)
         self.color = get_random_crazy_color(200)
         pygame.draw.rect(self.image, self.color, (0, 0, POWERUP_SIZE, POWERUP_SIZE), border_radius=5)
-        try: font = pygame.font.SysFont("Impact", int(POWERUP_SIZE * 0.7))
-        except pygame.error: font = pygame.font.Font(None, int(POWERUP_SIZE * 0.8))
-        text_surf = font.render("?", True, WHITE)
+        text_surf = text_cache.surface("?", int(POWERUP_SIZE * 0.7), WHITE, "Impact", bold=False)
         self.image.blit(text_surf, text_surf.get_rect(center=(POWERUP_SIZE/2, POWERUP_SIZE/2)))
         self.rect = self.image.get_rect(center=(x, y))
         self.alpha_pulse_dir = -5
@@ -274,107 +272,22 @@ class PowerUp(pygame.sprite.Sprite):
 
 
     def collected(self, collecting_paddle, other_paddle, balls_sprite_group, main_ball_ref,
-                  impact_particles_group, current_tick, play_sound_func): # Added play_sound_func
-        actual_type = random.choice(ALL_POWERUP_TYPES)
+                  impact_particles_group, current_tick, play_sound_func, multiball_count=POWERUP_MULTIBALL_COUNT,
+                  selection_table=None, rng=random):
+        actual_type = (selection_table or get_selection_table()).pick(rng)
         self.kill()
-        indicator = POWERUP_DISPLAY_NAMES.get(actual_type, actual_type.upper().replace("_"," ") + "!")
-
-        general_collect_sound_name = "powerup_collect" # Default
-        good_for_self_types = ["paddle_big_self", "shield_self", "sticky_paddle_self",
-                               "curve_ball_self", "laser_shot_self", "point_shield_self",
-                               "ball_ghost_self", "paddle_teleport_self", "repel_field_self",
-                               "ball_split_self"]
-        bad_for_opponent_types = ["opp_freeze", "slow_opponent", "confuse_opponent_controls",
-                                  "opponent_paddle_shrink"]
-        bad_for_self_types = ["paddle_small_self"]
-
-        if actual_type in good_for_self_types or actual_type in bad_for_opponent_types:
-            general_collect_sound_name = "powerup_collect_good"
-        elif actual_type in bad_for_self_types:
-            general_collect_sound_name = "powerup_collect_bad"
-
-        # Apply effects and play specific activation sounds for immediate/global effects
-        if actual_type == "paddle_big_self":
-            collecting_paddle.add_effect(actual_type, POWERUP_GENERAL_DURATION, intensity=POWERUP_PADDLE_HEIGHT_BIG, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "paddle_small_self":
-            collecting_paddle.add_effect(actual_type, POWERUP_GENERAL_DURATION, intensity=POWERUP_PADDLE_HEIGHT_SMALL, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "multi_ball":
-            if play_sound_func: play_sound_func("multi_ball") # Specific sound for this action
-            collecting_paddle.add_effect(actual_type, POWERUP_SHORT_DURATION, display_text=indicator, start_tick=current_tick) # Indicator
-            for _ in range(POWERUP_MULTIBALL_COUNT):
-                new_ball = Ball(BALL_RADIUS_NORMAL, play_sound_func=play_sound_func, # Pass sound func to new balls
-                                laser_channel=collecting_paddle.laser_channel, # Pass relevant sound params
-                                laser_sound=collecting_paddle.laser_sound)
-                new_ball.is_main_ball = False
-                new_ball.rect.centerx = collecting_paddle.rect.centerx + random.randint(-20,20)
-                new_ball.rect.centery = collecting_paddle.rect.centery + random.randint(-PADDLE_HEIGHT_NORMAL//2, PADDLE_HEIGHT_NORMAL//2)
-                dir_x = 1 if collecting_paddle.player_num == 0 else -1
-                new_ball.velocity = [dir_x * (BALL_INITIAL_SPEED_X * random.uniform(0.8,1.2)), random.uniform(-BALL_INITIAL_SPEED_X,BALL_INITIAL_SPEED_X)]
-                new_ball.current_speed_x_magnitude = abs(new_ball.velocity[0])
-                balls_sprite_group.add(new_ball)
-                if hasattr(collecting_paddle, 'all_sprites_ref'): # If game's all_sprites is accessible
-                    collecting_paddle.all_sprites_ref.add(new_ball)
-
-        elif actual_type == "ball_fast_all":
-            if play_sound_func: play_sound_func("ball_fast")
-            for ball_obj in balls_sprite_group: ball_obj.activate_speed_boost(POWERUP_SHORT_DURATION)
-            collecting_paddle.add_effect(actual_type, POWERUP_SHORT_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "opp_freeze":
-            other_paddle.add_effect("freeze", PADDLE_FREEZE_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("freeze"), start_tick=current_tick)
-            collecting_paddle.add_effect(actual_type, POWERUP_SHORT_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "ball_invis_all":
-            if play_sound_func: play_sound_func("ball_invis")
-            for ball_obj in balls_sprite_group: ball_obj.activate_invisibility(POWERUP_GENERAL_DURATION)
-            collecting_paddle.add_effect(actual_type, POWERUP_GENERAL_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "shield_self":
-            collecting_paddle.add_effect("shield", POWERUP_GENERAL_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("shield"), start_tick=current_tick)
-        elif actual_type == "slow_opponent":
-            other_paddle.add_effect("slow", POWERUP_GENERAL_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("slow"), start_tick=current_tick)
-            collecting_paddle.add_effect(actual_type, POWERUP_GENERAL_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "sticky_paddle_self":
-            collecting_paddle.add_effect("sticky", STICKY_BALL_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("sticky"), start_tick=current_tick)
-        elif actual_type == "curve_ball_self":
-            collecting_paddle.add_effect("curve_shot_ready", POWERUP_GENERAL_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("curve_shot_ready"), start_tick=current_tick)
-        elif actual_type == "laser_shot_self": # This makes the PADDLE ready for a laser shot
-            collecting_paddle.add_effect("laser_shot", POWERUP_GENERAL_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("laser_shot"), start_tick=current_tick)
-        elif actual_type == "confuse_opponent_controls":
-            other_paddle.add_effect("confused_controls", PADDLE_CONFUSE_CONTROLS_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("confused_controls"), start_tick=current_tick)
-            collecting_paddle.add_effect(actual_type, PADDLE_CONFUSE_CONTROLS_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "point_shield_self":
-            collecting_paddle.add_effect("point_shield", -1, display_text=POWERUP_DISPLAY_NAMES.get("point_shield"), start_tick=current_tick) # -1 for indefinite until used
-        elif actual_type == "ball_size_toggle_all":
-            if play_sound_func: play_sound_func("ball_size_toggle")
-            new_size = random.choice([BALL_RADIUS_BIG, BALL_RADIUS_SMALL])
-            for ball_obj in balls_sprite_group: ball_obj.activate_size_change(POWERUP_GENERAL_DURATION, new_size)
-            collecting_paddle.add_effect(actual_type, POWERUP_GENERAL_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "rainbow_ball_all":
-            if play_sound_func: play_sound_func("rainbow_ball")
-            for ball_obj in balls_sprite_group: ball_obj.activate_rainbow_effect(POWERUP_GENERAL_DURATION)
-            collecting_paddle.add_effect(actual_type, POWERUP_GENERAL_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "opponent_paddle_shrink":
-            other_paddle.add_effect("shrunken_by_opponent", OPPONENT_PADDLE_SHRINK_DURATION, intensity=OPPONENT_PADDLE_SHRINK_HEIGHT, display_text=POWERUP_DISPLAY_NAMES.get("shrunken_by_opponent"), start_tick=current_tick)
-            collecting_paddle.add_effect(actual_type, POWERUP_SHORT_DURATION, display_text=indicator, start_tick=current_tick)
-        elif actual_type == "ball_ghost_self": # Paddle ready for ghost shot
-            collecting_paddle.add_effect("ghost_shot_ready", POWERUP_GENERAL_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("ghost_shot_ready"), start_tick=current_tick)
-        elif actual_type == "paddle_teleport_self": # Immediate effect
-            collecting_paddle.teleport_self(balls_sprite_group) # teleport_self will play its sound
-            collecting_paddle.add_effect(actual_type, 20, display_text=indicator, start_tick=current_tick) # Short indicator
-        elif actual_type == "repel_field_self":
-            collecting_paddle.add_effect("repel_field", REPEL_FIELD_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("repel_field"), start_tick=current_tick)
-        elif actual_type == "ball_split_self": # Paddle ready for split
-            collecting_paddle.add_effect("ball_split_ready", POWERUP_GENERAL_DURATION, display_text=POWERUP_DISPLAY_NAMES.get("ball_split_ready"), start_tick=current_tick)
-        elif actual_type == "ball_teleport_all":
-            if play_sound_func: play_sound_func("ball_teleport")
-            for ball_obj in balls_sprite_group: ball_obj.teleport_random(impact_particles_group)
-            collecting_paddle.add_effect(actual_type, POWERUP_SHORT_DURATION, display_text=indicator, start_tick=current_tick)
-
+        powerup_type = POWERUP_REGISTRY[actual_type]
+        powerup_type.apply(PickupContext(collecting_paddle, other_paddle, balls_sprite_group, impact_particles_group,
+                                         current_tick, play_sound_func, multiball_count, Ball, rng))
+        general_collect_sound_name = powerup_type.collect_sound
         return actual_type, general_collect_sound_name # Return for game.py to play general sound
 
 
 # --- Paddle class remains the same ---
 class Paddle(pygame.sprite.Sprite):
-    def __init__(self, width, height, player_num, game_tick_ref_func, play_sound_func=None): # Added play_sound_func
+    def __init__(self, width, height, player_num, game_tick_ref_func, play_sound_func=None, rng=random): # Added play_sound_func
         super().__init__()
+        self.rng = rng # The match's random stream: AI aim jitter, teleports
         self.player_num = player_num
         self.base_width = width
         self.base_height = height # Now uses value from config
@@ -386,7 +299,9 @@ class Paddle(pygame.sprite.Sprite):
         self.speed_y_for_spin = 0
         self.last_y = self.rect.y
 
-        self.active_effects = []
+        self.effects = {} # name -> Effect, in the order they were (re)added
+        self._expiry_heap = []; self._expiry_seq = 0 # (expiry tick, seq, Effect) min-heap
+        self._visual_key = None # What the current image was drawn for
         self.get_current_tick = game_tick_ref_func
         self.play_sound_func = play_sound_func # Store the sound playing function
 
@@ -400,21 +315,30 @@ class Paddle(pygame.sprite.Sprite):
         self._update_visuals()
 
     def _get_effect(self, effect_name):
-        for effect in self.active_effects:
-            if effect.name == effect_name: return effect
-        return None
+        return self.effects.get(effect_name)
 
     def has_effect(self, effect_name):
-        return self._get_effect(effect_name) is not None
+        return effect_name in self.effects
+
+    def _schedule_expiry(self, effect):
+        if effect.duration_frames <= 0: return # Indefinite: only remove_effect/reset ends it
+        self._expiry_seq += 1
+        heapq.heappush(self._expiry_heap, (effect.start_tick + effect.duration_frames, self._expiry_seq, effect))
 
     def add_effect(self, name, duration_frames, intensity=None, display_text="", start_tick=None, allow_stacking=False):
         if start_tick is None: start_tick = self.get_current_tick()
-        if not allow_stacking:
-            existing_effect = self._get_effect(name)
-            if existing_effect: self.active_effects.remove(existing_effect)
-
-        effect = Effect(name, duration_frames, intensity, start_tick, display_text or POWERUP_DISPLAY_NAMES.get(name, name.upper().replace("_"," ") + "!"))
-        self.active_effects.append(effect)
+        existing_effect = self.effects.get(name)
+        if existing_effect and allow_stacking:
+            # One entry per name: stacking keeps the first instance and runs it until the later of the two ends
+            if existing_effect.duration_frames > 0:
+                if duration_frames <= 0: existing_effect.duration_frames = -1
+                else: existing_effect.duration_frames = max(existing_effect.duration_frames, start_tick + duration_frames - existing_effect.start_tick)
+            self._schedule_expiry(existing_effect)
+        else:
+            if existing_effect: del self.effects[name] # Re-insert so it counts as the most recent
+            effect = Effect(name, duration_frames, intensity, start_tick, display_text or POWERUP_DISPLAY_NAMES.get(name, name.upper().replace("_"," ") + "!"))
+            self.effects[name] = effect
+            self._schedule_expiry(effect)
 
         # Play sound associated with this effect starting
         if self.play_sound_func:
@@ -434,9 +358,7 @@ class Paddle(pygame.sprite.Sprite):
         self._update_visuals()
 
     def remove_effect(self, effect_name):
-        initial_len = len(self.active_effects)
-        self.active_effects = [eff for eff in self.active_effects if eff.name != effect_name]
-        if len(self.active_effects) < initial_len:
+        if self.effects.pop(effect_name, None) is not None: # Its heap entry goes stale and is skipped on pop
             self._update_effects_state()
             self._update_visuals()
 
@@ -465,13 +387,13 @@ class Paddle(pygame.sprite.Sprite):
     def _update_powerup_indicator(self):
         negative_effects_priority = ["freeze", "stunned_by_duck", "confused_controls", "shrunken_by_opponent", "slow"]
         for neg_eff_name in negative_effects_priority:
-            if self.has_effect(neg_eff_name):
+            if neg_eff_name in self.effects:
                 self.powerup_indicator_text = POWERUP_DISPLAY_NAMES.get(neg_eff_name, neg_eff_name.upper() + "!")
                 return
 
         most_recent_beneficial_effect = None
         latest_start_tick = -1
-        for effect in reversed(self.active_effects): # Most recently added is last
+        for effect in reversed(self.effects.values()): # Most recently added is last
             is_negative_handled_above = effect.name in negative_effects_priority
             if effect.display_text and not is_negative_handled_above:
                 if effect.start_tick >= latest_start_tick:
@@ -504,12 +426,9 @@ class Paddle(pygame.sprite.Sprite):
 
     def reset_all_effects(self, keep_effects_named=None):
         if keep_effects_named is None: keep_effects_named = []
-        effects_to_keep_instances = []
-        for name_to_keep in keep_effects_named:
-            effect_instance = self._get_effect(name_to_keep)
-            if effect_instance: effects_to_keep_instances.append(effect_instance)
-
-        self.active_effects = effects_to_keep_instances
+        self.effects = {name: self.effects[name] for name in keep_effects_named if name in self.effects}
+        self._expiry_heap = []
+        for effect in self.effects.values(): self._schedule_expiry(effect)
         if self.stuck_ball and not self.has_effect("sticky"):
             self.stuck_ball.is_stuck = False
             self.stuck_ball = None
@@ -519,19 +438,23 @@ class Paddle(pygame.sprite.Sprite):
     def _update_visuals(self):
         old_center = self.rect.center
         self.current_height = int(self.current_height) # Ensure int
-        self.image = pygame.Surface([self.base_width, self.current_height], pygame.SRCALPHA)
+        effects = self.effects
         color_rgb = list(COLOR_PADDLE_BASE if COLOR_PADDLE_BASE else BLUE)
         alpha = 255; border_color = WHITE
 
-        if self.has_effect("paddle_small_self") or self.has_effect("shrunken_by_opponent"): color_rgb = [max(0, c-30) for c in color_rgb[:3]]
-        if self.has_effect("shrunken_by_opponent"): border_color = RED; color_rgb = [max(0, c-60) for c in color_rgb[:3]]
-        if self.has_effect("freeze") or self.has_effect("stunned_by_duck"): alpha = 100; border_color = (100, 100, 200)
-        elif self.has_effect("slow"): alpha = 180; border_color = (200, 200, 100)
-        elif self.has_effect("repel_field"): border_color = CYAN
+        if "paddle_small_self" in effects or "shrunken_by_opponent" in effects: color_rgb = [max(0, c-30) for c in color_rgb[:3]]
+        if "shrunken_by_opponent" in effects: border_color = RED; color_rgb = [max(0, c-60) for c in color_rgb[:3]]
+        if "freeze" in effects or "stunned_by_duck" in effects: alpha = 100; border_color = (100, 100, 200)
+        elif "slow" in effects: alpha = 180; border_color = (200, 200, 100)
+        elif "repel_field" in effects: border_color = CYAN
 
         final_color = tuple(max(0, min(255, int(c))) for c in color_rgb) + (alpha,)
-        self.image.fill(final_color)
-        pygame.draw.rect(self.image, border_color, (0, 0, self.base_width, self.current_height), PADDLE_BORDER_WIDTH, border_radius=3)
+        visual_key = (self.current_height, final_color, border_color)
+        if visual_key != self._visual_key: # Most effects (and teleports) don't change the look: keep the surface
+            self._visual_key = visual_key
+            self.image = pygame.Surface([self.base_width, self.current_height], pygame.SRCALPHA)
+            self.image.fill(final_color)
+            pygame.draw.rect(self.image, border_color, (0, 0, self.base_width, self.current_height), PADDLE_BORDER_WIDTH, border_radius=3)
 
         self.rect = self.image.get_rect(center=old_center)
         self.rect.x = self.initial_x_pos
@@ -540,13 +463,18 @@ class Paddle(pygame.sprite.Sprite):
         if self.shield_sprite: self._position_shield_sprite()
 
     def update_timers_and_effects(self):
-        current_tick = self.get_current_tick()
-        active_effects_before_update = len(self.active_effects)
-        self.active_effects = [eff for eff in self.active_effects if eff.is_active(current_tick)]
-        if len(self.active_effects) < active_effects_before_update:
+        """Drops effects whose time is up; only the heap top is looked at on ticks where nothing expires."""
+        heap = self._expiry_heap; current_tick = self.get_current_tick()
+        if not heap or heap[0][0] > current_tick: return
+        expired_any = False
+        while heap and heap[0][0] <= current_tick:
+            effect = heapq.heappop(heap)[2]
+            # Skip stale entries: effect since removed, replaced or extended by stacking
+            if self.effects.get(effect.name) is effect and not effect.is_active(current_tick):
+                del self.effects[effect.name]; expired_any = True
+        if expired_any:
             self._update_effects_state()
             self._update_visuals()
-        self._update_powerup_indicator()
 
     def update_movement_state(self):
         self.speed_y_for_spin = self.rect.y - self.last_y
@@ -598,8 +526,8 @@ class Paddle(pygame.sprite.Sprite):
             ai_base_speed = ai_speed_map.get(difficulty, AI_PADDLE_SPEED_MEDIUM)
 
             # Adjust target based on difficulty
-            if difficulty == DIFFICULTY_EASY: target_y += random.uniform(-self.current_height * 0.45, self.current_height * 0.45)
-            elif difficulty == DIFFICULTY_MEDIUM: target_y += random.uniform(-self.current_height * 0.25, self.current_height * 0.25)
+            if difficulty == DIFFICULTY_EASY: target_y += self.rng.uniform(-self.current_height * 0.45, self.current_height * 0.45)
+            elif difficulty == DIFFICULTY_MEDIUM: target_y += self.rng.uniform(-self.current_height * 0.25, self.current_height * 0.25)
 
             # Hard difficulty prediction (adjust for screen size if needed, though logic is relative)
             if difficulty == DIFFICULTY_HARD and abs(target_ball.velocity[0]) > 0.1:
@@ -609,7 +537,7 @@ class Paddle(pygame.sprite.Sprite):
                      if abs(target_ball.spin_y) > 0.5:
                          predicted_y += target_ball.spin_y * BALL_SPIN_EFFECT_ON_CURVE * time_to_reach_paddle_x * 0.5
                      target_y = max(self.current_height / 2, min(SCREEN_HEIGHT - self.current_height / 2, predicted_y))
-                     target_y += random.uniform(-self.current_height * 0.1, self.current_height * 0.1)
+                     target_y += self.rng.uniform(-self.current_height * 0.1, self.current_height * 0.1)
                  except ZeroDivisionError:
                       pass # Keep target_y as ball's current y if velocity[0] is zero
 
@@ -632,11 +560,11 @@ class Paddle(pygame.sprite.Sprite):
         if balls_group:
             my_side_balls = [b for b in balls_group if (self.player_num == 0 and b.rect.centerx < SCREEN_WIDTH / 2) or \
                                                     (self.player_num == 1 and b.rect.centerx > SCREEN_WIDTH / 2)]
-            if my_side_balls: ball_to_follow = random.choice(my_side_balls)
-            elif balls_group: ball_to_follow = random.choice(list(balls_group))
+            if my_side_balls: ball_to_follow = self.rng.choice(my_side_balls)
+            elif balls_group: ball_to_follow = self.rng.choice(list(balls_group))
 
         if ball_to_follow: self.rect.centery = ball_to_follow.rect.centery
-        else: self.rect.centery = random.randint(self.current_height // 2, SCREEN_HEIGHT - self.current_height // 2)
+        else: self.rect.centery = self.rng.randint(self.current_height // 2, SCREEN_HEIGHT - self.current_height // 2)
 
         # Clamp position after teleport
         self.rect.y = max(0, min(self.rect.y, SCREEN_HEIGHT - self.current_height))
@@ -644,9 +572,44 @@ class Paddle(pygame.sprite.Sprite):
 
 
 # --- Ball class remains the same ---
+class BallSpriteAtlas:
+    """Shared, bounded LRU cache of pre-rendered ball surfaces keyed by (radius, quantized colour, alpha)."""
+    def __init__(self, max_entries=BALL_ATLAS_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0; self.misses = 0
+
+    def get(self, key):
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        draw_radius, color_rgb, alpha = key
+        surface = pygame.Surface((draw_radius * 2, draw_radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color_rgb + (alpha,), (draw_radius, draw_radius), draw_radius)
+        pygame.draw.circle(surface, WHITE + (alpha,), (draw_radius, draw_radius), draw_radius, 1) # Outline
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False) # Drop the least recently used (rainbow mode churns colours)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+ball_atlas = BallSpriteAtlas() # Shared by every Ball; images are read-only once cached
+
+def _quantize_channel(value):
+    return min(255, int(round(value / BALL_ATLAS_COLOR_STEP)) * BALL_ATLAS_COLOR_STEP)
+
 class Ball(pygame.sprite.Sprite):
-    def __init__(self, radius, play_sound_func=None, laser_channel=None, laser_sound=None): # Added sound params
+    def __init__(self, radius, play_sound_func=None, laser_channel=None, laser_sound=None, rng=random): # Added sound params
         super().__init__()
+        self.rng = rng # The match's random stream: serves, launches, teleports
         self.base_radius = radius # Use radius from config
         self.current_radius = radius
         self.image = pygame.Surface([self.current_radius * 2, self.current_radius * 2], pygame.SRCALPHA)
@@ -657,7 +620,7 @@ class Ball(pygame.sprite.Sprite):
         self.velocity = [0, 0]
         self.spin_y = 0
 
-        self.trail_positions = []
+        self.trail_positions = deque(maxlen=BALL_TRAIL_LENGTH_GHOST) # Ring buffer; oldest samples fall off the left
         self.last_hit_by_timer = 0
         self.last_hit_paddle_instance = None
         self.is_main_ball = False
@@ -680,26 +643,18 @@ class Ball(pygame.sprite.Sprite):
         self.laser_channel = laser_channel
         self.laser_sound = laser_sound # This is the loaded Sound object for laser_shot_loop
 
+        self._visual_key = None # (radius, colour, alpha) of the atlas surface currently used as image
         self._update_visuals()
         self.reset(initial_spawn=False)
 
     def _update_visuals(self, current_time_tick=0):
         draw_radius = max(int(self.current_radius), 1)
-        # Ensure surface size matches radius
-        new_surface_size = (draw_radius * 2, draw_radius * 2)
-        if self.image.get_size() != new_surface_size:
-            self.image = pygame.Surface(new_surface_size, pygame.SRCALPHA)
-            # Keep current center when resizing surface
-            current_center = self.rect.center
-            self.rect = self.image.get_rect(center=current_center)
-        else:
-            self.image.fill((0,0,0,0)) # Clear existing surface
 
         ball_color_rgb = COLOR_BALL_BASE
         if self.is_laser_shot: ball_color_rgb = LASER_SHOT_COLOR
 
         if self.rainbow_effect_timer > 0:
-            hue = (current_time_tick * 7 + random.randint(0,10)) % 360
+            hue = (current_time_tick * 7 + self.rng.randint(0,10)) % 360
             c = pygame.Color(0)
             c.hsva = (hue, 100, 100, 100)
             ball_color_rgb = (c.r, c.g, c.b)
@@ -712,18 +667,19 @@ class Ball(pygame.sprite.Sprite):
             elif self.spin_y < -0.5:
                 r = int(r*(1-0.7*factor)); g = int(g*(1-0.3*factor)); b = min(255, int(b+80*factor))
 
-        final_color_rgb = (max(0,min(255,int(r))), max(0,min(255,int(g))), max(0,min(255,int(b))))
+        final_color_rgb = tuple(_quantize_channel(max(0,min(255,int(channel)))) for channel in (r, g, b))
         alpha = 255
         if self.invisibility_timer > 0: alpha = BALL_INVISIBILITY_ALPHA if self.is_invisible_flicker else 180
         elif self.is_ghost_ball: alpha = GHOST_BALL_ALPHA
 
-        pygame.draw.circle(self.image, final_color_rgb + (alpha,), (draw_radius, draw_radius), draw_radius)
-        pygame.draw.circle(self.image, WHITE + (alpha,), (draw_radius, draw_radius), draw_radius, 1) # Outline
-
+        # Only swap the image when the visual state actually changed
+        visual_key = (draw_radius, final_color_rgb, alpha)
+        if visual_key == self._visual_key: return
+        self._visual_key = visual_key
+        self.image = ball_atlas.get(visual_key)
         # Update rect size if radius changed, keeping center
-        current_center = self.rect.center
-        self.rect = self.image.get_rect(center=current_center)
-
+        if self.rect.size != self.image.get_size():
+            self.rect = self.image.get_rect(center=self.rect.center)
 
     def update(self, rally_active_for_speedup, current_time_tick):
         if self.is_stuck:
@@ -756,19 +712,8 @@ class Ball(pygame.sprite.Sprite):
             self.is_ghost_ball = False
             self.ghost_can_pass_paddle = True
 
-        # Laser sound loop
-        if self.is_laser_shot and not self.laser_sound_playing and self.laser_sound and self.laser_channel:
-            self.laser_channel.play(self.laser_sound, loops=-1)
-            self.laser_sound_playing = True
-        elif not self.is_laser_shot and self.laser_sound_playing and self.laser_channel:
-            self.laser_channel.stop()
-            self.laser_sound_playing = False
-
-        # Trail
-        trail_len_mod = 0.5 if self.is_laser_shot else 1.0
-        max_trail_len = int(BALL_TRAIL_LENGTH_GHOST * trail_len_mod) # Use constant from config
-        self.trail_positions.append((self.rect.center, abs(self.spin_y), self.rainbow_effect_timer > 0, self.is_laser_shot))
-        if len(self.trail_positions) > max_trail_len: self.trail_positions.pop(0)
+        self._update_laser_loop()
+        self._record_trail(self.rect.center, abs(self.spin_y))
 
         # Movement Physics
         if not self.is_laser_shot: # Apply spin curve
@@ -792,6 +737,27 @@ class Ball(pygame.sprite.Sprite):
             self.current_speed_x_magnitude = min(BALL_MAX_SPEED_X, self.current_speed_x_magnitude + BALL_SPEED_INCREMENT_RALLY)
             self.velocity[0] = math.copysign(self.current_speed_x_magnitude, self.velocity[0])
 
+    def _update_laser_loop(self):
+        if self.is_laser_shot and not self.laser_sound_playing and self.laser_sound and self.laser_channel:
+            self.laser_channel.play(self.laser_sound, loops=-1)
+            self.laser_sound_playing = True
+        elif not self.is_laser_shot and self.laser_sound_playing and self.laser_channel:
+            self.laser_channel.stop()
+            self.laser_sound_playing = False
+
+    def _record_trail(self, center, abs_spin):
+        trail_len_mod = 0.5 if self.is_laser_shot else 1.0
+        max_trail_len = int(BALL_TRAIL_LENGTH_GHOST * trail_len_mod) # Use constant from config
+        self.trail_positions.append((center, abs_spin, self.rainbow_effect_timer > 0, self.is_laser_shot))
+        while len(self.trail_positions) > max_trail_len: self.trail_positions.popleft() # Laser trails are shorter
+
+    def finish_batched_update(self, current_time_tick, pre_move_center, pre_move_abs_spin):
+        """Non-numeric half of update() for balls integrated by ball_physics.BallArrayStore."""
+        if self.last_hit_by_timer == 0: self.last_hit_paddle_instance = None
+        self._update_laser_loop()
+        self._record_trail(pre_move_center, pre_move_abs_spin)
+        self._update_visuals(current_time_tick)
+
     def activate_speed_boost(self, duration):
         self.speed_boost_timer = duration
         self.speed_boost_active = True
@@ -831,13 +797,13 @@ class Ball(pygame.sprite.Sprite):
         if self.play_sound_func: self.play_sound_func("ball_teleport")
         old_center = self.rect.center
         margin = self.current_radius + 30 # Increased margin for larger screen
-        self.rect.centerx = random.randint(margin, SCREEN_WIDTH - margin)
-        self.rect.centery = random.randint(margin, SCREEN_HEIGHT - margin)
+        self.rect.centerx = self.rng.randint(margin, SCREEN_WIDTH - margin)
+        self.rect.centery = self.rng.randint(margin, SCREEN_HEIGHT - margin)
         create_impact_particles(old_center[0], old_center[1], particle_group, "teleport_vanish")
         create_impact_particles(self.rect.centerx, self.rect.centery, particle_group, "teleport_appear")
 
     def reset(self, initial_spawn=False, scored_on_player=None, start_static=False):
-        self.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + random.randint(-60, 60)) # Wider random Y range
+        self.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + self.rng.randint(-60, 60)) # Wider random Y range
         self.current_speed_x_magnitude = self.base_speed_x # Use base speed from config
 
         # Reset effects
@@ -859,10 +825,10 @@ class Ball(pygame.sprite.Sprite):
         else:
             direction_x = 1 if scored_on_player == 1 else -1 # Serve towards player who was scored on
             self.velocity = [direction_x * self.current_speed_x_magnitude,
-                             random.uniform(-self.current_speed_x_magnitude * 0.6, self.current_speed_x_magnitude * 0.6)]
+                             self.rng.uniform(-self.current_speed_x_magnitude * 0.6, self.current_speed_x_magnitude * 0.6)]
 
         self.spin_y = 0
-        self.trail_positions = []
+        self.trail_positions.clear()
         self.last_hit_paddle_instance = None
         self.last_hit_by_timer = 0
         if initial_spawn: self.is_main_ball = True
@@ -870,7 +836,21 @@ class Ball(pygame.sprite.Sprite):
 
         self._update_visuals() # Update visuals after reset
 
-    # Helper methods added dynamically in game.py
-    # def stick_to_paddle(self, paddle): ...
-    # def launch_from_paddle(self, paddle): ...
+    def stick_to_paddle(self, paddle):
+        self.is_stuck = True
+        self.last_hit_paddle_instance = paddle
+        paddle.stuck_ball = self
+        self.velocity = [0, 0]
+        self.spin_y = 0
+
+    def launch_from_paddle(self, paddle):
+        self.is_stuck = False
+        if paddle.stuck_ball == self:
+            paddle.stuck_ball = None
+        direction = 1 if paddle.player_num == 0 else -1
+        launch_speed_x = BALL_INITIAL_SPEED_X * 1.2
+        self.velocity[0] = launch_speed_x * direction
+        self.velocity[1] = self.rng.uniform(-BALL_INITIAL_SPEED_X * 0.5, BALL_INITIAL_SPEED_X * 0.5)
+        self.current_speed_x_magnitude = abs(self.velocity[0])
+        self.last_hit_paddle_instance = None
 
@@ -0,0 +1,49 @@
+# swept_collision.py — Continuous (swept-circle) collision tests for fast balls
+
+import math
+
+
+def swept_circle_rect(start, end, radius, rect):
+    """Time of impact of a circle moving from start to end against rect.
+
+    Returns (t, (normal_x, normal_y)) with t in [0, 1] for the first contact
+    (the normal points out of rect at the contact), or None if the circle
+    doesn't touch rect along the way or already overlaps it at start. This is
+    the segment start->end against rect grown by radius with rounded corners.
+    """
+    x0, y0 = start
+    dx = end[0] - x0; dy = end[1] - y0
+    t_enter = 0.0; t_exit = 1.0; normal = None
+
+    # Slab test against rect grown by radius on every side
+    for pos, delta, low, high, axis in ((x0, dx, rect.left - radius, rect.right + radius, 0),
+                                        (y0, dy, rect.top - radius, rect.bottom + radius, 1)):
+        if delta == 0:
+            if pos < low or pos > high: return None
+            continue
+        t_low = (low - pos) / delta; t_high = (high - pos) / delta
+        if t_low > t_high: t_low, t_high = t_high, t_low
+        if t_low > t_enter:
+            t_enter = t_low
+            side = -1.0 if delta > 0 else 1.0 # Entered through the low face when moving forward
+            normal = (side, 0.0) if axis == 0 else (0.0, side)
+        t_exit = min(t_exit, t_high)
+        if t_enter > t_exit: return None
+    if normal is None: return None # Already inside at start: resting contact is the discrete test's job
+
+    # Entry point in a corner square of the grown rect: the real boundary there is a quarter circle
+    contact_x = x0 + dx * t_enter; contact_y = y0 + dy * t_enter
+    corner_x = rect.left if contact_x < rect.left else (rect.right if contact_x > rect.right else None)
+    corner_y = rect.top if contact_y < rect.top else (rect.bottom if contact_y > rect.bottom else None)
+    if corner_x is None or corner_y is None: return t_enter, normal
+
+    offset_x = x0 - corner_x; offset_y = y0 - corner_y
+    a = dx * dx + dy * dy
+    b = 2.0 * (offset_x * dx + offset_y * dy)
+    c = offset_x * offset_x + offset_y * offset_y - radius * radius
+    discriminant = b * b - 4.0 * a * c
+    if discriminant < 0: return None # Passes the corner without touching it
+    t = (-b - math.sqrt(discriminant)) / (2.0 * a)
+    if not 0.0 <= t <= 1.0: return None
+    hit_x = x0 + dx * t - corner_x; hit_y = y0 + dy * t - corner_y
+    return t, (hit_x / radius, hit_y / radius)
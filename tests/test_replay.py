@@ -0,0 +1,50 @@
+# test_replay.py — Replays recorded at reduced quality must play back identically at full quality
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+import pygame
+
+from config import *
+from engine import MatchEngine, make_inputs
+from quality import QualityGovernor
+from replay import Replay, ReplayPlayer, ReplayRecorder
+from utils import TrailRenderer
+
+
+def test_lowest_quality_recording_replays_headless(tmp_path):
+    pygame.display.init()
+    engine = MatchEngine(game_mode=GAME_MODE_AI, difficulty=DIFFICULTY_HARD, left_ai_difficulty=DIFFICULTY_MEDIUM)
+    governor = QualityGovernor(engine.impact_particles, TrailRenderer())
+    governor.apply(len(QUALITY_LEVELS) - 1)
+    try:
+        engine.set_stress_factor(4)
+        engine.reset_match(1234)
+        recorder = ReplayRecorder(engine, keyframe_interval=SIM_TICK_RATE)
+        recorder.start()
+        inputs_rng = random.Random(5); left_dir = 0
+        while engine.phase != STATE_GAME_OVER and engine.time_tick < SIM_TICK_RATE * 60:
+            if inputs_rng.random() < 0.05: left_dir = inputs_rng.choice([-1, 0, 1])
+            if engine.time_tick == SIM_TICK_RATE * 10:
+                engine.set_stress_factor(8); recorder.note_stress_factor()
+            inputs = make_inputs(left_dir, 0, inputs_rng.random() < 0.02, False)
+            engine.step(inputs); recorder.record(inputs)
+        path = str(tmp_path / "match.upr")
+        recorder.finish().save(path)
+    finally:
+        governor.apply(0) # Quality knobs are module-wide; leave full quality for anything after this test
+
+    replay = Replay.load(path)
+    assert replay.stress_changes and len(replay.keyframes) >= 30
+    player = ReplayPlayer(replay, MatchEngine()) # Fresh engine at full quality, as replay.py runs it
+    player.seek(replay.ticks)
+    assert player.diverged_at is None
+    assert player.verified == len(replay.keyframes)
+    assert (player.engine.score_a, player.engine.score_b) == (engine.score_a, engine.score_b)
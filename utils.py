@@ -5,6 +5,9 @@ import random
 import math
 import sys # Needed for sys.frozen and sys._MEIPASS
 import os  # Needed for path joining
+import weakref
+import numpy as np
+from collections import OrderedDict
 
 from config import * # Import all constants
 
@@ -34,86 +37,432 @@ def resource_path(relative_path):
 
 # --- Other Utility Functions ---
 
-def get_random_crazy_color(alpha=255):
+def get_random_crazy_color(alpha=255, rng=random):
     """Generates a random vibrant color."""
-    r = random.randint(50, 255)
-    g = random.randint(50, 255)
-    b = random.randint(50, 255)
+    r = rng.randint(50, 255)
+    g = rng.randint(50, 255)
+    b = rng.randint(50, 255)
     return (r, g, b, alpha)
 
+def hsv_to_rgb_array(hue, saturation, value):
+    """Vectorized pygame.Color.hsva conversion (same float maths, same truncation) -> (n, 3) uint8."""
+    s = saturation / 100.0; v = value / 100.0
+    sector = np.floor(hue / 60.0)
+    f = hue / 60.0 - sector
+    sector = sector.astype(np.int64) % 6
+    p = v * (1 - s); q = v * (1 - s * f); t = v * (1 - s * (1 - f))
+    r = np.choose(sector, [v, q, p, p, t, v])
+    g = np.choose(sector, [t, v, v, q, p, p])
+    b = np.choose(sector, [p, p, t, v, v, q])
+    return (np.stack([r, g, b], axis=1) * 255).astype(np.uint8)
+
+class PsychedelicBackground:
+    """Draws the psychedelic band background from one vectorized colour pass per frame.
+
+    Band colours for the whole screen are computed as NumPy arrays and each band
+    is a plain Surface.fill. band_height can be raised on weak machines to draw
+    fewer, taller bands. Bands are laid out in logical units and stretched to
+    size, so a reduced render scale shows the same pattern.
+    """
+    def __init__(self, band_height=PSYCHEDELIC_BAND_HEIGHT, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.size = size
+        self.set_band_height(band_height)
+
+    def set_band_height(self, band_height):
+        self.band_height = max(1, int(band_height))
+        self.band_tops = np.arange(0, SCREEN_HEIGHT, self.band_height, dtype=np.float64)
+        width, height = self.size; scale_y = height / SCREEN_HEIGHT
+        edges = [int(y * scale_y) for y in self.band_tops] + [height + self.band_height]
+        self.band_rects = [pygame.Rect(0, top, width, max(1, bottom - top)) for top, bottom in zip(edges, edges[1:])]
+
+    def band_colors(self, current_time_tick):
+        y_pos = self.band_tops
+        global_hue_offset = (current_time_tick * PSYCHEDELIC_HUE_SHIFT_SPEED * 10) % 360
+        hue = (global_hue_offset + y_pos * 0.4 + current_time_tick * 30) % 360
+        saturation = np.clip(70 + np.sin(current_time_tick * 0.2 + y_pos * 0.02) * 30, 40, 100)
+        value = np.clip(60 + np.cos(current_time_tick * 0.3 - y_pos * 0.03) * 20, 40, 100)
+        return hsv_to_rgb_array(hue, saturation, value)
+
+    def draw(self, surface, current_time_tick):
+        for rect, color in zip(self.band_rects, self.band_colors(current_time_tick).tolist()):
+            surface.fill(color, rect)
+
+_backgrounds = {} # Surface size -> PsychedelicBackground
+_background_band_height = PSYCHEDELIC_BAND_HEIGHT
+
 def draw_psychedelic_background(surface, current_time_tick):
     """Draws a dynamic, psychedelic background effect."""
-    global_hue_offset = (current_time_tick * PSYCHEDELIC_HUE_SHIFT_SPEED * 10) % 360
-    band_height = 15
-    for y_pos in range(0, SCREEN_HEIGHT, band_height):
-        hue = (global_hue_offset + y_pos * 0.4 + current_time_tick * 30) % 360
-        saturation = 70 + math.sin(current_time_tick * 0.2 + y_pos * 0.02) * 30
-        value = 60 + math.cos(current_time_tick * 0.3 - y_pos * 0.03) * 20
-        color = pygame.Color(0)
-        color.hsva = (hue, max(40, min(100, saturation)), max(40, min(100, value)), 100)
-        pygame.draw.rect(surface, color, (0, y_pos, SCREEN_WIDTH, band_height))
+    size = surface.get_size()
+    background = _backgrounds.get(size)
+    if background is None: background = _backgrounds[size] = PsychedelicBackground(_background_band_height, size)
+    background.draw(surface, current_time_tick)
+
+def set_background_band_height(band_height):
+    """Band height (logical pixels) for every psychedelic background, current and future."""
+    global _background_band_height
+    if band_height == _background_band_height: return
+    _background_band_height = band_height
+    for background in _backgrounds.values(): background.set_band_height(band_height)
+
+# --- Render Scale ---
+def clamp_render_scale(scale):
+    if not RENDER_SCALE_MIN <= scale <= RENDER_SCALE_MAX:
+        print(f"Warning: Render scale {scale} outside {RENDER_SCALE_MIN}-{RENDER_SCALE_MAX}; clamping")
+    return min(RENDER_SCALE_MAX, max(RENDER_SCALE_MIN, scale))
+
+def render_size(scale):
+    """Pixel size of the playfield surface at a render scale."""
+    return (max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale)))
+
+_scaled_images = weakref.WeakKeyDictionary() # Source surface -> (scale, scaled copy); entries go with their sprite images
+
+def scaled_image(image, scale):
+    """image resized for a reduced render scale. Cached per source surface, which sprites never redraw
+    once built (they make a new one instead); surface alpha (pulsing power-ups) is carried over."""
+    entry = _scaled_images.get(image)
+    if entry is None or entry[0] != scale:
+        width, height = image.get_size()
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        scaled = pygame.transform.smoothscale(image, size) if image.get_bitsize() in (24, 32) else pygame.transform.scale(image, size)
+        entry = _scaled_images[image] = (scale, scaled)
+    scaled = entry[1]
+    alpha = image.get_alpha()
+    if scaled.get_alpha() != alpha: scaled.set_alpha(alpha)
+    return scaled
+
+def draw_group_scaled(surface, sprite_group, scale):
+    """Group.draw for a playfield surface at a render scale (plain Group.draw at 1.0)."""
+    if scale == 1.0:
+        sprite_group.draw(surface)
+        return
+    surface.blits([(scaled_image(sprite.image, scale), (sprite.rect.x * scale, sprite.rect.y * scale)) for sprite in sprite_group], doreturn=False)
+
+# --- Font Registry & Text Cache ---
+_font_registry = {}
+
+def get_font(font_type, size, bold=False):
+    """Returns a shared Font, loading it once per (name, size, bold). SysFont scans system fonts, so never call it per frame."""
+    key = (font_type, size, bold)
+    font = _font_registry.get(key)
+    if font is None:
+        try:
+            font = pygame.font.SysFont(font_type, size, bold=bold)
+        except pygame.error:
+            font = pygame.font.Font(None, size) # Fallback to default font
+        _font_registry[key] = font
+    return font
+
+def _composite_over(under, under_pos, over, over_pos, size):
+    """Stacks two SRCALPHA surfaces with the true "over" operator, so blitting the result once
+    looks the same as blitting under then over (a plain SRCALPHA-to-SRCALPHA blit darkens edges)."""
+    width, height = size
+    colors = np.zeros((2, width, height, 3)); alphas = np.zeros((2, width, height))
+    for layer, (src, (x, y)) in enumerate(((under, under_pos), (over, over_pos))):
+        w, h = src.get_size()
+        colors[layer, x:x + w, y:y + h] = pygame.surfarray.array3d(src)
+        alphas[layer, x:x + w, y:y + h] = pygame.surfarray.array_alpha(src) / 255.0
+    a_under, a_over = alphas[0], alphas[1]
+    a_out = a_over + a_under * (1 - a_over)
+    weighted = colors[1] * a_over[..., None] + colors[0] * (a_under * (1 - a_over))[..., None]
+    rgb = np.divide(weighted, a_out[..., None], out=np.zeros_like(weighted), where=a_out[..., None] > 0)
+
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.surfarray.pixels3d(surface)[...] = np.rint(rgb).astype(np.uint8)
+    pygame.surfarray.pixels_alpha(surface)[...] = np.rint(a_out * 255).astype(np.uint8)
+    return surface
+
+def _premultiplied(src):
+    """SRCALPHA copy of src with colours multiplied by alpha, for BLEND_PREMULTIPLIED blits
+    (numpy rather than Surface.premul_alpha, which garbles surfaces with padded rows such as font renders)."""
+    alpha = pygame.surfarray.array_alpha(src)
+    surface = pygame.Surface(src.get_size(), pygame.SRCALPHA)
+    pygame.surfarray.pixels3d(surface)[...] = (pygame.surfarray.array3d(src) * (alpha[..., None] / 255.0) + 0.5).astype(np.uint8)
+    pygame.surfarray.pixels_alpha(surface)[...] = alpha
+    return surface
+
+def _unpremultiplied(src):
+    """Straight-alpha copy of a premultiplied SRCALPHA surface (plain alpha blits of it are SDL's fast path)."""
+    alpha = pygame.surfarray.array_alpha(src)
+    rgb = np.divide(pygame.surfarray.array3d(src) * 255.0, alpha[..., None], out=np.zeros(alpha.shape + (3,)), where=alpha[..., None] > 0)
+    surface = pygame.Surface(src.get_size(), pygame.SRCALPHA)
+    pygame.surfarray.pixels3d(surface)[...] = np.minimum(rgb + 0.5, 255).astype(np.uint8)
+    pygame.surfarray.pixels_alpha(surface)[...] = alpha
+    return surface
+
+class TextCache:
+    """LRU cache of rendered text. Entries are lists of (surface, offset) layers drawn relative to the
+    text's top-left. A fresh shadowed entry keeps its shadow and text as two layers; once it is reused
+    they are composited into a single surface, so static labels cost one blit while text whose colour
+    changes every frame never pays for compositing."""
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0; self.misses = 0
+
+    def render(self, text, size, color, font_type="Verdana", bold=True, shadow_color=None, shadow_offset=None):
+        """Returns (layers, text_size) for the given text and style."""
+        if not (shadow_color and shadow_offset): shadow_color = shadow_offset = None
+        key = (text, size, tuple(color), font_type, bold,
+               tuple(shadow_color) if shadow_color else None, tuple(shadow_offset) if shadow_offset else None)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            layers = entry[0]
+            if len(layers) > 1: # Second use: flatten shadow + text into one surface
+                (shadow_surface, (off_x, off_y)), (text_surface, _) = layers
+                width, height = entry[1]
+                text_x, text_y = max(0, -off_x), max(0, -off_y)
+                combined = _composite_over(shadow_surface, (text_x + off_x, text_y + off_y), text_surface,
+                                           (text_x, text_y), (width + abs(off_x), height + abs(off_y)))
+                entry = self._entries[key] = ([(combined, (-text_x, -text_y))], entry[1])
+            return entry
+        self.misses += 1
+
+        font = get_font(font_type, size, bold)
+        text_surface = font.render(text, True, color)
+        layers = [(text_surface, (0, 0))]
+        if shadow_color:
+            layers.insert(0, (font.render(text, True, shadow_color), tuple(shadow_offset)))
+        entry = self._entries[key] = (layers, text_surface.get_size())
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False) # Drop the least recently used
+        return entry
+
+    def surface(self, text, size, color, font_type="Verdana", bold=True):
+        """Returns the cached surface for unshadowed text (sprite labels)."""
+        return self.render(text, size, color, font_type, bold)[0][0][0]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0, "fonts": len(_font_registry)}
+
+text_cache = TextCache() # Process-wide; shared by draw_text_adv and sprite labels
 
 def draw_text_adv(surface, text, size, x, y, base_color, font_type="Verdana", center_aligned=False,
                   shadow_color=(30,30,30), shadow_offset=(2,2),
-                  hover_color=None, mouse_pos=None, click_rect_ref=None):
-    """Draws text with advanced options like font, alignment, shadow, and hover."""
-    try:
-        font = pygame.font.SysFont(font_type, size, bold=True)
-    except pygame.error:
-        font = pygame.font.Font(None, size) # Fallback to default font
-
+                  hover_color=None, mouse_pos=None, click_rect_ref=None, premultiplied=False):
+    """Draws text with advanced options like font, alignment, shadow, and hover.
+    premultiplied=True draws onto a premultiplied-alpha layer (see MenuLayer) with exact blending."""
     is_hovering = False
     if isinstance(click_rect_ref, pygame.Rect) and hover_color and mouse_pos and click_rect_ref.collidepoint(mouse_pos):
         is_hovering = True
 
     current_color = hover_color if is_hovering else base_color
 
-    text_surface_main = font.render(text, True, current_color)
-    text_rect = text_surface_main.get_rect()
+    layers, text_size = text_cache.render(text, size, current_color, font_type, True, shadow_color, shadow_offset)
+    text_rect = pygame.Rect((0, 0), text_size)
 
     if center_aligned:
         text_rect.center = (x, y)
     else:
         text_rect.topleft = (x, y)
 
-    if shadow_color and shadow_offset: # Only draw shadow if specified
-        text_surface_shadow = font.render(text, True, shadow_color)
-        surface.blit(text_surface_shadow, (text_rect.x + shadow_offset[0], text_rect.y + shadow_offset[1]))
-
-    surface.blit(text_surface_main, text_rect)
+    for layer_surface, (off_x, off_y) in layers: # Shadow first, then text (or one pre-composited surface)
+        if premultiplied: surface.blit(_premultiplied(layer_surface), (text_rect.x + off_x, text_rect.y + off_y), special_flags=pygame.BLEND_PREMULTIPLIED)
+        else: surface.blit(layer_surface, (text_rect.x + off_x, text_rect.y + off_y))
     return text_rect # Return rect for click detection
 
+# --- Menu Overlays ---
+class MenuLayer:
+    """A static menu overlay (dim fill, labels, buttons) rendered once into one SRCALPHA layer.
+
+    labels are draw_text_adv keyword dicts; buttons are (key, label, click_rect). The layer is stacked in
+    premultiplied alpha (exact "over") and stored as straight alpha, so drawing it is one plain blit.
+    A hovered button is swapped in as a small patch cut from the same overlay rendered with that button
+    highlighted (built on its first hover), with the layer blitted around it, so every pixel is blended
+    exactly once and looks as if the whole menu had been drawn directly. Layout is in logical units; at a
+    reduced render scale the finished overlay is smoothscaled once and click rects stay logical.
+    """
+    def __init__(self, dim_color, labels, buttons, hover_color, size=(SCREEN_WIDTH, SCREEN_HEIGHT), scale=1.0):
+        self.size = size
+        self.scale = scale
+        self.dim_color = dim_color
+        self.labels = labels
+        self.buttons = buttons
+        self.hover_color = hover_color
+        self.button_rects = {} # key -> text rect, for click detection
+        self.surface = self._render()
+        self._patches = {} # key -> (rect, surface)
+
+    def _render(self, hovered_key=None):
+        layer = pygame.Surface(self.size, pygame.SRCALPHA)
+        if self.dim_color: layer.fill(pygame.Color(self.dim_color).premul_alpha())
+        for label in self.labels: draw_text_adv(layer, premultiplied=True, **label)
+        for key, label, _ in self.buttons:
+            if key == hovered_key: label = dict(label, base_color=self.hover_color)
+            self.button_rects[key] = draw_text_adv(layer, premultiplied=True, **label)
+        layer = _unpremultiplied(layer)
+        if self.scale != 1.0: layer = pygame.transform.smoothscale(layer, (max(1, round(self.size[0] * self.scale)), max(1, round(self.size[1] * self.scale))))
+        return layer
+
+    def _patch(self, key):
+        patch = self._patches.get(key)
+        if patch is None:
+            click_rect = next(rect for button_key, _, rect in self.buttons if button_key == key)
+            rect = self.button_rects[key].union(click_rect).inflate(8, 8) # Covers the shadow too
+            if self.scale != 1.0: # Whole pixels of the scaled layer, with a margin for smoothscale's blur
+                rect = pygame.Rect(int(rect.x * self.scale) - 1, int(rect.y * self.scale) - 1, math.ceil(rect.width * self.scale) + 3, math.ceil(rect.height * self.scale) + 3)
+            rect = rect.clip(self.surface.get_rect())
+            patch = self._patches[key] = (rect, self._render(key).subsurface(rect).copy())
+        return patch
+
+    def draw(self, surface, mouse_pos, button_rects_map):
+        button_rects_map.update(self.button_rects)
+        hovered_key = next((key for key, _, rect in self.buttons if mouse_pos and rect.collidepoint(mouse_pos)), None)
+        if hovered_key is None:
+            surface.blit(self.surface, (0, 0))
+            return
+        rect, patch = self._patch(hovered_key)
+        width, height = self.surface.get_size()
+        areas = [pygame.Rect(0, 0, width, rect.top), pygame.Rect(0, rect.bottom, width, height - rect.bottom),
+                 pygame.Rect(0, rect.top, rect.left, rect.height), pygame.Rect(rect.right, rect.top, width - rect.right, rect.height)]
+        for area in areas:
+            if area.width > 0 and area.height > 0: surface.blit(self.surface, area, area)
+        surface.blit(patch, rect)
+
+# --- Ball Trails ---
+def _build_hue_lut():
+    lut = []
+    for hue in range(360):
+        c = pygame.Color(0); c.hsva = (hue, 100, 100, 100)
+        lut.append((c.r, c.g, c.b))
+    return lut
+
+RAINBOW_HUE_LUT = _build_hue_lut() # Fully saturated RGB per whole degree of hue
+
+class TrailRenderer:
+    """Draws every ball's trail onto one reusable SRCALPHA layer and composites it with one blit per ball.
+
+    Drawing on the layer keeps each segment's alpha (the opaque game surface ignores it). Segments
+    sharing a fade level and width go out as one draw.lines call; the run layout only depends on
+    (trail length, radius) so it is cached. Last frame's trails are erased with one wide transparent
+    polyline per ball instead of a fill of the whole trail area. scale maps logical ball positions and
+    radii onto a playfield drawn at a reduced render scale.
+    """
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.trail_length = BALL_TRAIL_LENGTH_GHOST # Newest samples drawn per trail (adaptive quality lowers it)
+        self.layer = pygame.Surface(render_size(scale), pygame.SRCALPHA)
+        self._drawn_trails = [] # (points, widest segment) drawn last frame
+        self._fade_run_cache = {}
+
+    def _fade_runs(self, num_points, radius):
+        """[(alpha, width, first_point, end_point)] for a fading trail of num_points samples."""
+        key = (num_points, radius)
+        runs = self._fade_run_cache.get(key)
+        if runs is None:
+            alpha_step = BALL_TRAIL_ALPHA_MAX / BALL_TRAIL_ALPHA_LEVELS
+            runs = []
+            for i in range(num_points - 1):
+                alpha = int(int(BALL_TRAIL_ALPHA_MAX * (i / num_points) / alpha_step) * alpha_step) # Snap to a fade level
+                trail_width = max(1, int(radius * (1 - (i / num_points))))
+                if runs and runs[-1][0] == alpha and runs[-1][1] == trail_width: runs[-1][3] = i + 2
+                else: runs.append([alpha, trail_width, i, i + 2])
+            runs = self._fade_run_cache[key] = [tuple(run) for run in runs]
+        return runs
+
+    def _draw_ball_trail(self, ball_obj, current_time_tick):
+        """Draws one trail on the layer and returns its bounding rect."""
+        scale = self.scale
+        points = [sample[0] for sample in ball_obj.trail_positions]
+        if len(points) > self.trail_length: points = points[-self.trail_length:]
+        if scale != 1.0: points = [(x * scale, y * scale) for x, y in points]
+        num_points = len(points)
+        layer = self.layer
+        area = None
+        if ball_obj.rainbow_effect_timer > 0:
+            hue_base = current_time_tick * 7; hue_step = 360 / max(1, num_points)
+            widest = 1
+            for i in range(num_points - 1):
+                trail_width = max(1, int(ball_obj.current_radius * (1 - (i / num_points)) * 1.5 * scale))
+                widest = max(widest, trail_width)
+                rect = pygame.draw.line(layer, RAINBOW_HUE_LUT[int(hue_base + i * hue_step) % 360], points[i], points[i + 1], trail_width)
+                area = rect if area is None else area.union(rect)
+        else:
+            try:
+                trail_color_base = tuple(ball_obj.image.get_at((ball_obj.image.get_width()//2, ball_obj.image.get_height()//2)))[:3]
+                if ball_obj.is_laser_shot: trail_color_base = LASER_SHOT_COLOR
+            except IndexError:
+                trail_color_base = COLOR_BALL_BASE
+            runs = self._fade_runs(num_points, ball_obj.current_radius * scale)
+            widest = max(run[1] for run in runs)
+            for alpha, trail_width, first, end in runs:
+                rect = pygame.draw.lines(layer, trail_color_base + (alpha,), False, points[first:end], trail_width)
+                area = rect if area is None else area.union(rect)
+        self._drawn_trails.append((points, widest + 2)) # Wider than any segment, so erasing covers it all
+        return area
+
+    def draw(self, surface, balls, current_time_tick):
+        for points, width in self._drawn_trails: pygame.draw.lines(self.layer, (0, 0, 0, 0), False, points, width)
+        self._drawn_trails = []
+        layer_rect = self.layer.get_rect()
+        areas = []
+        for ball_obj in balls:
+            if ball_obj.alive() and len(ball_obj.trail_positions) > 1:
+                areas.append(self._draw_ball_trail(ball_obj, current_time_tick).clip(layer_rect))
+        if len(areas) > 1 and any(a.colliderect(b) for i, a in enumerate(areas) for b in areas[i + 1:]):
+            areas = [areas[0].unionall(areas[1:])] # Overlapping areas would blend twice, so composite their union
+        surface.blits([(self.layer, area, area) for area in areas], doreturn=False)
+
+def draw_group_interpolated(surface, sprite_group, alpha, scale=1.0):
+    """Draws a sprite group with positions blended between the previous and current simulation tick."""
+    if scale != 1.0:
+        for sprite in sprite_group:
+            prev_center = getattr(sprite, "prev_center", None)
+            cur_x, cur_y = sprite.rect.center
+            if prev_center is not None and alpha < 1.0:
+                dx = cur_x - prev_center[0]; dy = cur_y - prev_center[1]
+                if abs(dx) <= INTERPOLATION_SNAP_DISTANCE and abs(dy) <= INTERPOLATION_SNAP_DISTANCE:
+                    cur_x = prev_center[0] + dx * alpha; cur_y = prev_center[1] + dy * alpha
+            image = scaled_image(sprite.image, scale)
+            surface.blit(image, image.get_rect(center=(cur_x * scale, cur_y * scale)))
+        return
+    for sprite in sprite_group:
+        prev_center = getattr(sprite, "prev_center", None)
+        if prev_center is None or alpha >= 1.0:
+            surface.blit(sprite.image, sprite.rect)
+            continue
+        cur_x, cur_y = sprite.rect.center
+        dx = cur_x - prev_center[0]; dy = cur_y - prev_center[1]
+        if abs(dx) > INTERPOLATION_SNAP_DISTANCE or abs(dy) > INTERPOLATION_SNAP_DISTANCE:
+            surface.blit(sprite.image, sprite.rect) # Teleport or reset: don't smear across the screen
+            continue
+        draw_center = (prev_center[0] + dx * alpha, prev_center[1] + dy * alpha)
+        surface.blit(sprite.image, sprite.image.get_rect(center=draw_center))
+
 # Function to create impact particles
-def create_impact_particles(x, y, particle_group, impact_type="generic", custom_color_func=None):
+def create_impact_particles(x, y, particle_system, impact_type="generic", custom_color_func=None):
     """Creates particle effects at a given position with type-specific or custom colors."""
-    # Import Particle class locally to avoid circular dependency with sprites.py
-    from sprites import Particle
-
     num_particles = PARTICLE_COUNT_IMPACT
     speed_range = (1, PARTICLE_SPEED_IMPACT)
     lifespan_mod = 0
+    rng = particle_system.rng # Cosmetic stream, so burst sizes never shift gameplay randomness
 
     # Default color function
-    color_func = lambda: get_random_crazy_color(random.randint(180,255))
+    color_func = lambda: get_random_crazy_color(rng.randint(180,255), rng)
 
     if custom_color_func:
         color_func = custom_color_func
     elif impact_type == "wall":
-        color_func = lambda: (random.randint(100,200), random.randint(100,200), random.randint(200,255), random.randint(150,220))
+        color_func = lambda: (rng.randint(100,200), rng.randint(100,200), rng.randint(200,255), rng.randint(150,220))
     elif impact_type == "paddle":
-        color_func = lambda: (random.randint(200,255), random.randint(100,200), random.randint(50,150), random.randint(180,255))
+        color_func = lambda: (rng.randint(200,255), rng.randint(100,200), rng.randint(50,150), rng.randint(180,255))
     elif impact_type == "goal":
         num_particles = PARTICLE_COUNT_IMPACT * 2
         speed_range = (2, PARTICLE_SPEED_IMPACT * 1.5)
-        color_func = lambda: (random.randint(200,255), random.randint(200,255), random.randint(50,150), random.randint(200,255)) # More vibrant for goal
+        color_func = lambda: (rng.randint(200,255), rng.randint(200,255), rng.randint(50,150), rng.randint(200,255)) # More vibrant for goal
     elif impact_type == "teleport_vanish":
         num_particles = PARTICLE_COUNT_IMPACT // 2
-        color_func = lambda: (random.randint(80,150), random.randint(200,255), random.randint(80,150), random.randint(100,180)) # Greenish hues
+        color_func = lambda: (rng.randint(80,150), rng.randint(200,255), rng.randint(80,150), rng.randint(100,180)) # Greenish hues
         lifespan_mod = -10 # Shorter lifespan
     elif impact_type == "teleport_appear":
         num_particles = PARTICLE_COUNT_IMPACT // 2
-        color_func = lambda: (random.randint(100,180), random.randint(220,255), random.randint(100,180), random.randint(150,220)) # Brighter greenish
+        color_func = lambda: (rng.randint(100,180), rng.randint(220,255), rng.randint(100,180), rng.randint(150,220)) # Brighter greenish
         lifespan_mod = 5
 
-    for _ in range(num_particles):
-        particle_group.add(Particle(x, y, color_func, speed_range=speed_range, lifespan_mod=lifespan_mod))
+    particle_system.emit(x, y, color_func, num_particles, speed_range=speed_range, lifespan_mod=lifespan_mod)
@@ -0,0 +1,97 @@
+# voices.py — Priority Voice Manager (channel groups, per-sound limits, steal/drop stats)
+
+import time
+
+import pygame
+
+from config import *
+
+SHARED_GROUP = "sfx"
+
+
+class VoiceManager:
+    """Decides which mixer channel, if any, a sound effect gets.
+
+    Each sound has a rule (group, priority, max instances, min retrigger
+    interval). A play is dropped if it retriggers too soon; past its instance
+    cap it replaces its own oldest voice; otherwise it takes a free channel of
+    its group or the shared pool, else steals the lowest-priority (then
+    oldest) voice of no higher priority, else it is dropped. Reserved groups
+    sit at the start of the channel list and are reserved with the mixer, so
+    nothing else (find_channel, Sound.play) can take them.
+    """
+    def __init__(self, groups=VOICE_GROUPS, rules=SOUND_VOICE_RULES, default_rule=VOICE_RULE_DEFAULT, num_channels=MIXER_NUM_CHANNELS):
+        self.group_sizes = groups
+        self.rules = rules
+        self.default_rule = default_rule
+        self.num_channels = num_channels
+        self.groups = {} # group name -> [Channel]
+        self.voices = {} # Channel -> (sound name, priority, start seconds, Sound)
+        self.last_played = {} # sound name -> seconds
+        self.played = self.stolen = self.dropped = 0
+        self._window_start = time.perf_counter(); self._window_counts = (0, 0, 0)
+        self.rates = {"played": 0.0, "stolen": 0.0, "dropped": 0.0} # Per second, over the last full window
+
+    def setup(self):
+        """Allocates and reserves channels; call once the mixer is initialised."""
+        pygame.mixer.set_num_channels(self.num_channels)
+        index = 0
+        for name, size in self.group_sizes.items():
+            self.groups[name] = [pygame.mixer.Channel(i) for i in range(index, index + size)]
+            index += size
+        pygame.mixer.set_reserved(index)
+        self.groups[SHARED_GROUP] = [pygame.mixer.Channel(i) for i in range(index, self.num_channels)]
+
+    def channels(self, group):
+        return self.groups.get(group, [])
+
+    def play(self, sound_name, sound, loops=0):
+        group, priority, max_instances, min_interval_ms = self.rules.get(sound_name, self.default_rule)
+        now = time.perf_counter()
+        last = self.last_played.get(sound_name)
+        if last is not None and (now - last) * 1000.0 < min_interval_ms:
+            self.dropped += 1
+            return None
+
+        candidates = self.channels(group)
+        if group != SHARED_GROUP: candidates = candidates + self.channels(SHARED_GROUP)
+        voices = self.voices
+        channel = None; victim = None; own_instances = []
+        for candidate in candidates:
+            voice = voices.get(candidate)
+            if voice is None or not candidate.get_busy():
+                if channel is None: channel = candidate
+                continue
+            if voice[0] == sound_name: own_instances.append(candidate)
+            elif voice[1] <= priority and (victim is None or (voice[1], voice[2]) < (voices[victim][1], voices[victim][2])):
+                victim = candidate
+        if len(own_instances) >= max_instances: # Retrigger: restart the oldest copy instead of stacking another
+            channel = min(own_instances, key=lambda c: voices[c][2]); self.stolen += 1
+        elif channel is None:
+            if victim is None:
+                self.dropped += 1
+                return None
+            channel = victim; self.stolen += 1
+
+        channel.play(sound, loops)
+        voices[channel] = (sound_name, priority, now, sound)
+        self.last_played[sound_name] = now
+        self.played += 1
+        return channel
+
+    def stats(self):
+        """Totals and per-second rates; rates refresh once a second."""
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            counts = (self.played, self.stolen, self.dropped)
+            self.rates = {key: (count - previous) / elapsed for key, count, previous in zip(("played", "stolen", "dropped"), counts, self._window_counts)}
+            self._window_start = now; self._window_counts = counts
+        busy = sum(1 for channel in self.voices if channel.get_busy())
+        return {"active": busy, "played": self.played, "stolen": self.stolen, "dropped": self.dropped,
+                "stolen_per_s": self.rates["stolen"], "dropped_per_s": self.rates["dropped"]}
+
+    def stats_line(self):
+        stats = self.stats()
+        return (f"voices {stats['active']}/{self.num_channels}  stolen {stats['stolen_per_s']:.1f}/s  "
+                f"dropped {stats['dropped_per_s']:.1f}/s")